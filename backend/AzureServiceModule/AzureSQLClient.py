@@ -1,20 +1,51 @@
 # backend/AzureServiceModule/AzureSQLClient.py
+#
+# Azure SQL 연결 관리
+# - 엔진은 처음 쿼리할 때 만들고(지연 생성), 연결 풀 크기/오버플로/재활용 주기/사전 확인(pre-ping)을 환경 변수로 설정합니다.
+# - 쿼리마다 제한 시간을 걸고, execute_query_async는 전용 스레드 풀(풀 연결 수 이하)에서 실행해
+#   요청 처리 스레드/이벤트 루프를 막지 않습니다.
+# - AZURE_SQL_URL에 sqlite:///파일.db (또는 duckdb:///파일.duckdb, duckdb_engine 필요)를 주면
+#   로컬 DB를 같은 방식(dbo 스키마 포함)으로 사용하므로 DB 없이 부하 테스트를 할 수 있습니다.
 
 import os
-from sqlalchemy import create_engine
+import time
+import asyncio
+import logging
+import threading
+import urllib.parse
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 import pandas as pd
 from dotenv import load_dotenv
-import urllib.parse
 
 # .env 파일 로드
 load_dotenv()
 
+logger = logging.getLogger("azure_sql")
+
 # 환경 변수 가져오기
 db_id = os.getenv("AZURE_SQL_ID")
 db_password = os.getenv("AZURE_SQL_PASSWORD")
 db_endpoint = os.getenv("AZURE_SQL_ENDPOINT")
 db_name = os.getenv("AZURE_SQL_DB")
 
+# 로컬 대체 DB (예: sqlite:///stats.db), 없으면 Azure SQL
+DATABASE_URL = os.getenv("AZURE_SQL_URL")
+
+# 연결 풀 설정
+POOL_SIZE = int(os.getenv("AZURE_SQL_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("AZURE_SQL_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = float(os.getenv("AZURE_SQL_POOL_TIMEOUT", "10"))      # 빈 연결을 기다리는 최대 시간(초)
+POOL_RECYCLE = int(os.getenv("AZURE_SQL_POOL_RECYCLE", "1800"))      # 이 시간(초)이 지난 연결은 새로 연결
+POOL_PRE_PING = os.getenv("AZURE_SQL_POOL_PRE_PING", "1") != "0"     # 연결을 꺼낼 때 살아 있는지 확인
+CONNECT_TIMEOUT = int(os.getenv("AZURE_SQL_CONNECT_TIMEOUT", "30"))
+QUERY_TIMEOUT = float(os.getenv("AZURE_SQL_QUERY_TIMEOUT", "30"))    # 쿼리 1건 제한 시간(초), 0이면 제한 없음
+# 비동기 쿼리 전용 스레드 수 (기본: 풀 연결 수, 그 이상은 연결을 기다리기만 함)
+EXECUTOR_WORKERS = int(os.getenv("AZURE_SQL_EXECUTOR_WORKERS", str(POOL_SIZE + MAX_OVERFLOW)))
+
 # DSN-less 연결 문자열 구성
 connection_string = (
     f"Driver={{ODBC Driver 17 for SQL Server}};"
@@ -22,23 +53,193 @@ connection_string = (
     f"Database={db_name};"
     f"Uid={db_id};"
     f"Pwd={db_password};"
-    "Encrypt=yes;TrustServerCertificate=no;Connection Timeout=30;"
+    f"Encrypt=yes;TrustServerCertificate=no;Connection Timeout={CONNECT_TIMEOUT};"
 )
 
 # 전체 연결 문자열을 URL 인코딩
 params = urllib.parse.quote_plus(connection_string)
 
-# SQLAlchemy 엔진 생성 - odbc_connect 파라미터 사용
-engine = create_engine("mssql+pyodbc:///?odbc_connect=%s" % params)
+_engine = None
+_engine_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def database_url() -> str:
+    return DATABASE_URL or "mssql+pyodbc:///?odbc_connect=%s" % params
+
+
+def _attach_dbo_schema(engine):
+    """
+    로컬 DB에서도 Azure SQL 쿼리(dbo.테이블)를 그대로 쓸 수 있도록 dbo 스키마를 만듭니다.
+    - SQLite: 같은 DB 파일을 dbo 이름으로 한 번 더 연결 (main.x == dbo.x)
+    - DuckDB: dbo 스키마 생성
+    """
+    url = engine.url
+    if url.get_backend_name() == "sqlite":
+        if not url.database or url.database == ":memory:":
+            return
+
+        @event.listens_for(engine, "connect")
+        def attach(dbapi_connection, _):
+            dbapi_connection.execute("ATTACH DATABASE ? AS dbo", (url.database,))
+    elif url.get_backend_name() == "duckdb":
+        @event.listens_for(engine, "connect")
+        def create_schema(dbapi_connection, _):
+            dbapi_connection.execute("CREATE SCHEMA IF NOT EXISTS dbo")
+
+
+def get_engine():
+    """
+    SQLAlchemy 엔진 (처음 호출 시 생성)
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                url = make_url(database_url())
+                options = {"pool_pre_ping": POOL_PRE_PING}
+                if url.get_backend_name() != "sqlite" or (url.database and url.database != ":memory:"):
+                    options.update(pool_size=POOL_SIZE, max_overflow=MAX_OVERFLOW,
+                                   pool_timeout=POOL_TIMEOUT, pool_recycle=POOL_RECYCLE)
+                if url.get_backend_name() == "sqlite":
+                    # 비동기 쿼리 스레드에서 풀 연결을 같이 쓰므로 스레드 검사를 끕니다.
+                    options["connect_args"] = {"check_same_thread": False}
+                engine = create_engine(url, **options)
+                _attach_dbo_schema(engine)
+                logger.info(f"DB 엔진 생성: {url.get_backend_name()} (pool_size={POOL_SIZE}, "
+                            f"max_overflow={MAX_OVERFLOW}, recycle={POOL_RECYCLE}s)")
+                _engine = engine
+    return _engine
+
+
+def __getattr__(name):
+    # 기존 코드 호환: `from AzureServiceModule.AzureSQLClient import engine` (import 시점이 아니라 사용 시점에 생성)
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _dbapi(conn):
+    # 풀 연결 프록시 -> 실제 DBAPI 연결
+    return getattr(conn, "dbapi_connection", None) or getattr(conn, "driver_connection", None) or conn
+
+
+class _QueryDeadline:
+    """
+    쿼리 제한 시간 적용
+    - pyodbc: 연결의 timeout 속성 (서버에서 쿼리 취소)
+    - sqlite3 / duckdb: 제한 시간이 지나면 interrupt() 호출
+    """
+    def __init__(self, conn, timeout: float):
+        self.conn = _dbapi(conn)
+        self.timeout = timeout
+        self._timer = None
+        self._previous = None
+
+    def __enter__(self):
+        if not self.timeout:
+            return self
+        if hasattr(self.conn, "timeout") and not hasattr(self.conn, "interrupt"):
+            self._previous = self.conn.timeout
+            self.conn.timeout = max(int(round(self.timeout)), 1)
+        elif hasattr(self.conn, "interrupt"):
+            self._timer = threading.Timer(self.timeout, self.conn.interrupt)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._previous is not None:
+            self.conn.timeout = self._previous
+        return False
 
-def execute_query(query: str) -> pd.DataFrame:
+
+def execute_query(query: str, params=None, timeout: float = None) -> pd.DataFrame:
     """
     주어진 SQL 쿼리를 실행하여 결과를 pandas DataFrame으로 반환합니다.
-    engine.raw_connection()을 사용하여 DBAPI 연결 객체를 명시적으로 닫습니다.
+    연결은 풀에서 꺼내 쓰고 끝나면 풀에 반환합니다. (close()는 풀 반환)
+    timeout(초)을 지정하지 않으면 AZURE_SQL_QUERY_TIMEOUT을 사용합니다.
     """
-    conn = engine.raw_connection()
+    timeout = QUERY_TIMEOUT if timeout is None else timeout
+    start = time.perf_counter()
+    conn = get_engine().raw_connection()
     try:
-        df = pd.read_sql(query, conn)
+        with _QueryDeadline(conn, timeout):
+            df = pd.read_sql(query, _dbapi(conn), params=params)
+    except Exception as e:
+        # 드라이버마다 취소 오류 형식이 달라 경과 시간으로 판단합니다.
+        if timeout and time.perf_counter() - start >= timeout:
+            raise TimeoutError(f"쿼리 제한 시간({timeout}초)을 넘었습니다.") from e
+        raise
     finally:
         conn.close()
+    logger.debug(f"쿼리 {len(df):,} rows, {(time.perf_counter() - start) * 1000:.1f} ms")
     return df
+
+
+def get_query_executor() -> ThreadPoolExecutor:
+    """
+    비동기 쿼리 전용 스레드 풀 (스레드 수 = 동시에 실행되는 쿼리 수 상한)
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max(EXECUTOR_WORKERS, 1), thread_name_prefix="sql")
+    return _executor
+
+
+async def execute_query_async(query: str, params=None, timeout: float = None) -> pd.DataFrame:
+    """
+    execute_query를 전용 스레드 풀에서 실행하고 결과를 기다립니다. (이벤트 루프를 막지 않음)
+    제한 시간이 지나면 DB 쪽에서 쿼리를 취소하고 TimeoutError가 발생합니다.
+    (연결 대기 시간 AZURE_SQL_POOL_TIMEOUT까지 넘기면 asyncio.TimeoutError)
+    """
+    timeout = QUERY_TIMEOUT if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_query_executor(), partial(execute_query, query, params, timeout))
+    if not timeout:
+        return await future
+    return await asyncio.wait_for(future, timeout + POOL_TIMEOUT)
+
+
+def pool_status() -> dict:
+    """
+    연결 풀 상태 (모니터링/부하 테스트용)
+    """
+    pool = get_engine().pool
+    status = {"backend": get_engine().url.get_backend_name(), "pool": pool.__class__.__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    return status
+
+
+def load_local_tables(frames: dict, if_exists: str = "replace"):
+    """
+    로컬 대체 DB에 테이블 적재 {테이블 이름: DataFrame} (dbo 스키마)
+    """
+    engine = get_engine()
+    if engine.url.get_backend_name() not in ("sqlite", "duckdb"):
+        raise ValueError("로컬 테이블 적재는 AZURE_SQL_URL이 sqlite/duckdb일 때만 사용할 수 있습니다.")
+    schema = "dbo" if engine.url.database and engine.url.database != ":memory:" else None
+    for name, frame in frames.items():
+        frame.to_sql(name, engine, schema=schema, if_exists=if_exists, index=False)
+
+
+def dispose():
+    """
+    서버 종료 시 호출: 비동기 쿼리 스레드와 풀 연결을 정리합니다.
+    """
+    global _engine, _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
@@ -8,6 +8,7 @@ from .modules.PromptGenerator import PromptGenerator
 from .modules.AISearchClient import AISearchService
 from .config.VariableConfig import required_keys, categorical_keys, planning_stage_keys, sales_stage_keys
 import json
+import asyncio
 import re
 import httpx  # 비동기 HTTP 요청을 위한 라이브러리
 from datetime import datetime
@@ -97,7 +98,7 @@ class ChatbotService:
     
     # 변수 포맷 변환 함수
     def _format_variables_for_ml_api(self, analysis_type):
-        """수집된 변수를 ML API 형식에 맞게 변환"""
+        """수집된 변수를 ML API 형식에 맞게 변환 (공연 ID가 있으면 특성 저장소를 조회하므로 비동기 경로에서는 스레드로 호출)"""
         formatted_vars = self.collected_vars.copy()
         
         # 날짜를 숫자로 변환
@@ -130,7 +131,19 @@ class ChatbotService:
                 formatted_vars["promo_event_flag"] = 1 if formatted_vars["promo_event_flag"].lower() == "true" else 0
             elif isinstance(formatted_vars["promo_event_flag"], bool):
                 formatted_vars["promo_event_flag"] = 1 if formatted_vars["promo_event_flag"] else 0
-        
+
+        # 판매 단계: 공연 ID가 있으면 빠진 값은 특성 저장소(sales_tb 기록)로 채웁니다.
+        if analysis_type in ("accumulated_sales_selling", "roi_bep_selling", "ticket_risk_selling") \
+                and formatted_vars.get("performance_id") is not None:
+            try:
+                from ModelPredictionModule.feature_store import get_feature_store
+                features = get_feature_store().resolve(formatted_vars["performance_id"], formatted_vars.get("date"))
+                for key, value in features.items():
+                    if value is not None:
+                        formatted_vars.setdefault(key, value)
+            except (KeyError, ValueError, FileNotFoundError) as e:
+                logger.warning(f"특성 저장소 조회 실패: {e}")
+
         # 분석 유형별 필수 필드 설정
         if analysis_type == "accumulated_sales_planning":
             defaults = {
@@ -245,53 +258,29 @@ class ChatbotService:
     async def _call_ml_api(self, analysis_type, formatted_vars):
         """ML API 내부 직접 호출"""
         try:
-            # ML 모듈에서 함수 직접 임포트
-            from backend.ModelPredictionModule.analysis_module import (
-                predict_acc_sales_planning,
-                predict_acc_sales_selling,
-                predict_roi_bep_planning,
-                predict_roi_bep_selling,
-                predict_ticket_risk,
-                get_genre_stats,
-                get_regional_stats,
-                get_venue_scale_stats
+            # ML 모듈에서 함수 직접 임포트 (라우터와 같은 모듈을 써야 추론 실행기/모델을 공유합니다)
+            from ModelPredictionModule.analysis_module import (
+                PREDICTORS,
+                predict_async
             )
+            from ModelPredictionModule.stats_cache import get_stats_cache
             
-            # 통계 분석 (입력 데이터 없이 호출)
-            if analysis_type == "genre_stats":
-                stats = get_genre_stats()
-                return stats
-            
-            elif analysis_type == "regional_stats":
-                stats = get_regional_stats()
-                return stats
-                
-            elif analysis_type == "venue_scale_stats":
-                stats = get_venue_scale_stats()
-                return stats
+            # 통계 분석 (입력 데이터 없이 호출, 라우터와 같은 통계 캐시 사용)
+            if analysis_type in ("genre_stats", "regional_stats", "venue_scale_stats"):
+                entry = await asyncio.to_thread(get_stats_cache().get, analysis_type)
+                return entry.value
             
             # 기존 예측 분석 (입력 데이터 필요)
             # 단일 객체를 리스트로 포장
             input_data = [formatted_vars]
             
-            # 직접 함수 호출
-            if analysis_type == "accumulated_sales_planning":
-                preds = predict_acc_sales_planning(input_data)
-                return {"predictions": preds}
-            elif analysis_type == "roi_bep_planning":
-                preds = predict_roi_bep_planning(input_data)
-                return {"predictions": preds}
-            elif analysis_type == "accumulated_sales_selling":
-                preds = predict_acc_sales_selling(input_data)
-                return {"predictions": preds}
-            elif analysis_type == "roi_bep_selling":
-                preds = predict_roi_bep_selling(input_data)
-                return {"predictions": preds}
-            elif analysis_type == "ticket_risk_selling":
-                preds = predict_ticket_risk(input_data)
-                return {"risk_labels": preds}
-            else:
+            # 추론 실행기를 통해 비동기 호출 (이벤트 루프를 막지 않음)
+            if analysis_type not in PREDICTORS:
                 return self._get_fallback_response(analysis_type)
+            preds = await predict_async(analysis_type, input_data)
+            if analysis_type == "ticket_risk_selling":
+                return {"risk_labels": preds}
+            return {"predictions": preds}
         except Exception as e:
             logger.error(f"직접 함수 호출 오류: {str(e)}")
             return self._get_fallback_response(analysis_type)
@@ -524,7 +513,11 @@ class ChatbotService:
             analysis_results_text = []
             
             for analysis_type in analysis_types:
-                formatted_vars = self._format_variables_for_ml_api(analysis_type)
+                if self.collected_vars.get("performance_id") is not None:
+                    # 특성 저장소 조회(DB)는 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+                    formatted_vars = await asyncio.to_thread(self._format_variables_for_ml_api, analysis_type)
+                else:
+                    formatted_vars = self._format_variables_for_ml_api(analysis_type)
                 logger.debug(f"API 호출 전 변수: {formatted_vars}")
                 
                 api_result = await self._call_ml_api(analysis_type, formatted_vars)
@@ -1,38 +1,195 @@
 import os
-import joblib
+import asyncio
+import threading
 import pandas as pd
 import numpy as np
 from typing import List
 from sklearn.metrics import roc_curve, precision_recall_curve
 from sklearn.preprocessing import label_binarize
-
-from AzureServiceModule.AzureSQLClient import execute_query
+from sklearn.base import is_classifier
+
+from .model_registry import get_registry
+from .inference_batcher import InferenceBatcher
+from .inference_executor import InferenceExecutor
+from .feature_encoder import get_encoder
+from .xgb_native import get_native_model, get_shared_trees
+from .forest_evaluator import get_flat_forest
+from .prediction_cache import get_prediction_cache
+from .prediction_intervals import predict_intervals, XGB_INTERVAL_INFO, FOREST_INTERVAL_INFO
+from .model_watcher import get_model_watcher
+from .explanations import explain_rows, get_explainer, explanation_payload
+from . import roi_bep_formula
+from . import stats_queries
 
 FILE_DIR = os.path.dirname(__file__)
 MODEL_DIR = os.path.join(FILE_DIR, "models")
 
+# 동시 요청 마이크로 배칭 사용 여부 (ML_BATCHING=0 이면 요청마다 바로 예측)
+BATCHING_ENABLED = os.getenv("ML_BATCHING", "1") != "0"
+# XGBoost 모델은 네이티브 Booster.inplace_predict 사용 (ML_XGB_NATIVE=0 이면 sklearn 래퍼 사용)
+NATIVE_XGB_ENABLED = os.getenv("ML_XGB_NATIVE", "1") != "0"
+# 랜덤 포레스트는 펼친 노드 배열(FlatForest)로 평가 (ML_FLAT_FOREST=0 이면 sklearn 사용)
+FLAT_FOREST_ENABLED = os.getenv("ML_FLAT_FOREST", "1") != "0"
+# 같은 입력(특성 벡터)에 대한 예측 결과 캐시 (ML_PREDICTION_CACHE=0 이면 사용 안 함)
+CACHE_ENABLED = os.getenv("ML_PREDICTION_CACHE", "1") != "0"
+# 모델 파일이 바뀌면 재시작 없이 검증 후 교체 (ML_MODEL_WATCH=0 이면 사용 안 함)
+WATCH_ENABLED = os.getenv("ML_MODEL_WATCH", "1") != "0"
+
 def load_model(model_name: str):
     """
     model_name: 예) 'xgb_reg_accumulated_sales_planning' (확장자 제외)
-    models 폴더에서 해당 pkl 파일을 로드합니다.
+    프로세스 전역 레지스트리에서 모델을 가져옵니다. (pkl 파일은 최초 1회만 로드)
+    """
+    return get_registry().get(model_name)
+
+
+def _has_column_transformer(model) -> bool:
+    return hasattr(model, "steps") and hasattr(model.steps[0][1], "transformers_")
+
+
+def run_model(model_name: str, input_data: List[dict]) -> np.ndarray:
+    """
+    입력 행 전체를 한 번의 model.predict 호출로 예측합니다.
+    (여러 요청의 행을 합쳐서 호출해도 행 순서대로 결과를 반환)
+    전처리는 pandas DataFrame 대신 FeatureEncoder로 float32 행렬을 만들어 최종 모델에 바로 넣습니다.
+    분류 모델은 클래스별 확률 (행 수, 클래스 수)을 반환합니다. (라벨은 model_classes로 복원)
+    model_name이 '모델@interval' 이면 [예측값, 하한, 상한] 예측 구간 배열을,
+    '모델@explain' 이면 [입력 컬럼별 기여도..., 기준값] 배열을 반환합니다. (XGBoost 모델)
+    """
+    model_name, _, mode = model_name.partition("@")
+    if mode == "interval":
+        return predict_intervals(model_name, input_data)
+    if mode == "explain":
+        return explain_rows(model_name, input_data)
+    if NATIVE_XGB_ENABLED:
+        # 공유 형식(메모리맵)으로 내보낸 모델이면 pkl/booster를 올리지 않고 펼친 트리로 예측합니다.
+        native = get_shared_trees(model_name)
+        if native is None:
+            native = get_native_model(model_name)
+        if native is not None:
+            return native.predict_rows(input_data)
+    if FLAT_FOREST_ENABLED:
+        forest = get_flat_forest(model_name)
+        if forest is not None:
+            return forest.predict_rows(input_data)
+    model = load_model(model_name)
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    if _has_column_transformer(model):
+        X = get_encoder(model_name, model).encode(input_data)
+        return estimator.predict_proba(X) if is_classifier(estimator) else estimator.predict(X)
+    df = pd.DataFrame(input_data)
+    return model.predict_proba(df) if is_classifier(estimator) else model.predict(df)
+
+
+def model_classes(model_name: str) -> np.ndarray:
+    """
+    분류 모델의 클래스 목록 (run_model이 반환하는 확률 컬럼 순서)
+    """
+    forest = get_flat_forest(model_name) if FLAT_FOREST_ENABLED else None
+    if forest is not None:
+        return forest.classes_
+    model = load_model(model_name)
+    return (model.steps[-1][1] if hasattr(model, "steps") else model).classes_
+
+
+_executor = None
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_executor() -> InferenceExecutor:
+    """
+    run_model을 실행하는 추론 실행기 (ML_EXECUTOR=process|thread)
+    """
+    global _executor
+    if _executor is None:
+        _executor = InferenceExecutor(run_model)
+    return _executor
+
+
+def get_batcher() -> InferenceBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = InferenceBatcher(get_executor().submit)
+    return _batcher
+
+
+def start_model_watcher():
     """
-    model_path = os.path.join(MODEL_DIR, f"{model_name}.pkl")
-    model = joblib.load(model_path)
-    return model
+    서버 기동 시 호출: 모델 파일 감시를 시작합니다.
+    프로세스 실행기는 새 버전을 로드한 워커 풀을 미리 띄운 뒤 레지스트리와 함께 교체합니다.
+    """
+    if not WATCH_ENABLED:
+        return None
+    # 감시 대상은 이 프로세스 레지스트리에 올라간 모델이므로, 워커가 서빙하는 모델을 여기에도 올려 둡니다.
+    get_registry().preload(get_executor().preload_models, warmup=False)
+    watcher = get_model_watcher()
+    watcher.add_hook(lambda model_name, version: get_executor().reload_workers({model_name: version}))
+    watcher.start()
+    return watcher
+
+
+def _submit_uncached(model_name: str, input_data: List[dict]):
+    """
+    예측을 실행기에 넘기고 Future를 반환합니다. (배칭 사용 시 동시 요청과 묶어서 실행)
+    """
+    if BATCHING_ENABLED:
+        return get_batcher().submit(model_name, input_data)
+    return get_executor().submit(model_name, input_data)
+
+
+def _submit(model_name: str, input_data: List[dict]):
+    """
+    캐시에 있는 행은 바로 채우고, 나머지 행만 실행기로 넘깁니다.
+    """
+    if CACHE_ENABLED:
+        return get_prediction_cache().submit(model_name, input_data, _submit_uncached)
+    return _submit_uncached(model_name, input_data)
+
+
+def _predict(model_name: str, input_data: List[dict]) -> np.ndarray:
+    """
+    predict_* 함수들의 공통 예측 경로 (동기 호출)
+    """
+    return get_executor().wait(_submit(model_name, input_data))
+
+
+INTERVAL_SUFFIX = "@interval"
+EXPLAIN_SUFFIX = "@explain"
+
+
+def _interval_payload(intervals: np.ndarray, targets: List[str] = None, info: dict = XGB_INTERVAL_INFO) -> dict:
+    """
+    intervals: [..., 하한/상한] 배열 -> 응답용 예측 구간 (info: 구간 계산 방식)
+    targets가 있으면 타깃(예: roi, bep)별로 나눠서 반환합니다.
+    """
+    if targets is None:
+        return {
+            **info,
+            "lower": intervals[..., 0].tolist(),
+            "upper": intervals[..., 1].tolist(),
+        }
+    payload = dict(info)
+    for j, target in enumerate(targets):
+        payload[target] = {
+            "lower": intervals[:, j, 0].tolist(),
+            "upper": intervals[:, j, 1].tolist(),
+        }
+    return payload
 
 
 # -----------------
 # 1) 회귀 예측 함수들
 # -----------------
 
-def predict_acc_sales_planning(input_data: List[dict]) -> dict:
+def predict_acc_sales_planning(input_data: List[dict], preds: np.ndarray = None, intervals: np.ndarray = None) -> dict:
     """
     (기획 단계) 관객 수 예측
     모델 파일: xgb_reg_accumulated_sales_planning.pkl
     """
-    model = load_model("xgb_reg_accumulated_sales_planning")
-    df = pd.DataFrame(input_data)
-    preds = model.predict(df)
+    if preds is None:
+        preds = _predict("xgb_reg_accumulated_sales_planning", input_data)
     
     comparison_data = [
         {"performance_id": 101, "performance_name": "뮤지컬 캣츠", "actual": 2800, "predicted": float(preds[0])},
@@ -42,12 +199,16 @@ def predict_acc_sales_planning(input_data: List[dict]) -> dict:
         {"performance_id": 105, "performance_name": "무용 공연 불릿", "actual": 2700, "predicted": float(preds[0]) - 30}
     ]
     
+    # 예측 구간이 있으면 preds[0] 기준 구간의 폭을 실제 하한/상한 폭으로 사용합니다.
+    below, above = (20, 20) if intervals is None else (
+        float(preds[0] - intervals[0][0]), float(intervals[0][1] - preds[0]))
+
     time_series_data = {
         "dates": ["2025-05-01", "2025-05-02", "2025-05-03", "2025-05-04", "2025-05-05"],
         "predicted_cumulative": [1000, 2000, float(preds[0]), float(preds[0]) + 150, float(preds[0]) + 300],
         "confidence_interval": {
-            "lower": [950, 1900, float(preds[0]) - 20, float(preds[0]) + 130, float(preds[0]) + 280],
-            "upper": [1050, 2100, float(preds[0]) + 20, float(preds[0]) + 170, float(preds[0]) + 320]
+            "lower": [950, 1900, float(preds[0]) - below, float(preds[0]) + 150 - below, float(preds[0]) + 300 - below],
+            "upper": [1050, 2100, float(preds[0]) + above, float(preds[0]) + 150 + above, float(preds[0]) + 300 + above]
         }
     }
     
@@ -63,18 +224,18 @@ def predict_acc_sales_planning(input_data: List[dict]) -> dict:
         "predictions": preds.tolist(),
         "comparison": {"performances": comparison_data},
         "capacity_scatter": capacity_scatter,
-        "time_series": time_series_data
+        "time_series": time_series_data,
+        **({} if intervals is None else {"prediction_interval": _interval_payload(intervals)})
     }
 
 
-def predict_acc_sales_selling(input_data: List[dict]) -> dict:
+def predict_acc_sales_selling(input_data: List[dict], preds: np.ndarray = None, intervals: np.ndarray = None) -> dict:
     """
     (판매 단계) 관객 수 예측
     모델 파일: xgb_reg_accumulated_sales_selling.pkl
     """
-    model = load_model("xgb_reg_accumulated_sales_selling")
-    df = pd.DataFrame(input_data)
-    preds = model.predict(df)
+    if preds is None:
+        preds = _predict("xgb_reg_accumulated_sales_selling", input_data)
     
     time_series_data = {
         "dates": ["2025-06-01", "2025-06-02", "2025-06-03", "2025-06-04"],
@@ -100,25 +261,50 @@ def predict_acc_sales_selling(input_data: List[dict]) -> dict:
         "predictions": preds.tolist(),
         "time_series": time_series_data,
         "capacity_scatter": capacity_scatter,
-        "comparison": {"performances": comparison_data}
+        "comparison": {"performances": comparison_data},
+        **({} if intervals is None else {"prediction_interval": _interval_payload(intervals)})
     }
 
 
-def predict_roi_bep_planning(input_data: List[dict]) -> dict:
+# ROI/BEP 계산 방식: model(xgb_reg_roi_bep_*), formula(계산식), compare(모델 + 계산식과의 편차)
+ROI_BEP_METHODS = ["model", "formula", "compare"]
+
+
+def _roi_bep_preds(model_name: str, input_data: List[dict], method: str) -> np.ndarray:
+    if method == "formula":
+        return roi_bep_formula.predict_rows(input_data)
+    return _predict(model_name, input_data)
+
+
+def roi_bep_deviation(stage: str = "planning", input_data: List[dict] = None) -> dict:
+    """
+    xgb_reg_roi_bep_{stage} 모델 예측과 계산식의 차이 (입력이 없으면 공연 카탈로그 + roi_bep_data 기준)
+    """
+    if stage not in ("planning", "selling"):
+        raise ValueError("stage는 planning 또는 selling 이어야 합니다.")
+    model_name = f"xgb_reg_roi_bep_{stage}"
+    input_data = input_data or roi_bep_formula.reference_rows()
+    report = roi_bep_formula.deviation(_predict(model_name, input_data), roi_bep_formula.predict_rows(input_data))
+    report.update({"model": model_name, "model_version": get_registry().version(model_name)})
+    if all("performance_id" in row for row in input_data):
+        for target in roi_bep_formula.TARGETS:
+            if "worst_rows" in report[target]:
+                report[target]["worst_performances"] = [input_data[i]["performance_id"]
+                                                        for i in report[target]["worst_rows"]]
+    return report
+
+
+def predict_roi_bep_planning(input_data: List[dict], preds: np.ndarray = None, intervals: np.ndarray = None,
+                             method: str = "model") -> dict:
     """
     (기획 단계) 손익 예측
-    모델 파일: xgb_reg_roi_bep_planning.pkl
+    모델 파일: xgb_reg_roi_bep_planning.pkl (method="formula" 이면 모델 없이 계산식 사용)
     """
-    model = load_model("xgb_reg_roi_bep_planning")
-    df = pd.DataFrame(input_data)
-    preds = model.predict(df)
+    if preds is None:
+        preds = _roi_bep_preds("xgb_reg_roi_bep_planning", input_data, method)
     
-    roi_bep_detail = {
-        "total_revenue": 35000000,
-        "total_cost": 42000000,
-        "fixed_cost": 60000000,
-        "variable_cost_rate": 0.2
-    }
+    # 손익 내역은 입력값으로 정확히 계산됩니다.
+    roi_bep_detail = roi_bep_formula.detail(input_data[0])
     
     roi_time_series = {
         "dates": ["시뮬레이션1", "시뮬레이션2", "시뮬레이션3", "시뮬레이션4", "시뮬레이션5"],
@@ -134,18 +320,19 @@ def predict_roi_bep_planning(input_data: List[dict]) -> dict:
         "predictions": preds.tolist(),
         "roi_bep_detail": roi_bep_detail,
         "roi_time_series": roi_time_series,
-        "roi_distribution": roi_distribution
+        "roi_distribution": roi_distribution,
+        **({} if intervals is None else {"prediction_interval": _interval_payload(intervals, ["roi", "bep"])})
     }
 
 
-def predict_roi_bep_selling(input_data: List[dict]) -> dict:
+def predict_roi_bep_selling(input_data: List[dict], preds: np.ndarray = None, intervals: np.ndarray = None,
+                            method: str = "model") -> dict:
     """
     (판매 단계) 손익 예측
-    모델 파일: xgb_reg_roi_bep_selling.pkl
+    모델 파일: xgb_reg_roi_bep_selling.pkl (method="formula" 이면 모델 없이 계산식 사용)
     """
-    model = load_model("xgb_reg_roi_bep_selling")
-    df = pd.DataFrame(input_data)
-    preds = model.predict(df)
+    if preds is None:
+        preds = _roi_bep_preds("xgb_reg_roi_bep_selling", input_data, method)
     
     comparison_data = {
         "actual": {
@@ -173,7 +360,8 @@ def predict_roi_bep_selling(input_data: List[dict]) -> dict:
     return {
         "predictions": preds.tolist(),
         "comparison": comparison_data,
-        "time_series": time_series_data
+        "time_series": time_series_data,
+        **({} if intervals is None else {"prediction_interval": _interval_payload(intervals, ["roi", "bep"])})
     }
 
 
@@ -202,19 +390,17 @@ def predict_roi_bep_selling(input_data: List[dict]) -> dict:
 #     return {"roc_curve": roc_data, "pr_curve": pr_data}
 
 
-def predict_ticket_risk(input_data: List[dict]) -> dict:
+def predict_ticket_risk(input_data: List[dict], preds: np.ndarray = None, intervals: np.ndarray = None) -> dict:
     """
     (판매 단계) 티켓 위험 예측 분류
     모델 파일: rf_cls_ticket_risk.pkl
     """
-    model = load_model("rf_cls_ticket_risk")
-    df = pd.DataFrame(input_data)
-    preds = model.predict(df)
-    
-    try:
-        pred_proba = model.predict_proba(df)
-    except:
-        pred_proba = np.full((df.shape[0], 3), 1/3)
+    if preds is None:
+        preds = _predict("rf_cls_ticket_risk", input_data)
+    # preds: 클래스별 확률 -> 라벨은 확률이 가장 높은 클래스 (RandomForestClassifier.predict와 동일)
+    classes = model_classes("rf_cls_ticket_risk")
+    risk_proba = np.asarray(preds)
+    labels = classes.take(np.argmax(risk_proba, axis=1), axis=0)
 
     # (이진분류 대응, 등등) -> 스킵...
 
@@ -231,110 +417,116 @@ def predict_ticket_risk(input_data: List[dict]) -> dict:
         warning_text = "고위험"
     
     return {
-        "risk_labels": preds.tolist(),
+        "risk_labels": labels.tolist(),
+        "risk_proba": risk_proba.tolist(),
+        "risk_classes": classes.tolist(),
         "risk_detail": {
             "current_booking_rate": booking_rate,
             "target_booking_rate": 75,
             "warning": warning_text
-        }}
+        },
+        **({} if intervals is None else {"proba_interval": _interval_payload(intervals, classes.tolist(), FOREST_INTERVAL_INFO)})
+    }
     #     "evaluation_curves": evaluation_curves
     # }
 
 
+# 분석 유형(API 경로 이름) -> (모델 이름, 결과 구성 함수)
+PREDICTORS = {
+    "accumulated_sales_planning": ("xgb_reg_accumulated_sales_planning", predict_acc_sales_planning),
+    "accumulated_sales_selling": ("xgb_reg_accumulated_sales_selling", predict_acc_sales_selling),
+    "roi_bep_planning": ("xgb_reg_roi_bep_planning", predict_roi_bep_planning),
+    "roi_bep_selling": ("xgb_reg_roi_bep_selling", predict_roi_bep_selling),
+    "ticket_risk_selling": ("rf_cls_ticket_risk", predict_ticket_risk),
+}
+
+ROI_BEP_PREDICTORS = (predict_roi_bep_planning, predict_roi_bep_selling)
+
+# 타깃이 여러 개인 분석 유형의 타깃 이름 (설명을 타깃별로 나눌 때 사용)
+PREDICTOR_TARGETS = {
+    "roi_bep_planning": ["roi", "bep"],
+    "roi_bep_selling": ["roi", "bep"],
+}
+
+
+async def predict_async(analysis_type: str, input_data: List[dict], timeout: float = None,
+                        uncertainty: bool = False, explain: bool = False, method: str = "model") -> dict:
+    """
+    비동기 예측: 모델 연산은 추론 실행기에서 수행하고 이벤트 루프는 결과만 기다립니다.
+    timeout(초)을 넘기면 asyncio.TimeoutError가 발생합니다.
+    uncertainty=True 이면 같은 배칭/실행기 경로로 트리별(반복별) 출력 기반 예측 구간도 함께 계산합니다.
+    explain=True 이면 특성별 기여도(explanation)도 같은 경로로 함께 계산합니다. (XGBoost 모델)
+    method는 손익 예측(roi_bep_*)에서만 사용합니다. (ROI_BEP_METHODS)
+    응답의 model_version은 실제로 예측한 프로세스에서 서빙 중이던 모델 버전입니다.
+    """
+    model_name, predict_fn = PREDICTORS[analysis_type]
+    if method not in ROI_BEP_METHODS or (method != "model" and predict_fn not in ROI_BEP_PREDICTORS):
+        raise ValueError(f"{analysis_type}: 지원하지 않는 method입니다: {method}")
+    if method == "formula":
+        if uncertainty or explain:
+            raise ValueError("method=formula 에서는 uncertainty/explain을 사용할 수 없습니다. (계산식은 정확한 값)")
+        preds = roi_bep_formula.predict_rows(input_data)
+        if np.isnan(preds).any():
+            raise ValueError("ROI/BEP를 계산할 수 없는 입력이 있습니다. (총비용 0, 또는 variable_cost_rate >= 1 / ticket_price <= 0)")
+        output = predict_fn(input_data, preds=preds)
+        output["method"] = "formula"
+        return output
+    if CACHE_ENABLED and not get_prediction_cache().ready(model_name):
+        # 캐시 키 인코더를 처음 읽을 때는 파일 I/O가 있으므로 이벤트 루프 밖에서 준비합니다.
+        await asyncio.to_thread(get_prediction_cache().prepare, model_name)
+    future = _submit(model_name + INTERVAL_SUFFIX if uncertainty else model_name, input_data)
+    waits = [get_executor().wait_async(future, timeout)]
+    if explain:
+        columns = get_explainer(model_name).columns
+        waits.append(get_executor().wait_async(_submit(model_name + EXPLAIN_SUFFIX, input_data), timeout))
+    results = await asyncio.gather(*waits)
+
+    if not uncertainty:
+        output = predict_fn(input_data, preds=results[0])
+    else:
+        output = predict_fn(input_data, preds=results[0][..., 0], intervals=results[0][..., 1:])
+    if explain:
+        output["explanation"] = explanation_payload(results[1], columns, PREDICTOR_TARGETS.get(analysis_type))
+    if method == "compare":
+        formula = roi_bep_formula.predict_rows(input_data)
+        output["formula"] = {
+            "predictions": [roi_bep_formula.json_list(row) for row in formula],
+            "deviation": roi_bep_formula.deviation(output["predictions"], formula),
+        }
+    # 예측에 사용된 모델 버전 (모델 파일 내용 해시)
+    output["model_version"] = getattr(future, "model_version", None)
+    return output
+
+
 # -----------------------------------------
 # DB 버전: 집계 시각화 데이터 (실제 호출용)
 # -----------------------------------------
 
+def _stats_db(name: str) -> dict:
+    # 집계(SUM ... GROUP BY)는 DB에서 하고, 그룹별 결과만 받아 응답 형식으로 바꿉니다.
+    df = stats_queries.stats_frame(name)
+    return {name: {col: df[col].tolist() for col in df.columns}}
+
+
 def get_genre_stats_db() -> dict:
     """
     DB에서 가져오는 장르별 통계
     """
-    query = "SELECT * FROM dbo.genre_stats_tb;"
-    df = execute_query(query)
-    df.rename(columns={
-        "장르": "genre",
-        "개막편수": "performance_count",
-        "관객수": "audience",
-        "매출액": "ticket_revenue"
-    }, inplace=True)
-    use_cols = ["genre", "performance_count", "audience", "ticket_revenue"]
-    df = df[use_cols].fillna(0)
-    # groupby or skip if already aggregated
-    grouped = df.groupby("genre", as_index=False).sum()
-    grouped.sort_values(by="genre", inplace=True)
-    
-    return {
-        "genre_stats": {
-            "genre": grouped["genre"].tolist(),
-            "performance_count": grouped["performance_count"].astype(int).tolist(),
-            "audience": grouped["audience"].astype(int).tolist(),
-            "ticket_revenue": grouped["ticket_revenue"].astype(int).tolist()
-        }
-    }
+    return _stats_db("genre_stats")
 
 
 def get_regional_stats_db() -> dict:
     """
     DB에서 가져오는 지역별 통계
     """
-    query = "SELECT * FROM dbo.region_stats_tb;"
-    df = execute_query(query)
-    df.rename(columns={
-        "지역명": "region",
-        "공연건수": "performance_count",
-        "상연횟수": "show_count",
-        "총티켓판매수": "total_ticket_sales",
-        "총티켓판매액": "total_ticket_revenue"
-    }, inplace=True)
-    use_cols = ["region", "performance_count", "show_count", "total_ticket_sales", "total_ticket_revenue"]
-    df = df[use_cols].fillna(0)
-    grouped = df.groupby("region", as_index=False).sum()
-    grouped.sort_values(by="region", inplace=True)
-    
-    return {
-        "regional_stats": {
-            "region": grouped["region"].tolist(),
-            "performance_count": grouped["performance_count"].astype(int).tolist(),
-            "show_count": grouped["show_count"].astype(int).tolist(),
-            "total_ticket_sales": grouped["total_ticket_sales"].astype(int).tolist(),
-            "total_ticket_revenue": grouped["total_ticket_revenue"].astype(int).tolist()
-        }
-    }
+    return _stats_db("regional_stats")
 
 
 def get_venue_scale_stats_db() -> dict:
     """
-    DB에서 가져오는 공연장 규모별 통계 (2023/2024)
-    """
-    query = "SELECT * FROM dbo.facility_stats_tb;"
-    df = execute_query(query)
-    df.rename(columns={
-        "연도": "year",
-        "규모": "scale",
-        "공연건수": "performance_count",
-        "총티켓판매수": "total_ticket_sales"
-    }, inplace=True)
-    use_cols = ["year", "scale", "performance_count", "total_ticket_sales"]
-    df = df[use_cols].fillna(0)
-    grouped = df.groupby(["year", "scale"], as_index=False).sum()
-    grouped.sort_values(by=["year", "scale"], inplace=True)
-    
-    # 더미 예시처럼 2023 + 2024 이어붙이기
-    df_2023 = grouped[grouped["year"] == 2023].sort_values(by="scale")
-    df_2024 = grouped[grouped["year"] == 2024].sort_values(by="scale")
-    year_list = df_2023["year"].astype(int).tolist() + df_2024["year"].astype(int).tolist()
-    scale_list = df_2023["scale"].tolist() + df_2024["scale"].tolist()
-    perf_list = df_2023["performance_count"].astype(int).tolist() + df_2024["performance_count"].astype(int).tolist()
-    sales_list = df_2023["total_ticket_sales"].astype(int).tolist() + df_2024["total_ticket_sales"].astype(int).tolist()
-    
-    return {
-        "venue_scale_stats": {
-            "year": year_list,
-            "scale": scale_list,
-            "performance_count": perf_list,
-            "total_ticket_sales": sales_list
-        }
-    }
+    DB에서 가져오는 공연장 규모별 통계 (2023/2024, 연도 -> 규모 순)
+    """
+    return _stats_db("venue_scale_stats")
 
 
 # ------------------------------------
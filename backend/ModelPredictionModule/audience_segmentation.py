@@ -0,0 +1,268 @@
+# backend/ModelPredictionModule/audience_segmentation.py
+#
+# 관객 세그먼트 분류 (kmeans_audience_seg.pkl)
+# StandardScaler + KMeans 파이프라인의 predict를 행 단위로 호출하지 않고,
+# 청크마다 (표준화된 입력 행렬 x 중심점 행렬) BLAS 행렬곱으로 모든 중심점까지의 제곱거리를 구해 배정합니다.
+#
+# 일괄 배정 (audience_tb 형식 입력 -> 사용자별 세그먼트 파일 + 세그먼트 요약 출력):
+#   cd backend
+#   python -m ModelPredictionModule.audience_segmentation ../frontend/public/audience_tb.json --output segments.parquet
+
+import os
+import sys
+import time
+import argparse
+import logging
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry, register_loader, read_shared
+from ModelPredictionModule.bulk_score import iter_frames, ColumnarWriter
+
+logger = logging.getLogger("audience_segmentation")
+
+SEGMENT_MODEL = "kmeans_audience_seg"
+SEGMENT_FEATURES = ["booking_count", "total_amount", "age", "recency_days"]
+DEFAULT_CHUNK_SIZE = int(os.getenv("ML_SEGMENT_CHUNK_SIZE", "262144"))
+# recency_days 기준일: 요청/청크 구성과 상관없이 같은 사용자는 같은 세그먼트가 되도록 고정합니다.
+# (기본: 학습 데이터 audience_tb의 가장 최근 last_booking)
+DEFAULT_REFERENCE_DATE = os.getenv("ML_SEGMENT_REFERENCE_DATE", "2025-05-01")
+
+# 중심점에서 가장 두드러진 특성(표준화 값)으로 세그먼트 이름을 붙입니다.
+_FEATURE_LABELS = {
+    ("booking_count", 1): "다회 예매 충성 고객",
+    ("booking_count", -1): "저빈도 고객",
+    ("total_amount", 1): "고액 구매 고객",
+    ("total_amount", -1): "저액 구매 고객",
+    ("age", 1): "고연령 고객",
+    ("age", -1): "저연령 고객",
+    ("recency_days", 1): "휴면 고객",
+    ("recency_days", -1): "최근 활동 고객",
+}
+
+
+class CentroidAssigner:
+    """
+    표준화 파라미터(mean, scale)와 KMeans 중심점으로 최근접 중심점을 배정합니다.
+    ||x - c||^2 = ||x||^2 - 2 x·c + ||c||^2 에서 x·c 항을 청크 단위 행렬곱으로 계산합니다.
+    """
+    def __init__(self, mean, scale, centers, features=SEGMENT_FEATURES):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.centers = np.ascontiguousarray(centers, dtype=np.float64)
+        self.features = list(features)
+        self.center_sq = np.einsum("ij,ij->i", self.centers, self.centers)
+        self.names = self._segment_names()
+
+    @classmethod
+    def from_pipeline(cls, model) -> "CentroidAssigner":
+        scaler, kmeans = model.steps[0][1], model.steps[-1][1]
+        features = list(getattr(model, "feature_names_in_", SEGMENT_FEATURES))
+        return cls(scaler.mean_, scaler.scale_, kmeans.cluster_centers_, features)
+
+    @property
+    def n_segments(self) -> int:
+        return self.centers.shape[0]
+
+    def _segment_names(self) -> list:
+        names = []
+        for center in self.centers:
+            j = int(np.argmax(np.abs(center)))
+            if abs(center[j]) < 0.5:
+                names.append("일반 고객")
+            else:
+                names.append(_FEATURE_LABELS.get((self.features[j], int(np.sign(center[j]))), self.features[j]))
+        return names
+
+    def to_shared(self) -> tuple:
+        """
+        공유 형식으로 저장할 (배열 dict, 파라미터 dict) - KMeans의 학습 라벨(labels_)은 저장하지 않습니다.
+        """
+        return {"mean": self.mean, "scale": self.scale, "centers": self.centers}, {"features": self.features}
+
+    @classmethod
+    def from_shared(cls, arrays: dict, params: dict) -> "CentroidAssigner":
+        return cls(arrays["mean"], arrays["scale"], arrays["centers"], params["features"])
+
+    def centers_original(self) -> np.ndarray:
+        """
+        중심점을 원래 단위(건수, 원, 세, 일)로 되돌린 값
+        """
+        return self.centers * self.scale + self.mean
+
+    def assign(self, X: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        X: (n, 특성 수) 원 단위 입력 -> (세그먼트 번호, 중심점까지의 제곱거리)
+        """
+        n = X.shape[0]
+        labels = np.empty(n, dtype=np.int32)
+        distances = np.empty(n, dtype=np.float64)
+        for start in range(0, n, chunk_size):
+            # StandardScaler.transform과 같은 순서로 표준화합니다.
+            Xs = (np.asarray(X[start:start + chunk_size], dtype=np.float64) - self.mean) / self.scale
+            scores = Xs @ (-2.0 * self.centers.T)
+            scores += self.center_sq
+            best = np.argmin(scores, axis=1)
+            labels[start:start + len(Xs)] = best
+            distances[start:start + len(Xs)] = np.maximum(
+                scores[np.arange(len(Xs)), best] + np.einsum("ij,ij->i", Xs, Xs), 0.0)
+        return labels, distances
+
+
+def _load_assigner(model_name: str, registry):
+    """
+    레지스트리 로더: 공유 형식이 있으면 중심점 배열만 열고, 없으면 pkl 파이프라인에서 꺼냅니다.
+    """
+    shared = read_shared(model_name, "centroids")
+    if shared is not None:
+        arrays, manifest = shared
+        return CentroidAssigner.from_shared(arrays, manifest["params"]), manifest["path"], manifest["source_version"]
+    return CentroidAssigner.from_pipeline(registry.get(model_name)), registry.model_path(model_name)
+
+
+register_loader("centroids", _load_assigner)
+
+
+def get_assigner(model_name: str = SEGMENT_MODEL) -> CentroidAssigner:
+    return get_registry().get(model_name, kind="centroids")
+
+
+def feature_matrix(frame: pd.DataFrame, reference_date: str = None) -> np.ndarray:
+    """
+    audience_tb 레코드 -> (booking_count, total_amount, age, recency_days) 행렬
+    recency_days가 없으면 reference_date(없으면 DEFAULT_REFERENCE_DATE) - last_booking (일)로 계산합니다.
+    """
+    recency = np.full(len(frame), np.nan)
+    if "recency_days" in frame:
+        recency = pd.to_numeric(frame["recency_days"], errors="coerce").to_numpy(dtype=np.float64)
+    if "last_booking" in frame and np.isnan(recency).any():
+        last = pd.to_datetime(frame["last_booking"], errors="coerce")
+        reference = pd.Timestamp(reference_date or DEFAULT_REFERENCE_DATE)
+        recency = np.where(np.isnan(recency), (reference - last).dt.days.to_numpy(dtype=np.float64), recency)
+    X = np.column_stack([
+        pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64) if col in frame else np.full(len(frame), np.nan)
+        for col in SEGMENT_FEATURES[:-1]
+    ] + [recency])
+    # 값이 없는 특성은 학습 평균(표준화 후 0)으로 채웁니다.
+    assigner = get_assigner()
+    missing = np.isnan(X)
+    if missing.any():
+        X[missing] = np.broadcast_to(assigner.mean, X.shape)[missing]
+    return X
+
+
+class SegmentSummary:
+    """
+    세그먼트별 집계 (청크 단위로 누적: 인원, 구매액, 예매 수, 연령, 최근성, 선호 장르)
+    """
+    def __init__(self, assigner: CentroidAssigner):
+        self.assigner = assigner
+        k = assigner.n_segments
+        self.size = np.zeros(k, dtype=np.int64)
+        self.sums = np.zeros((k, len(assigner.features)), dtype=np.float64)
+        self.genres = [Counter() for _ in range(k)]
+
+    def add(self, labels: np.ndarray, X: np.ndarray, genres=None):
+        k = self.assigner.n_segments
+        self.size += np.bincount(labels, minlength=k)
+        for j in range(X.shape[1]):
+            self.sums[:, j] += np.bincount(labels, weights=X[:, j], minlength=k)
+        if genres is not None:
+            counts = pd.DataFrame({"segment": labels, "genre": genres}).value_counts()
+            for (segment, genre), count in counts.items():
+                self.genres[segment][genre] += int(count)
+
+    def to_list(self) -> list:
+        total = int(self.size.sum())
+        centers = self.assigner.centers_original()
+        segments = []
+        for i in range(self.assigner.n_segments):
+            size = int(self.size[i])
+            means = self.sums[i] / size if size else np.zeros(len(self.assigner.features))
+            avg = dict(zip(self.assigner.features, means))
+            top_genres = self.genres[i].most_common(3)
+            segments.append({
+                "segment": i,
+                "name": self.assigner.names[i],
+                "size": size,
+                "share": round(size / total, 4) if total else 0,
+                "total_spend": float(self.sums[i, self.assigner.features.index("total_amount")]),
+                "avg_spend": float(avg["total_amount"]),
+                "avg_booking_count": float(avg["booking_count"]),
+                "avg_age": float(avg["age"]),
+                "avg_recency_days": float(avg["recency_days"]),
+                "preferred_genre": top_genres[0][0] if top_genres else None,
+                "top_genres": [{"genre": genre, "count": count} for genre, count in top_genres],
+                "centroid": dict(zip(self.assigner.features, map(float, centers[i]))),
+            })
+        return segments
+
+
+def segment_users(users: list, reference_date: str = DEFAULT_REFERENCE_DATE) -> dict:
+    """
+    API용: 사용자 목록 -> 사용자별 세그먼트 + 세그먼트 요약
+    """
+    frame = pd.DataFrame(users)
+    X = feature_matrix(frame, reference_date or DEFAULT_REFERENCE_DATE)
+    assigner = get_assigner()
+    labels, distances = assigner.assign(X)
+    summary = SegmentSummary(assigner)
+    summary.add(labels, X, frame["preferred_genre"].to_numpy() if "preferred_genre" in frame else None)
+    ids = [user.get("user_id", i) for i, user in enumerate(users)]
+    return {
+        "assignments": [
+            {"user_id": user_id, "segment": int(label), "segment_name": assigner.names[label], "distance": float(d)}
+            for user_id, label, d in zip(ids, labels, distances)
+        ],
+        "segments": summary.to_list(),
+        "model_version": get_registry().version(SEGMENT_MODEL),
+    }
+
+
+def run(source: str, output: str = None, reference_date: str = DEFAULT_REFERENCE_DATE,
+        chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    일괄 배정: 입력을 청크로 읽어 배정하고, 사용자별 결과는 output에 이어 쓰며 세그먼트 요약을 반환합니다.
+    reference_date가 없으면 DEFAULT_REFERENCE_DATE를 사용합니다.
+    """
+    reference_date = reference_date or DEFAULT_REFERENCE_DATE
+    assigner = get_assigner()
+    summary = SegmentSummary(assigner)
+    writer = ColumnarWriter(output) if output else None
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for frame in iter_frames(source, chunk_size):
+            X = feature_matrix(frame, reference_date)
+            labels, distances = assigner.assign(X, chunk_size)
+            summary.add(labels, X, frame["preferred_genre"].to_numpy() if "preferred_genre" in frame else None)
+            if writer is not None:
+                writer.write({
+                    "user_id": frame["user_id"].to_numpy() if "user_id" in frame else np.arange(rows, rows + len(frame)),
+                    "segment": labels,
+                    "distance": distances,
+                })
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"완료: {rows:,} users, {elapsed:.2f} s, {rows / elapsed:,.0f} users/s", file=sys.stderr, flush=True)
+    return {"rows": rows, "reference_date": reference_date, "segments": summary.to_list(),
+            "model_version": get_registry().version(SEGMENT_MODEL)}
+
+
+if __name__ == "__main__":
+    import pprint
+
+    parser = argparse.ArgumentParser(description="관객 세그먼트 일괄 배정")
+    parser.add_argument("source", help="audience_tb (json/jsonl/csv/parquet 또는 sql:<쿼리>)")
+    parser.add_argument("--output", help="사용자별 세그먼트 결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--reference-date", default=DEFAULT_REFERENCE_DATE, help="recency_days 기준일 (YYYY-MM-DD)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+    pprint.pprint(run(args.source, args.output, args.reference_date, args.chunk_size))
@@ -0,0 +1,282 @@
+# backend/ModelPredictionModule/backtest.py
+#
+# 판매 단계 모델 워크포워드 백테스트
+# sales_tb의 공연별 일자 기록을 처음부터 끝까지 재생하면서, 각 일자에 그 시점까지 알 수 있는 값
+# (공연 속성 + 해당 일자의 판매/광고/SNS 기록)으로 판매 단계 특성 벡터를 만들고,
+# 모든 (공연, 일자) 쌍을 청크 단위로 한 번에 예측해 실측과 비교합니다.
+#
+# - xgb_reg_accumulated_sales_selling: 일자별 누적 판매량 예측 vs 실측 누적 판매량
+# - rf_cls_ticket_risk: 일자별 위험 라벨 vs 공연 종료 시점 예매율로 정한 실제 위험 등급
+# - 지표는 전체 / 장르 / 지역 / 예측 시점(종료까지 남은 일수) 구간별로 집계합니다.
+# - 공연 단위로 나눈 청크를 프로세스 풀에서 병렬 처리합니다. (bulk_score와 같은 워커 초기화)
+#
+#   cd backend
+#   python -m ModelPredictionModule.backtest \
+#       --performances ../frontend/public/performance_tb.json \
+#       --sales ../frontend/public/sales_tb.json \
+#       --report backtest_report.json --comparison ../frontend/public/공연별_실측_vs_예측.json
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.bulk_score import (
+    iter_frames, load_catalog, prepare_rows, score_chunk, init_worker, ColumnarWriter, DEFAULT_WORKERS,
+)
+
+logger = logging.getLogger("backtest")
+
+SALES_MODEL = "xgb_reg_accumulated_sales_selling"
+RISK_MODEL = "rf_cls_ticket_risk"
+BACKTEST_MODELS = [SALES_MODEL, RISK_MODEL]
+
+# 청크당 목표 행 수 (공연 단위로 자르므로 실제 크기는 조금 다를 수 있음)
+DEFAULT_CHUNK_SIZE = int(os.getenv("ML_BACKTEST_CHUNK_SIZE", "5000"))
+
+# 예측 시점 구간: 공연의 마지막 판매 기록일까지 남은 일수 (이상, 이하)
+HORIZON_BUCKETS = [
+    (0, 0, "D-0"),
+    (1, 7, "D-1~7"),
+    (8, 14, "D-8~14"),
+    (15, 30, "D-15~30"),
+    (31, None, "D-31+"),
+]
+
+# 실제 위험 등급: 종료 시점 예매율(%) 기준 (predict_ticket_risk의 경고 기준과 동일)
+# 0: 안정 (저위험, 75% 이상), 1: 중위험 (60% 이상), 2: 고위험
+RISK_THRESHOLDS = [(75, 0), (60, 1)]
+HIGH_RISK = 2
+
+
+def horizon_bucket(days: np.ndarray) -> np.ndarray:
+    labels = np.full(len(days), HORIZON_BUCKETS[-1][2], dtype=object)
+    for low, high, label in reversed(HORIZON_BUCKETS):
+        mask = days >= low if high is None else (days >= low) & (days <= high)
+        labels[mask] = label
+    return labels
+
+
+def risk_level(booking_rate: np.ndarray) -> np.ndarray:
+    levels = np.full(len(booking_rate), HIGH_RISK, dtype=np.int64)
+    for threshold, level in reversed(RISK_THRESHOLDS):
+        levels[booking_rate >= threshold] = level
+    return levels
+
+
+def backtest_chunk(frame: pd.DataFrame, catalog: dict, model_names: list = BACKTEST_MODELS) -> dict:
+    """
+    공연 여러 개의 전체 판매 기록 -> 일자별 예측/실측 컬럼 (워커 프로세스에서 실행)
+    """
+    frame = frame.sort_values(["performance_id", "date"], kind="stable").reset_index(drop=True)
+    dates = pd.to_datetime(frame["date"])
+    by_performance = frame.groupby("performance_id", sort=False)
+    last_date = pd.to_datetime(by_performance["date"].transform("max"))
+    horizon_days = (last_date - dates).dt.days.to_numpy()
+    final_booking_rate = by_performance["booking_rate"].transform("last").to_numpy(dtype=np.float64)
+
+    rows = prepare_rows(frame, catalog)
+    scores = score_chunk(rows, model_names)
+    columns = {
+        "performance_id": frame["performance_id"].to_numpy(),
+        "date": dates.dt.strftime("%Y-%m-%d").to_numpy(),
+        "performance_name": np.array([row.get("performance_name") for row in rows], dtype=object),
+        "genre": np.array([row.get("genre") for row in rows], dtype=object),
+        "region": np.array([row.get("region") for row in rows], dtype=object),
+        "horizon_days": horizon_days,
+        "horizon": horizon_bucket(horizon_days),
+    }
+    if SALES_MODEL in model_names:
+        actual = frame["accumulated_sales"].to_numpy(dtype=np.float64)
+        predicted = np.asarray(scores["pred_accumulated_sales_selling"], dtype=np.float64)
+        columns["actual_accumulated_sales"] = actual
+        columns["pred_accumulated_sales"] = predicted
+        columns["error"] = predicted - actual
+    if RISK_MODEL in model_names:
+        columns["actual_risk"] = risk_level(final_booking_rate)
+        columns["risk_label"] = np.asarray(scores["risk_label"]).astype(np.int64)
+        columns["risk_proba"] = np.asarray(scores["risk_proba"], dtype=np.float64)
+    return columns
+
+
+def performance_partitions(sales: pd.DataFrame, chunk_size: int):
+    """
+    공연 단위로 끊어서 약 chunk_size 행씩 나눕니다. (한 공연의 기록은 항상 같은 청크)
+    """
+    sales = sales.sort_values(["performance_id", "date"], kind="stable").reset_index(drop=True)
+    ends = sales.groupby("performance_id", sort=True).size().cumsum().to_numpy()
+    start = 0
+    for end in ends:
+        if end - start >= chunk_size or end == ends[-1]:
+            yield sales.iloc[start:end]
+            start = end
+
+
+# -----------------
+# 지표
+# -----------------
+
+def regression_metrics(frame: pd.DataFrame, by: str = None) -> list:
+    """
+    누적 판매량 예측 오차: MAE, RMSE, MAPE(실측 > 0), WAPE, 편향(예측 - 실측 평균)
+    """
+    def metrics(group: pd.DataFrame) -> dict:
+        error = group["error"].to_numpy()
+        actual = group["actual_accumulated_sales"].to_numpy()
+        positive = actual > 0
+        return {
+            "n": int(len(group)),
+            "mae": float(np.mean(np.abs(error))),
+            "rmse": float(np.sqrt(np.mean(error ** 2))),
+            "mape": float(np.mean(np.abs(error[positive]) / actual[positive])) if positive.any() else None,
+            "wape": float(np.abs(error).sum() / actual.sum()) if actual.sum() else None,
+            "bias": float(np.mean(error)),
+        }
+
+    if by is None:
+        return [metrics(frame)]
+    return [{by: key, **metrics(group)} for key, group in frame.groupby(by, sort=True, observed=True)]
+
+
+def classification_metrics(frame: pd.DataFrame, by: str = None) -> list:
+    """
+    위험 라벨 정확도와 실제 등급별 적중률
+    """
+    def metrics(group: pd.DataFrame) -> dict:
+        correct = group["risk_label"].to_numpy() == group["actual_risk"].to_numpy()
+        recall = {
+            int(level): float(correct[group["actual_risk"].to_numpy() == level].mean())
+            for level in np.unique(group["actual_risk"])
+        }
+        return {"n": int(len(group)), "accuracy": float(correct.mean()), "recall_by_level": recall}
+
+    if by is None:
+        return [metrics(frame)]
+    return [{by: key, **metrics(group)} for key, group in frame.groupby(by, sort=True, observed=True)]
+
+
+def build_report(results: pd.DataFrame) -> dict:
+    report = {}
+    if "error" in results:
+        report["accumulated_sales"] = {
+            "overall": regression_metrics(results)[0],
+            "by_genre": regression_metrics(results, "genre"),
+            "by_region": regression_metrics(results, "region"),
+            "by_horizon": regression_metrics(results, "horizon"),
+        }
+    if "risk_label" in results:
+        report["ticket_risk"] = {
+            "overall": classification_metrics(results)[0],
+            "by_genre": classification_metrics(results, "genre"),
+            "by_region": classification_metrics(results, "region"),
+            "by_horizon": classification_metrics(results, "horizon"),
+        }
+    return report
+
+
+def comparison_records(results: pd.DataFrame) -> list:
+    """
+    공연별 마지막 기록의 실측 vs 예측 (frontend/public/공연별_실측_vs_예측.json 형식)
+    """
+    last = results.groupby("performance_id", sort=False).tail(1)
+    return [
+        {"performance_name": name, "actual": int(round(actual)), "predicted": int(round(predicted))}
+        for name, actual, predicted in zip(
+            last["performance_name"], last["actual_accumulated_sales"], last["pred_accumulated_sales"])
+    ]
+
+
+# -----------------
+# 실행
+# -----------------
+
+def run(performances: str, sales: str, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = DEFAULT_WORKERS,
+        model_names: list = None, output: str = None) -> tuple:
+    """
+    반환: (지표 리포트, 일자별 결과 DataFrame)
+    output을 지정하면 일자별 결과를 .csv/.parquet로도 저장합니다.
+    """
+    model_names = model_names or BACKTEST_MODELS
+    start = time.perf_counter()
+    catalog = load_catalog(performances)
+    sales_frame = pd.concat(list(iter_frames(sales, max(chunk_size, 10000))), ignore_index=True)
+    partitions = list(performance_partitions(sales_frame, chunk_size))
+
+    if workers > 1 and len(partitions) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(partitions)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(model_names,),
+        ) as pool:
+            # 워커에는 해당 청크 공연의 카탈로그만 보냅니다.
+            futures = [
+                pool.submit(backtest_chunk, part,
+                            {pid: catalog[pid] for pid in part["performance_id"].unique() if pid in catalog},
+                            model_names)
+                for part in partitions
+            ]
+            chunks = [future.result() for future in futures]
+    else:
+        chunks = [backtest_chunk(part, catalog, model_names) for part in partitions]
+
+    results = pd.concat([pd.DataFrame(columns) for columns in chunks], ignore_index=True)
+    # 구간별 지표를 가까운 시점부터 순서대로 보여 주도록 순서형 범주로 둡니다.
+    results["horizon"] = pd.Categorical(
+        results["horizon"], categories=[label for _, _, label in HORIZON_BUCKETS], ordered=True)
+    report = build_report(results)
+    elapsed = time.perf_counter() - start
+    report["info"] = {
+        "rows": int(len(results)),
+        "performances": int(results["performance_id"].nunique()),
+        "models": model_names,
+        "chunks": len(partitions),
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "horizon_buckets": [label for _, _, label in HORIZON_BUCKETS],
+    }
+    if output:
+        writer = ColumnarWriter(output)
+        try:
+            writer.write({col: results[col].to_numpy() for col in results.columns})
+        finally:
+            writer.close()
+    print(f"완료: {len(results):,} rows, {report['info']['performances']:,} performances, {elapsed:.2f} s", file=sys.stderr, flush=True)
+    return report, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="판매 단계 모델 워크포워드 백테스트")
+    parser.add_argument("--performances", required=True, help="performance_tb (json/jsonl/csv/parquet 또는 sql:<쿼리>)")
+    parser.add_argument("--sales", required=True, help="sales_tb (json/jsonl/csv/parquet 또는 sql:<쿼리>)")
+    parser.add_argument("--report", help="지표 리포트 JSON 경로 (없으면 표준 출력)")
+    parser.add_argument("--output", help="일자별 예측/실측 결과 (.csv 또는 .parquet)")
+    parser.add_argument("--comparison", help="공연별 실측 vs 예측 JSON (프론트엔드 형식)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    report, results = run(args.performances, args.sales, args.chunk_size, args.workers, output=args.output)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.comparison:
+        with open(args.comparison, "w", encoding="utf-8") as f:
+            json.dump(comparison_records(results), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# backend/ModelPredictionModule/bench_xgb_native.py
+#
+# pkl 파이프라인(DataFrame) vs 네이티브 Booster.inplace_predict 지연 시간 비교
+#   cd backend
+#   python -m ModelPredictionModule.bench_xgb_native
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry
+from ModelPredictionModule.xgb_native import XGB_MODELS, NativeXGBModel, sample_rows
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def _time_ms(fn, repeat: int) -> float:
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    for model_name in sys.argv[1:] or XGB_MODELS:
+        pipeline = get_registry().get(model_name)
+        native = NativeXGBModel.from_pipeline(pipeline)
+        rows = sample_rows(native.encoder, max(BATCH_SIZES))
+
+        print(f"\n=== {model_name} (nthread={native.nthread}) ===")
+        print(f"{'batch':>7} {'pkl(ms)':>10} {'native(ms)':>11} {'inplace(ms)':>12} {'speedup':>8} {'equal':>6}")
+        for size in BATCH_SIZES:
+            batch = rows[:size]
+            X = native.encoder.encode(batch)
+            repeat = max(3, 2000 // size)
+            pkl_ms = _time_ms(lambda: pipeline.predict(pd.DataFrame(batch)), repeat)
+            native_ms = _time_ms(lambda: native.predict_rows(batch), repeat)
+            inplace_ms = _time_ms(lambda: native.predict(X), repeat)
+            equal = np.array_equal(pipeline.predict(pd.DataFrame(batch)), native.predict_rows(batch))
+            print(f"{size:>7} {pkl_ms:>10.3f} {native_ms:>11.3f} {inplace_ms:>12.3f} {pkl_ms / native_ms:>7.1f}x {str(equal):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# backend/ModelPredictionModule/bulk_score.py
+#
+# 오프라인 일괄 예측 (야간 배치)
+# performance_tb / sales_tb 레코드를 스트리밍으로 읽어 고정 크기 청크로 나누고,
+# 프로세스 풀에서 5개 모델로 예측한 뒤 결과를 청크 단위로 바로 파일에 씁니다.
+# 입력 크기와 상관없이 메모리는 (청크 크기 x 동시 처리 청크 수)에만 비례합니다.
+#
+# 입력: JSON 배열(frontend/public/*.json 형식), JSON Lines, CSV, Parquet, 또는 "sql:<쿼리>"
+# 출력: .csv 또는 .parquet (Parquet 입출력은 pyarrow 필요)
+#
+#   cd backend
+#   python -m ModelPredictionModule.bulk_score \
+#       --performances ../frontend/public/performance_tb.json \
+#       --sales ../frontend/public/sales_tb.json \
+#       --output scores.parquet
+#   python -m ModelPredictionModule.bulk_score --performances "sql:SELECT * FROM dbo.performance_tb" --output plan.csv
+
+import os
+import sys
+import re
+import csv
+import json
+import time
+import argparse
+import logging
+import multiprocessing
+from collections import deque
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry, DEFAULT_PRELOAD_MODELS
+from ModelPredictionModule.xgb_native import get_matrix_model
+from ModelPredictionModule.forest_evaluator import get_flat_forest
+
+logger = logging.getLogger("bulk_score")
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("ML_BULK_CHUNK_SIZE", "10000"))
+DEFAULT_WORKERS = int(os.getenv("ML_BULK_WORKERS", str(os.cpu_count() or 1)))
+JSON_READ_BLOCK = 1 << 20
+_SEPARATORS = re.compile(r"[\s,]*")
+
+# 모델 -> 출력 컬럼 (타깃 순서)
+SCORE_COLUMNS = {
+    "xgb_reg_accumulated_sales_planning": ["pred_accumulated_sales_planning"],
+    "xgb_reg_accumulated_sales_selling": ["pred_accumulated_sales_selling"],
+    "xgb_reg_roi_bep_planning": ["pred_roi_planning", "pred_bep_planning"],
+    "xgb_reg_roi_bep_selling": ["pred_roi_selling", "pred_bep_selling"],
+    "rf_cls_ticket_risk": ["risk_label", "risk_proba"],
+}
+KEY_COLUMNS = ["performance_id", "date"]
+
+
+# -----------------
+# 입력 스트리밍
+# -----------------
+
+def _iter_json_array(path: str):
+    """
+    큰 JSON 배열 파일을 전체를 읽지 않고 원소 단위로 꺼냅니다.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = f.read(JSON_READ_BLOCK)
+        pos = _SEPARATORS.match(buffer).end()
+        if buffer[pos:pos + 1] != "[":
+            raise ValueError(f"JSON 배열 파일이 아닙니다: {path}")
+        pos += 1
+        while True:
+            pos = _SEPARATORS.match(buffer, pos).end()
+            if buffer[pos:pos + 1] == "]":
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+                yield record
+            except json.JSONDecodeError:
+                # 원소가 블록 경계에 걸친 경우: 남은 부분에 다음 블록을 이어 붙여 다시 시도
+                block = f.read(JSON_READ_BLOCK)
+                if not block:
+                    raise
+                buffer = buffer[pos:] + block
+                pos = 0
+
+
+def _iter_json_lines(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_frames(source: str, chunk_size: int):
+    """
+    입력 소스 -> DataFrame 청크 (최대 chunk_size 행)
+    """
+    if source.startswith("sql:"):
+        # 결과 전체를 DataFrame으로 만들지 않도록 커서에서 청크 단위로 가져옵니다.
+        from AzureServiceModule.AzureSQLClient import engine
+        conn = engine.raw_connection()
+        try:
+            yield from pd.read_sql(source[len("sql:"):], conn, chunksize=chunk_size)
+        finally:
+            conn.close()
+        return
+
+    ext = os.path.splitext(source)[1].lower()
+    if ext == ".csv":
+        yield from pd.read_csv(source, chunksize=chunk_size)
+    elif ext == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    elif ext in (".json", ".jsonl"):
+        records = _iter_json_lines(source) if ext == ".jsonl" else _iter_json_array(source)
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk)
+    else:
+        raise ValueError(f"지원하지 않는 입력 형식입니다: {source}")
+
+
+def load_catalog(source: str) -> dict:
+    """
+    공연 카탈로그(performance_tb) -> {performance_id: 레코드} (sales_tb 조인용)
+    """
+    catalog = {}
+    for frame in iter_frames(source, DEFAULT_CHUNK_SIZE):
+        for record in frame.to_dict("records"):
+            catalog[record["performance_id"]] = record
+    return catalog
+
+
+def prepare_rows(frame: pd.DataFrame, catalog: dict = None) -> list:
+    """
+    청크 -> 모델 입력 dict 리스트
+    - sales_tb 레코드는 공연 카탈로그의 속성(장르, 지역, 가격 등)과 합칩니다.
+    - duration이 없으면 공연 기간(start_date ~ end_date, 일수)으로 채웁니다.
+    """
+    rows = []
+    for record in frame.to_dict("records"):
+        if catalog is not None:
+            record = {**catalog.get(record.get("performance_id"), {}), **record}
+        if record.get("duration") is None:
+            try:
+                days = (date.fromisoformat(str(record["end_date"])[:10]) -
+                        date.fromisoformat(str(record["start_date"])[:10])).days + 1
+                record["duration"] = max(days, 1)
+            except (KeyError, TypeError, ValueError):
+                record["duration"] = 1
+        rows.append(record)
+    return rows
+
+
+# -----------------
+# 청크 예측 (워커 프로세스)
+# -----------------
+
+def init_worker(model_names):
+    get_registry().preload(model_names, warmup=False)
+
+
+def score_chunk(rows: list, model_names: list) -> dict:
+    """
+    청크 1개를 모든 모델로 예측해 컬럼별 배열을 반환합니다.
+    """
+    columns = {col: [row.get(col) for row in rows] for col in KEY_COLUMNS if any(col in row for row in rows)}
+    for model_name in model_names:
+        forest = get_flat_forest(model_name)
+        if forest is not None:
+            labels, proba = forest.predict_with_proba(forest.encoder.encode(rows))
+            label_col, proba_col = SCORE_COLUMNS[model_name]
+            columns[label_col] = labels
+            columns[proba_col] = proba.max(axis=1)
+            continue
+        encoder, predict = get_matrix_model(model_name)
+        preds = np.asarray(predict(encoder.encode(rows))).reshape(len(rows), -1)
+        for j, col in enumerate(SCORE_COLUMNS[model_name]):
+            columns[col] = preds[:, j]
+    return columns
+
+
+def applicable_models(rows: list, model_names: list) -> list:
+    """
+    입력 컬럼이 모두 있는 모델만 고릅니다. (예: performance_tb만 있으면 판매 단계 모델 제외)
+    """
+    result = []
+    for model_name in model_names:
+        forest = get_flat_forest(model_name)
+        encoder = forest.encoder if forest is not None else get_matrix_model(model_name)[0]
+        try:
+            encoder.check_columns(rows)
+            result.append(model_name)
+        except ValueError as e:
+            logger.warning(f"{model_name} 제외: {e}")
+    return result
+
+
+# -----------------
+# 출력
+# -----------------
+
+class ColumnarWriter:
+    """
+    청크 결과(컬럼별 배열)를 CSV 또는 Parquet 파일에 이어 씁니다.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = os.path.splitext(path)[1].lower() == ".parquet"
+        self._writer = None
+        self._file = None
+
+    def write(self, columns: dict):
+        frame = pd.DataFrame(columns)
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8", newline="")
+                frame.to_csv(self._file, index=False, quoting=csv.QUOTE_MINIMAL)
+            else:
+                frame.to_csv(self._file, index=False, header=False)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+# -----------------
+# 실행
+# -----------------
+
+def run(performances: str, output: str, sales: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: int = DEFAULT_WORKERS, model_names: list = None) -> dict:
+    """
+    sales가 있으면 sales_tb 레코드(공연 속성과 조인)를, 없으면 performance_tb 레코드를 예측합니다.
+    workers <= 1 이면 현재 프로세스에서 순서대로 실행합니다.
+    """
+    model_names = model_names or DEFAULT_PRELOAD_MODELS
+    catalog = load_catalog(performances) if sales else None
+    frames = iter_frames(sales or performances, chunk_size)
+
+    writer = ColumnarWriter(output)
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            initargs=(model_names,),
+        )
+    # 동시에 처리 중인 청크 수를 제한해 메모리를 일정하게 유지합니다.
+    max_in_flight = max(1, workers) * 2
+    in_flight = deque()
+    total_rows = 0
+    chunks = 0
+    start = time.perf_counter()
+
+    def drain(limit: int):
+        nonlocal total_rows, chunks
+        while len(in_flight) > limit:
+            n_rows, result = in_flight.popleft()
+            writer.write(result.result() if pool is not None else result)
+            total_rows += n_rows
+            chunks += 1
+            if chunks % 10 == 0:
+                elapsed = time.perf_counter() - start
+                print(f"  {total_rows:,} rows ({total_rows / elapsed:,.0f} rows/s)", file=sys.stderr, flush=True)
+
+    try:
+        for frame in frames:
+            rows = prepare_rows(frame, catalog)
+            if chunks == 0 and not in_flight:
+                model_names = applicable_models(rows, model_names)
+                if not model_names:
+                    raise ValueError("입력 컬럼으로 예측할 수 있는 모델이 없습니다.")
+                print(f"모델: {model_names}", file=sys.stderr, flush=True)
+            if pool is not None:
+                in_flight.append((len(rows), pool.submit(score_chunk, rows, model_names)))
+            else:
+                in_flight.append((len(rows), score_chunk(rows, model_names)))
+            drain(max_in_flight - 1)
+        drain(0)
+    finally:
+        writer.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "rows": total_rows,
+        "chunks": chunks,
+        "models": model_names,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(total_rows / elapsed, 1) if elapsed else None,
+        "output": output,
+    }
+    print(f"완료: {total_rows:,} rows, {elapsed:.2f} s, {summary['rows_per_sec']:,} rows/s -> {output}", file=sys.stderr, flush=True)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="performance_tb / sales_tb 일괄 예측")
+    parser.add_argument("--performances", required=True, help="performance_tb (json/jsonl/csv/parquet 또는 sql:<쿼리>)")
+    parser.add_argument("--sales", help="sales_tb (지정하면 판매 레코드 단위로 예측)")
+    parser.add_argument("--output", required=True, help="결과 파일 (.csv 또는 .parquet)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--models", help="쉼표로 구분한 모델 이름 (기본: 5개 서빙 모델)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    run(
+        args.performances, args.output, sales=args.sales, chunk_size=args.chunk_size,
+        workers=args.workers, model_names=args.models.split(",") if args.models else None,
+    )
+
+
+if __name__ == "__main__":
+    main()
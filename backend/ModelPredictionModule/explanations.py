@@ -0,0 +1,117 @@
+# backend/ModelPredictionModule/explanations.py
+#
+# 예측 설명 (특성별 기여도)
+# XGBoost booster의 pred_contribs로 배치 전체의 특성별 기여도를 한 번에 계산하고,
+# 원-핫 컬럼(genre_뮤지컬, genre_연극, ...)의 기여도는 원래 입력 컬럼(genre) 하나로 합칩니다.
+# 입력 컬럼별 기여도 합 + 기준값 = 예측값 입니다.
+#
+# 결과 배열의 마지막 축은 [입력 컬럼별 기여도..., 기준값] 입니다.
+#   타깃 1개: (n, 입력 컬럼 수 + 1), 타깃 여러 개: (n, 타깃 수, 입력 컬럼 수 + 1)
+
+import os
+import logging
+
+import numpy as np
+import xgboost as xgb
+
+from .model_registry import get_registry, register_loader
+from .xgb_native import NativeXGBModel
+
+logger = logging.getLogger("explanations")
+
+# approx: 트리 경로 기반 기여도 (예측의 1~3배 비용), exact: TreeSHAP (배치에서는 예측의 수백 배 비용)
+EXPLAIN_METHOD = os.getenv("ML_EXPLAIN_METHOD", "approx")
+
+
+def group_matrix(encoder) -> np.ndarray:
+    """
+    (모델 입력 컬럼 수, 요청 입력 컬럼 수) 0/1 행렬: 원-핫 컬럼 -> 원래 범주형 컬럼
+    """
+    groups = np.zeros((encoder.n_features, len(encoder.input_columns)), dtype=np.float64)
+    row = 0
+    for j, (_, mapping) in enumerate(encoder.categorical):
+        groups[row:row + len(mapping), j] = 1.0
+        row += len(mapping)
+    for k in range(len(encoder.numeric)):
+        groups[row + k, len(encoder.categorical) + k] = 1.0
+    return groups
+
+
+class ContributionModel:
+    """
+    NativeXGBModel + 원-핫 묶음 행렬
+    explain(X): 부스터별 pred_contribs 1회 호출 후 행렬곱 1회로 입력 컬럼 단위 기여도를 만듭니다.
+    """
+    def __init__(self, native: NativeXGBModel, method: str = EXPLAIN_METHOD):
+        self.native = native
+        self.encoder = native.encoder
+        self.method = method
+        self.columns = list(native.encoder.input_columns)
+        self.groups = group_matrix(native.encoder)
+
+    def _target_contributions(self, booster, X: np.ndarray) -> np.ndarray:
+        contribs = booster.predict(xgb.DMatrix(X, nthread=self.native.nthread), pred_contribs=True,
+                                   approx_contribs=self.method != "exact")
+        contribs = np.asarray(contribs, dtype=np.float64)
+        return np.concatenate([contribs[:, :-1] @ self.groups, contribs[:, -1:]], axis=1)
+
+    def explain(self, X: np.ndarray) -> np.ndarray:
+        contributions = [self._target_contributions(booster, X) for booster in self.native.boosters]
+        if len(contributions) == 1:
+            return contributions[0]
+        return np.stack(contributions, axis=1)
+
+    def predict_rows(self, input_data) -> np.ndarray:
+        return self.explain(self.encoder.encode(input_data))
+
+
+def _load_explainer(model_name: str, registry):
+    """
+    레지스트리 로더: XGBoost 모델이면 ContributionModel, 아니면 None
+    """
+    native = registry.get(model_name, kind="native")
+    if native is None:
+        return None, registry.model_path(model_name)
+    return ContributionModel(native), registry.model_path(model_name)
+
+
+register_loader("explain", _load_explainer)
+
+
+def get_explainer(model_name: str) -> ContributionModel:
+    explainer = get_registry().get(model_name, kind="explain")
+    if explainer is None:
+        raise ValueError(f"{model_name}: 특성 기여도는 XGBoost 모델만 지원합니다.")
+    return explainer
+
+
+def explain_rows(model_name: str, input_data) -> np.ndarray:
+    """
+    요청 payload -> [입력 컬럼별 기여도..., 기준값] 배열
+    """
+    return get_explainer(model_name).predict_rows(input_data)
+
+
+def explanation_payload(contributions: np.ndarray, columns: list, targets: list = None, top: int = 3) -> dict:
+    """
+    기여도 배열 -> 응답용 설명 (행별 기준값, 컬럼별 기여도, 절댓값 기준 상위 컬럼)
+    targets가 있으면 타깃(예: roi, bep)별로 나눠서 반환합니다.
+    """
+    def rows_payload(values: np.ndarray) -> dict:
+        order = np.argsort(-np.abs(values[:, :-1]), axis=1)[:, :top]
+        return {
+            "base_value": values[:, -1].tolist(),
+            "contributions": [dict(zip(columns, row)) for row in values[:, :-1].tolist()],
+            "top_features": [
+                [{"feature": columns[j], "contribution": float(row[j])} for j in idx]
+                for row, idx in zip(values, order)
+            ],
+        }
+
+    payload = {"method": EXPLAIN_METHOD, "features": columns}
+    if targets is None:
+        payload.update(rows_payload(contributions))
+        return payload
+    for k, target in enumerate(targets):
+        payload[target] = rows_payload(contributions[:, k])
+    return payload
@@ -0,0 +1,177 @@
+# backend/ModelPredictionModule/feature_encoder.py
+
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from AzureServiceModule.config.VariableConfig import categorical_keys, numeric_keys, date_keys
+
+logger = logging.getLogger("feature_encoder")
+
+# 날짜 컬럼(start_date) -> 모델 입력 컬럼(start_date_numeric)
+DATE_NUMERIC_SUFFIX = "_numeric"
+
+
+def day_of_year(dates) -> np.ndarray:
+    """
+    'YYYY-MM-DD' 문자열 배열을 1~366 사이의 일수로 한 번에 변환합니다.
+    (변환할 수 없는 값은 챗봇과 같이 1.0)
+    """
+    try:
+        days = np.asarray(dates, dtype="datetime64[D]")
+        doy = (days - days.astype("datetime64[Y]")).astype(np.float32) + 1
+        doy[np.isnat(days)] = 1.0
+        return doy
+    except (ValueError, TypeError):
+        result = np.ones(len(dates), dtype=np.float32)
+        for i, value in enumerate(dates):
+            try:
+                result[i] = datetime.strptime(str(value), "%Y-%m-%d").timetuple().tm_yday
+            except (ValueError, TypeError):
+                pass
+        return result
+
+
+class FeatureEncoder:
+    """
+    학습된 파이프라인의 전처리(ColumnTransformer: OneHotEncoder + passthrough)를
+    pandas 없이 NumPy로 재현하여, 요청 payload(dict 리스트)를 모델 입력 행렬로 바로 변환합니다.
+
+    - 범주형/수치형 구분은 VariableConfig(categorical_keys / numeric_keys / date_keys) 기준
+    - 컬럼 순서와 범주 순서는 학습된 파이프라인 기준
+    - 학습 시 희소 행렬을 썼던 파이프라인은 XGBoost가 0을 결측으로 보므로 동일하게 0 -> NaN 처리
+    """
+    def __init__(self, categorical: list, numeric: list, zero_as_missing: bool = False):
+        # categorical: [(컬럼명, 범주 리스트)], numeric: [컬럼명]
+        self._categories = [(col, list(cats)) for col, cats in categorical]
+        self.categorical = [(col, {value: i for i, value in enumerate(cats)}) for col, cats in categorical]
+        self.numeric = list(numeric)
+        self.zero_as_missing = zero_as_missing
+        self.input_columns = [col for col, _ in categorical] + self.numeric
+
+        self.output_columns = []
+        for col, cats in categorical:
+            self.output_columns += [f"{col}_{value}" for value in cats]
+        self.output_columns += self.numeric
+        self.n_features = len(self.output_columns)
+
+        self._offsets = np.cumsum([0] + [len(cats) for _, cats in categorical])
+        self._numeric_offset = int(self._offsets[-1])
+
+    @classmethod
+    def from_pipeline(cls, model) -> "FeatureEncoder":
+        """
+        sklearn Pipeline의 첫 단계(ColumnTransformer)에서 인코딩 규칙을 읽어옵니다.
+        """
+        preprocessing = model.steps[0][1]
+        categorical, numeric = [], []
+        for name, transformer, cols in preprocessing.transformers_:
+            if name == "remainder" or transformer == "drop":
+                continue
+            if hasattr(transformer, "categories_"):
+                for col, cats in zip(cols, transformer.categories_):
+                    categorical.append((col, list(cats)))
+                    if col in categorical_keys and col != "promo_event_flag" and list(cats) != categorical_keys[col]:
+                        logger.warning(f"{col} 범주가 VariableConfig와 다릅니다. 모델 기준으로 인코딩합니다.")
+            else:
+                numeric += list(cols)
+        return cls(categorical, numeric, zero_as_missing=bool(getattr(preprocessing, "sparse_output_", False)))
+
+    def to_dict(self) -> dict:
+        """
+        JSON으로 저장할 수 있는 인코딩 스키마 (numpy bool 등은 파이썬 기본형으로 변환)
+        """
+        return {
+            "categorical": [
+                {"column": col, "categories": [c.item() if hasattr(c, "item") else c for c in cats]}
+                for col, cats in self._categories
+            ],
+            "numeric": self.numeric,
+            "zero_as_missing": self.zero_as_missing,
+            "output_columns": self.output_columns,
+        }
+
+    @classmethod
+    def from_dict(cls, schema: dict) -> "FeatureEncoder":
+        categorical = [(item["column"], item["categories"]) for item in schema["categorical"]]
+        return cls(categorical, schema["numeric"], zero_as_missing=schema["zero_as_missing"])
+
+    def _numeric_column(self, rows: list, col: str) -> np.ndarray:
+        if col.endswith(DATE_NUMERIC_SUFFIX) and col[:-len(DATE_NUMERIC_SUFFIX)] in date_keys:
+            date_col = col[:-len(DATE_NUMERIC_SUFFIX)]
+            if all(col not in row for row in rows) and all(date_col in row for row in rows):
+                return day_of_year([row[date_col] for row in rows])
+        values = [row.get(col) for row in rows]
+        values = [np.nan if value is None else value for value in values]
+        try:
+            return np.asarray(values, dtype=np.float32)
+        except (ValueError, TypeError):
+            if col not in numeric_keys:
+                raise
+            # 숫자로 읽을 수 없는 값(예: "12abc")은 결측(NaN)으로 처리합니다. (모델 파이프라인의 결측 처리 적용)
+            return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float32)
+
+    def check_columns(self, rows: list):
+        present = set()
+        for row in rows:
+            present.update(row.keys())
+        missing = set()
+        for col in self.input_columns:
+            if col in present:
+                continue
+            date_col = col[:-len(DATE_NUMERIC_SUFFIX)] if col.endswith(DATE_NUMERIC_SUFFIX) else None
+            if date_col in date_keys and date_col in present:
+                continue
+            missing.add(col)
+        if missing:
+            raise ValueError(f"columns are missing: {missing}")
+
+    def encode(self, input_data) -> np.ndarray:
+        """
+        input_data: dict 1개 또는 dict 리스트
+        반환: (행 수, 모델 입력 컬럼 수) float32 C-contiguous 행렬
+        """
+        rows = [input_data] if isinstance(input_data, dict) else list(input_data)
+        self.check_columns(rows)
+        X = np.zeros((len(rows), self.n_features), dtype=np.float32)
+
+        row_index = np.arange(len(rows))
+        for (col, index_map), offset in zip(self.categorical, self._offsets[:-1]):
+            idx = np.fromiter(
+                (index_map.get(row.get(col), -1) if _hashable(row.get(col)) else -1 for row in rows),
+                dtype=np.int64, count=len(rows)
+            )
+            known = idx >= 0
+            # 학습 시 없던 범주는 OneHotEncoder(handle_unknown='ignore')처럼 모두 0
+            X[row_index[known], offset + idx[known]] = 1.0
+
+        for j, col in enumerate(self.numeric):
+            X[:, self._numeric_offset + j] = self._numeric_column(rows, col)
+
+        if self.zero_as_missing:
+            X[X == 0] = np.nan
+        return X
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
+
+
+_encoders = {}
+
+
+def get_encoder(model_name: str, model) -> FeatureEncoder:
+    """
+    모델별 인코더 (모델 객체가 바뀌면 다시 만듭니다)
+    """
+    cached = _encoders.get(model_name)
+    if cached is None or cached[0] is not model:
+        cached = (model, FeatureEncoder.from_pipeline(model))
+        _encoders[model_name] = cached
+    return cached[1]
@@ -0,0 +1,323 @@
+# backend/ModelPredictionModule/feature_store.py
+#
+# 판매 단계 특성 저장소 (performance_id, date) -> 특성 벡터
+# sales_tb / performance_tb를 한 번 읽어 (공연, 일자) 순으로 정렬한 열 단위 numpy 배열로 만들고,
+# 누적합 / 최근 N일 합계 같은 파생 특성을 미리 계산해 둡니다.
+# 판매 단계 예측 요청은 performance_id와 date만 보내면 나머지 입력(daily_sales, booking_rate, ...)을 여기서 채웁니다.
+#
+# - 공연 속성(장르, 지역, 가격 등)은 공연당 1행으로 따로 저장하고, 일자별 기록은 공연별 연속 구간으로 저장합니다.
+# - 일자 조회는 공연별 일자 오프셋 표(as-of 표)로 O(1)입니다. 기록이 없는 날은 그 이전 마지막 기록을 사용합니다.
+#
+#   cd backend
+#   python -m ModelPredictionModule.feature_store --output feature_store.npz
+#   python -m ModelPredictionModule.feature_store --performance-id 1001 --date 2025-06-03
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.bulk_score import iter_frames, load_catalog, DEFAULT_CHUNK_SIZE
+from ModelPredictionModule.feature_encoder import day_of_year
+
+logger = logging.getLogger("feature_store")
+
+_PUBLIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public"))
+# 저장된 특성 저장소(.npz, 있으면 우선) 또는 원본 테이블
+STORE_PATH = os.getenv("ML_FEATURE_STORE_PATH")
+STORE_PERFORMANCES = os.getenv("ML_FEATURE_STORE_PERFORMANCES", os.path.join(_PUBLIC_DIR, "performance_tb.json"))
+STORE_SALES = os.getenv("ML_FEATURE_STORE_SALES", os.path.join(_PUBLIC_DIR, "sales_tb.json"))
+# 최근 N일 합계 창 크기 (일)
+ROLLING_WINDOW = int(os.getenv("ML_FEATURE_STORE_WINDOW", "7"))
+
+# 공연 속성 (공연당 1행)
+CATEGORICAL_COLUMNS = ["genre", "region"]
+PERFORMANCE_COLUMNS = ["capacity", "star_power", "ticket_price", "marketing_budget", "sns_mention_count",
+                       "production_cost", "variable_cost_rate", "start_date_numeric", "duration"]
+# 일자별 기록 (sales_tb)
+DAILY_COLUMNS = ["daily_sales", "booking_rate", "price_avg", "ad_exposure", "sns_mention_daily",
+                 "promo_event_flag", "accumulated_sales"]
+# 같은 (공연, 일자) 기록이 여러 건이면 합치는 방식: 일별 유입량은 합계, 누적/비율/플래그는 최댓값, 가격은 평균
+DAILY_AGGREGATES = {
+    "daily_sales": "sum", "ad_exposure": "sum", "sns_mention_daily": "sum",
+    "booking_rate": "max", "accumulated_sales": "max", "promo_event_flag": "max",
+    "price_avg": "mean",
+}
+# 파생 특성: 원본 컬럼 -> (누적합 컬럼, 최근 N일 합계 컬럼)
+DERIVED_COLUMNS = {
+    "daily_sales": ("daily_sales_cum", "daily_sales_window"),
+    "ad_exposure": ("ad_exposure_cum", "ad_exposure_window"),
+    "sns_mention_daily": ("sns_mention_cum", "sns_mention_window"),
+}
+ROW_COLUMNS = DAILY_COLUMNS + [name for pair in DERIVED_COLUMNS.values() for name in pair] + [
+    "days_since_first", "days_to_end"]
+
+
+def _to_days(values) -> np.ndarray:
+    """
+    날짜 문자열/Timestamp 배열 -> 1970-01-01 기준 일수 (int64)
+    """
+    return pd.to_datetime(pd.Series(values).astype(str).str[:10]).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+
+def _duration(record: dict) -> float:
+    # bulk_score.prepare_rows와 같은 규칙: 공연 기간(start_date ~ end_date, 일수), 없으면 1
+    if record.get("duration") is not None:
+        return float(record["duration"])
+    try:
+        days = (date.fromisoformat(str(record["end_date"])[:10]) -
+                date.fromisoformat(str(record["start_date"])[:10])).days + 1
+        return float(max(days, 1))
+    except (KeyError, TypeError, ValueError):
+        return 1.0
+
+
+def _flag(values) -> np.ndarray:
+    values = pd.Series(values)
+    if not (pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values)):
+        values = values.map(lambda v: str(v).lower() in ("true", "1", "1.0"))
+    return values.astype(np.float64).to_numpy()
+
+
+class SellingFeatureStore:
+    """
+    (performance_id, date) -> 판매 단계 특성
+    - performance_ids / codes / performance: 공연별 id, 범주형 코드, 수치 속성 (G행)
+    - group / day / rows: 일자별 기록의 공연 번호, 일자(일수), 기록 + 파생 특성 (n행, 공연 -> 일자 순 정렬)
+    - first_day / asof_offset / asof: 공연별 첫 기록일, as-of 표 시작 위치, (첫 기록일 + k일) -> 해당 일 이전 마지막 기록 행
+    """
+    def __init__(self, performance_ids, vocab, codes, performance, end_day, group, day, rows,
+                 first_day, asof_offset, asof, window: int = ROLLING_WINDOW):
+        self.performance_ids = performance_ids
+        self.vocab = vocab
+        self.codes = codes
+        self.performance = performance
+        self.end_day = end_day
+        self.group = group
+        self.day = day
+        self.rows = rows
+        self.first_day = first_day
+        self.asof_offset = asof_offset
+        self.asof = asof
+        self.window = window
+        self._groups = {int(pid): g for g, pid in enumerate(performance_ids.tolist())}
+        self._asof_end = np.append(asof_offset[1:], len(asof)).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    @classmethod
+    def build(cls, performances: str = STORE_PERFORMANCES, sales: str = STORE_SALES,
+              window: int = ROLLING_WINDOW, chunk_size: int = DEFAULT_CHUNK_SIZE) -> "SellingFeatureStore":
+        catalog = load_catalog(performances)
+        columns = {"performance_id": [], "date": [], **{col: [] for col in DAILY_COLUMNS}}
+        for frame in iter_frames(sales, chunk_size):
+            frame = frame[frame["performance_id"].isin(catalog)]
+            columns["performance_id"].append(frame["performance_id"].to_numpy(np.int64))
+            columns["date"].append(_to_days(frame["date"]))
+            for col in DAILY_COLUMNS:
+                values = frame[col] if col in frame else pd.Series(np.nan, index=frame.index)
+                columns[col].append(_flag(values) if col == "promo_event_flag" else
+                                    pd.to_numeric(values, errors="coerce").to_numpy(np.float64))
+        columns = {col: np.concatenate(parts) if parts else np.zeros(0) for col, parts in columns.items()}
+
+        # (공연, 일자) 순 정렬 후 같은 키의 기록을 하나로 합칩니다.
+        pid, day = columns["performance_id"].astype(np.int64), columns["date"].astype(np.int64)
+        order = np.lexsort((day, pid))
+        pid, day = pid[order], day[order]
+        first = np.flatnonzero(np.r_[True, (pid[1:] != pid[:-1]) | (day[1:] != day[:-1])]) if len(day) else \
+            np.zeros(0, dtype=np.int64)
+        daily = {}
+        for col in DAILY_COLUMNS:
+            values = columns[col][order]
+            if not len(first):
+                daily[col] = values
+            elif DAILY_AGGREGATES[col] == "max":
+                daily[col] = np.fmax.reduceat(values, first)
+            else:
+                daily[col] = np.add.reduceat(np.nan_to_num(values), first)
+                if DAILY_AGGREGATES[col] == "mean":
+                    daily[col] = daily[col] / np.diff(np.r_[first, len(values)])
+        pid, day = pid[first], day[first]
+
+        performance_ids, starts, counts = np.unique(pid, return_index=True, return_counts=True)
+        group = np.repeat(np.arange(len(performance_ids)), counts)
+        first_day = day[starts]
+        last_day = day[starts + counts - 1]
+
+        # 공연 속성
+        records = [catalog[p] for p in performance_ids.tolist()]
+        vocab, codes = {}, np.zeros((len(records), len(CATEGORICAL_COLUMNS)), dtype=np.int32)
+        for j, col in enumerate(CATEGORICAL_COLUMNS):
+            labels = pd.Series([record.get(col) for record in records], dtype=object)
+            codes[:, j], uniques = pd.factorize(labels, use_na_sentinel=True)
+            vocab[col] = [str(value) for value in uniques]
+        performance = np.full((len(records), len(PERFORMANCE_COLUMNS)), np.nan, dtype=np.float64)
+        for j, col in enumerate(PERFORMANCE_COLUMNS):
+            if col == "start_date_numeric":
+                performance[:, j] = day_of_year([str(record.get("start_date"))[:10] for record in records])
+            elif col == "duration":
+                performance[:, j] = [_duration(record) for record in records]
+            else:
+                performance[:, j] = pd.to_numeric(pd.Series([record.get(col) for record in records]),
+                                                  errors="coerce").to_numpy(np.float64)
+        end_date = pd.to_datetime(pd.Series([str(record.get("end_date"))[:10] for record in records]), errors="coerce")
+        end_day = np.where(end_date.isna(), last_day, end_date.to_numpy().astype("datetime64[D]").astype(np.int64))
+
+        # 누적합 / 최근 window일 합계: 전체 누적합에서 공연 시작 위치 / 창 시작 위치의 누적합을 뺍니다.
+        span = int(last_day.max() - first_day.min()) + window + 1 if len(day) else 1
+        key = group * span + (day - (first_day.min() if len(day) else 0))
+        window_start = np.searchsorted(key, key - (window - 1), side="left")
+        rows = {**daily}
+        for col, (cum_col, window_col) in DERIVED_COLUMNS.items():
+            cumsum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(daily[col]))])
+            index = np.arange(len(day))
+            rows[cum_col] = cumsum[index + 1] - cumsum[starts[group]]
+            rows[window_col] = cumsum[index + 1] - cumsum[window_start]
+        rows["days_since_first"] = (day - first_day[group]).astype(np.float64)
+        rows["days_to_end"] = (end_day[group] - day).astype(np.float64)
+        rows = np.column_stack([rows[col] for col in ROW_COLUMNS]) if len(day) else \
+            np.zeros((0, len(ROW_COLUMNS)))
+
+        # as-of 표: 기록이 있는 날에 행 번호를 넣고 앞으로 채웁니다. (각 공연의 첫 칸은 항상 기록이 있음)
+        spans = (last_day - first_day + 1).astype(np.int64)
+        asof_offset = np.concatenate([[0], np.cumsum(spans)[:-1]]).astype(np.int64)
+        asof = np.full(int(spans.sum()), -1, dtype=np.int64)
+        asof[asof_offset[group] + (day - first_day[group])] = np.arange(len(day))
+        asof = np.maximum.accumulate(asof) if len(asof) else asof
+        return cls(performance_ids, vocab, codes, performance, end_day, group.astype(np.int32),
+                   day, rows, first_day, asof_offset, asof.astype(np.int32), window)
+
+    def save(self, path: str, **meta):
+        meta = {**meta, "vocab": self.vocab, "window": self.window}
+        np.savez(path, performance_ids=self.performance_ids, codes=self.codes, performance=self.performance,
+                 end_day=self.end_day, group=self.group, day=self.day, rows=self.rows, first_day=self.first_day,
+                 asof_offset=self.asof_offset, asof=self.asof, meta=json.dumps(meta, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path: str) -> "SellingFeatureStore":
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(data["performance_ids"], meta["vocab"], data["codes"], data["performance"],
+                       data["end_day"], data["group"], data["day"], data["rows"], data["first_day"],
+                       data["asof_offset"], data["asof"], meta["window"])
+
+    def lookup(self, performance_id: int, on_date: str = None) -> int:
+        """
+        (performance_id, date) -> 기록 행 번호
+        date가 없으면 마지막 기록, 기록이 없는 날이면 그 이전 마지막 기록을 사용합니다.
+        """
+        g = self._groups.get(int(performance_id))
+        if g is None:
+            raise KeyError(f"특성 저장소에 없는 공연입니다: {performance_id}")
+        start, end = int(self.asof_offset[g]), int(self._asof_end[g])
+        if on_date is None:
+            return int(self.asof[end - 1])
+        try:
+            on_day = int(np.datetime64(str(on_date)[:10], "D").astype(np.int64))
+        except ValueError:
+            raise ValueError(f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {on_date}")
+        offset = on_day - int(self.first_day[g])
+        if offset < 0:
+            raise KeyError(f"{performance_id}: {on_date} 이전의 판매 기록이 없습니다.")
+        return int(self.asof[min(start + offset, end - 1)])
+
+    def features(self, row: int) -> dict:
+        g = int(self.group[row])
+        result = {"performance_id": int(self.performance_ids[g]),
+                  "date": str(np.datetime64(int(self.day[row]), "D"))}
+        for j, col in enumerate(CATEGORICAL_COLUMNS):
+            code = int(self.codes[g, j])
+            result[col] = self.vocab[col][code] if code >= 0 else None
+        # 결측(NaN)은 None으로 돌려줍니다. (resolve_inputs에서 요청 값 / 파이프라인 결측 처리가 적용되도록)
+        for columns, values in ((PERFORMANCE_COLUMNS, self.performance[g]), (ROW_COLUMNS, self.rows[row])):
+            result.update((col, None if np.isnan(value) else value) for col, value in zip(columns, values.tolist()))
+        result["promo_event_flag"] = int(result["promo_event_flag"] or 0)
+        return result
+
+    def resolve(self, performance_id: int, on_date: str = None) -> dict:
+        """
+        (performance_id, date) -> 판매 단계 특성 dict (date는 실제로 사용한 기록일)
+        """
+        return self.features(self.lookup(performance_id, on_date))
+
+    def history(self, performance_id: int) -> list:
+        g = self._groups.get(int(performance_id))
+        if g is None:
+            raise KeyError(f"특성 저장소에 없는 공연입니다: {performance_id}")
+        rows = np.flatnonzero(self.group == g)
+        return [self.features(int(row)) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store() -> SellingFeatureStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                start = time.perf_counter()
+                if STORE_PATH and os.path.exists(STORE_PATH):
+                    store = SellingFeatureStore.load(STORE_PATH)
+                elif os.path.exists(STORE_SALES) or STORE_SALES.startswith("sql:"):
+                    store = SellingFeatureStore.build(STORE_PERFORMANCES, STORE_SALES)
+                else:
+                    raise FileNotFoundError("판매 단계 특성 저장소 원본 데이터가 없습니다.")
+                logger.info(f"특성 저장소 로드: {len(store):,} rows, {time.perf_counter() - start:.2f} s")
+                _store = store
+    return _store
+
+
+def resolve_inputs(inputs: list, keys: list) -> list:
+    """
+    요청 행 목록 -> 모델 입력 dict 목록
+    performance_id가 있는 행은 저장소 특성으로 keys를 채우고, 요청에 직접 준 값이 있으면 그 값을 우선합니다.
+    각 행은 (기본값 포함 전체 값, 직접 준 값) 쌍입니다.
+    """
+    rows = []
+    for values, explicit in inputs:
+        row = {key: values.get(key) for key in keys}
+        if values.get("performance_id") is not None:
+            features = get_feature_store().resolve(values["performance_id"], values.get("date"))
+            row.update({key: features[key] for key in keys if features.get(key) is not None})
+            row.update({key: explicit[key] for key in keys if key in explicit})
+        if row.get("genre") is None:
+            raise ValueError("genre 또는 performance_id가 필요합니다.")
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="판매 단계 특성 저장소 생성/조회")
+    parser.add_argument("--performances", default=STORE_PERFORMANCES, help="performance_tb")
+    parser.add_argument("--sales", default=STORE_SALES, help="sales_tb")
+    parser.add_argument("--window", type=int, default=ROLLING_WINDOW)
+    parser.add_argument("--output", help="저장 경로 (.npz, API의 ML_FEATURE_STORE_PATH로 사용)")
+    parser.add_argument("--performance-id", type=int, help="조회할 공연 (지정 시 특성 출력)")
+    parser.add_argument("--date", help="조회 일자 (YYYY-MM-DD, 없으면 마지막 기록)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    store = SellingFeatureStore.build(args.performances, args.sales, args.window)
+    logger.warning(f"특성 저장소: {len(store):,} rows, {len(store.performance_ids):,} performances, "
+                   f"{time.perf_counter() - start:.2f} s")
+    if args.output:
+        store.save(args.output, performances=args.performances, sales=args.sales)
+    if args.performance_id is not None:
+        print(json.dumps(store.resolve(args.performance_id, args.date), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
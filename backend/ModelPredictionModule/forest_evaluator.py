@@ -0,0 +1,261 @@
+# backend/ModelPredictionModule/forest_evaluator.py
+#
+# RandomForestClassifier를 연속된 NumPy 노드 배열로 펼쳐서
+# 배치 전체의 라벨과 클래스 확률을 한 번의 벡터 연산 순회로 계산합니다.
+#
+# 메모리 사용량 리포트:
+#   cd backend
+#   python -m ModelPredictionModule.forest_evaluator
+#   python -m ModelPredictionModule.forest_evaluator rf_cls_ticket_risk
+
+import sys
+import logging
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from .model_registry import get_registry, register_loader, read_shared, _estimate_size
+from .feature_encoder import FeatureEncoder
+
+logger = logging.getLogger("forest_evaluator")
+
+FOREST_MODELS = [
+    "rf_cls_ticket_risk",
+]
+
+# 한 번에 순회하는 행 수 (행 수 x 트리 수 크기의 노드 인덱스 배열을 만듭니다)
+CHUNK_ROWS = 4096
+
+_LEAF = -2  # sklearn 트리의 리프 노드 feature 값 (TREE_UNDEFINED)
+
+
+def pipeline_forest(model):
+    """
+    pkl 파이프라인의 마지막 단계가 RandomForestClassifier이면 반환, 아니면 None
+    """
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    if isinstance(estimator, RandomForestClassifier):
+        return estimator
+    return None
+
+
+class FlatForest:
+    """
+    펼쳐진 랜덤 포레스트 (단일 출력 분류기)
+
+    모든 트리의 노드를 하나의 배열로 이어 붙이고, 자식 인덱스는 전역 인덱스로 바꿔 둡니다.
+    - feature / threshold / left / right / missing_left: 노드별 분기 정보
+    - leaf_proba: 노드별 클래스 확률 (sklearn DecisionTreeClassifier.predict_proba와 동일)
+    - roots: 트리별 루트 노드의 전역 인덱스
+    """
+    def __init__(self, feature, threshold, left, right, missing_left, leaf_proba, roots, classes,
+                 max_depth: int, encoder: FeatureEncoder = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.leaf_proba = leaf_proba
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = max_depth
+        self.encoder = encoder
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def n_classes(self) -> int:
+        return len(self.classes_)
+
+    @classmethod
+    def from_estimator(cls, forest: RandomForestClassifier, encoder: FeatureEncoder = None) -> "FlatForest":
+        if forest.n_outputs_ != 1:
+            raise ValueError("다중 출력 랜덤 포레스트는 지원하지 않습니다.")
+        n_classes = int(forest.n_classes_)
+        features, thresholds, lefts, rights, missing_lefts, probas, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in forest.estimators_:
+            state = tree.tree_.__getstate__()
+            nodes = state["nodes"]
+            is_leaf = nodes["left_child"] < 0
+
+            features.append(np.where(is_leaf, _LEAF, nodes["feature"]).astype(np.int32))
+            thresholds.append(nodes["threshold"].astype(np.float64))
+            # 리프의 자식은 자기 자신을 가리키게 하여 순회 중 인덱스가 범위를 벗어나지 않게 합니다.
+            own = np.arange(len(nodes)) + offset
+            lefts.append(np.where(is_leaf, own, nodes["left_child"] + offset).astype(np.int32))
+            rights.append(np.where(is_leaf, own, nodes["right_child"] + offset).astype(np.int32))
+            missing_lefts.append(nodes["missing_go_to_left"].astype(bool))
+
+            # 트리의 노드 값은 이미 클래스 비율입니다. (DecisionTreeClassifier.predict_proba와 동일하게 그대로 사용)
+            probas.append(state["values"][:, 0, :n_classes].astype(np.float64))
+
+            roots.append(offset)
+            offset += len(nodes)
+            max_depth = max(max_depth, int(state["max_depth"]))
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            missing_left=np.ascontiguousarray(np.concatenate(missing_lefts)),
+            leaf_proba=np.ascontiguousarray(np.concatenate(probas)),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            encoder=encoder,
+        )
+
+    @classmethod
+    def from_pipeline(cls, model) -> "FlatForest":
+        forest = pipeline_forest(model)
+        if forest is None:
+            raise ValueError("RandomForestClassifier 모델이 아닙니다.")
+        encoder = FeatureEncoder.from_pipeline(model) if hasattr(model, "steps") else None
+        return cls.from_estimator(forest, encoder)
+
+    SHARED_ARRAYS = ["feature", "threshold", "left", "right", "missing_left", "leaf_proba", "roots"]
+
+    def to_shared(self) -> tuple:
+        """
+        공유 형식으로 저장할 (배열 dict, 파라미터 dict)
+        """
+        params = {
+            "classes": self.classes_.tolist(),
+            "max_depth": self.max_depth,
+            "encoder": self.encoder.to_dict() if self.encoder is not None else None,
+        }
+        return {name: getattr(self, name) for name in self.SHARED_ARRAYS}, params
+
+    @classmethod
+    def from_shared(cls, arrays: dict, params: dict) -> "FlatForest":
+        encoder = FeatureEncoder.from_dict(params["encoder"]) if params.get("encoder") else None
+        return cls(**{name: arrays[name] for name in cls.SHARED_ARRAYS}, classes=np.asarray(params["classes"]),
+                   max_depth=params["max_depth"], encoder=encoder)
+
+    def _apply_chunk(self, X: np.ndarray) -> np.ndarray:
+        n = X.shape[0]
+        n_trees = self.n_trees
+        # node[i * n_trees + t]: i번째 행이 t번째 트리에서 현재 위치한 노드
+        node = np.tile(self.roots, n)
+        active = np.flatnonzero(self.feature[node] != _LEAF)
+        while active.size:
+            current = node[active]
+            # sklearn과 같이 float32 입력을 float64 임계값과 비교합니다.
+            x = X[active // n_trees, self.feature[current]]
+            go_left = x <= self.threshold[current]
+            missing = np.isnan(x)
+            if missing.any():
+                go_left[missing] = self.missing_left[current[missing]]
+            node[active] = np.where(go_left, self.left[current], self.right[current])
+            active = active[self.feature[node[active]] != _LEAF]
+        return node.reshape(n, n_trees)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        행별/트리별 도달한 리프의 전역 노드 인덱스 (행 수, 트리 수)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.shape[0] <= CHUNK_ROWS:
+            return self._apply_chunk(X)
+        return np.vstack([self._apply_chunk(X[i:i + CHUNK_ROWS]) for i in range(0, X.shape[0], CHUNK_ROWS)])
+
+    def predict_proba_leaves(self, leaves: np.ndarray) -> np.ndarray:
+        # RandomForestClassifier.predict_proba와 같은 순서(트리 순서대로 누적 후 트리 수로 나눔)로 더합니다.
+        proba = np.zeros((leaves.shape[0], self.n_classes), dtype=np.float64)
+        for t in range(self.n_trees):
+            proba += self.leaf_proba[leaves[:, t]]
+        proba /= self.n_trees
+        return proba
+
+    def predict_with_proba(self, X: np.ndarray):
+        """
+        한 번의 순회로 (라벨, 클래스 확률)을 함께 계산합니다.
+        """
+        proba = self.predict_proba_leaves(self.apply(X))
+        return self.classes_.take(np.argmax(proba, axis=1), axis=0), proba
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_proba_leaves(self.apply(X))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_with_proba(X)[0]
+
+    def predict_rows(self, input_data) -> np.ndarray:
+        """
+        요청 payload(dict 리스트) -> 클래스 확률 (행 수, 클래스 수)
+        """
+        return self.predict_proba(self.encoder.encode(input_data))
+
+    def nbytes(self) -> dict:
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "missing_left": self.missing_left,
+            "leaf_proba": self.leaf_proba,
+            "roots": self.roots,
+        }
+        sizes = {name: int(array.nbytes) for name, array in arrays.items()}
+        sizes["total"] = sum(sizes.values())
+        return sizes
+
+
+def memory_report(forest: RandomForestClassifier, flat: FlatForest) -> dict:
+    """
+    sklearn 포레스트(직렬화 크기)와 펼친 배열의 메모리 사용량 비교
+    """
+    sizes = flat.nbytes()
+    sklearn_bytes = _estimate_size(forest)
+    return {
+        "n_trees": flat.n_trees,
+        "n_nodes": flat.n_nodes,
+        "n_classes": flat.n_classes,
+        "max_depth": flat.max_depth,
+        "sklearn_bytes": sklearn_bytes,
+        "flat_bytes": sizes["total"],
+        "ratio": round(sizes["total"] / sklearn_bytes, 4) if sklearn_bytes else None,
+        "arrays": sizes,
+    }
+
+
+def _load_forest(model_name: str, registry):
+    """
+    레지스트리 로더: pkl 파이프라인의 랜덤 포레스트를 펼칩니다. (랜덤 포레스트가 아니면 None)
+    공유 형식이 있으면 pkl을 로드하지 않고 메모리맵 배열을 사용합니다.
+    """
+    shared = read_shared(model_name, "forest")
+    if shared is not None:
+        arrays, manifest = shared
+        return FlatForest.from_shared(arrays, manifest["params"]), manifest["path"], manifest["source_version"]
+    model = registry.get(model_name)
+    if pipeline_forest(model) is None:
+        return None, registry.model_path(model_name)
+    return FlatForest.from_pipeline(model), registry.model_path(model_name)
+
+
+register_loader("forest", _load_forest)
+
+
+def get_flat_forest(model_name: str):
+    """
+    서빙용 펼친 포레스트 (랜덤 포레스트 모델이 아니면 None)
+    """
+    return get_registry().get(model_name, kind="forest")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for name in sys.argv[1:] or FOREST_MODELS:
+        pipeline = get_registry().get(name)
+        report = memory_report(pipeline_forest(pipeline), FlatForest.from_pipeline(pipeline))
+        print(name, report)
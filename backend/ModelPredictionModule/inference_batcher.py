@@ -0,0 +1,202 @@
+# backend/ModelPredictionModule/inference_batcher.py
+
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger("inference_batcher")
+
+# 배치 크기(행 수)가 이 값에 도달하거나, 첫 요청 후 대기 시간이 지나면 예측을 실행합니다.
+DEFAULT_MAX_BATCH_SIZE = int(os.getenv("ML_BATCH_MAX_SIZE", "256"))
+DEFAULT_MAX_WAIT_MS = float(os.getenv("ML_BATCH_MAX_WAIT_MS", "5"))
+
+
+def _columns_of(rows) -> tuple:
+    """
+    요청의 입력 컬럼 구성 (컬럼 구성이 같은 요청끼리만 한 배치로 묶습니다)
+    """
+    keys = set()
+    for row in rows:
+        keys.update(row.keys())
+    return tuple(sorted(keys))
+
+
+class _PendingRequest:
+    def __init__(self, rows):
+        self.rows = rows
+        self.future = Future()
+        self.future.model_version = None
+        self.enqueued_at = time.perf_counter()
+
+
+class _ModelQueue:
+    """
+    모델 1개에 대한 대기열과 배치 실행 스레드
+    """
+    def __init__(self, batcher, model_name):
+        self.batcher = batcher
+        self.model_name = model_name
+        self.pending = []
+        self.pending_rows = 0
+        self.cond = threading.Condition()
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self.thread = threading.Thread(
+            target=self._run, name=f"batcher-{model_name}", daemon=True
+        )
+        self.thread.start()
+
+    def put(self, request: _PendingRequest):
+        with self.cond:
+            self.pending.append(request)
+            self.pending_rows += len(request.rows)
+            self.cond.notify()
+
+    def _take_batch(self) -> list:
+        max_size = self.batcher.max_batch_size
+        max_wait = self.batcher.max_wait_ms / 1000
+        with self.cond:
+            while not self.pending:
+                self.cond.wait()
+            deadline = self.pending[0].enqueued_at + max_wait
+            while self.pending_rows < max_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self.cond.wait(remaining)
+
+            # 최대 배치 크기만큼 꺼냅니다. (요청 1개가 이미 더 크면 그 요청만 단독 실행)
+            batch, size = [], 0
+            while self.pending and (not batch or size + len(self.pending[0].rows) <= max_size):
+                request = self.pending.pop(0)
+                batch.append(request)
+                size += len(request.rows)
+            self.pending_rows -= size
+            return batch
+
+    def _run(self):
+        # 배치 처리 중 예외가 나도 해당 요청만 실패시키고 스레드는 계속 실행합니다.
+        while True:
+            batch = self._take_batch()
+            try:
+                groups = {}
+                for request in batch:
+                    try:
+                        columns = _columns_of(request.rows)
+                    except Exception as e:
+                        self._fail([request], e)
+                        continue
+                    groups.setdefault(columns, []).append(request)
+                for requests in groups.values():
+                    self._execute(requests)
+            except Exception as e:
+                logger.error(f"배치 처리 실패: {self.model_name} - {e}")
+                self._abort(batch, e)
+
+    @staticmethod
+    def _abort(requests: list, error: BaseException):
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _execute(self, requests: list):
+        rows = [row for request in requests for row in request.rows]
+        try:
+            result = self.batcher.predict_fn(self.model_name, rows)
+        except Exception as e:
+            self._fail(requests, e)
+            return
+
+        # predict_fn이 Future를 반환하면 (예: 실행기에 위임) 완료 시점에 결과를 나눠 줍니다.
+        if isinstance(result, Future):
+            result.add_done_callback(lambda f: self._on_done(requests, rows, f))
+        else:
+            self._complete(requests, rows, result)
+
+    def _on_done(self, requests: list, rows: list, future: Future):
+        try:
+            error = future.exception()
+            if error is not None:
+                self._fail(requests, error)
+            else:
+                self._complete(requests, rows, future.result(), getattr(future, "model_version", None))
+        except Exception as e:
+            # 콜백 예외는 Future가 삼키므로 남은 요청을 직접 실패시킵니다.
+            logger.error(f"배치 결과 처리 실패: {self.model_name} - {e}")
+            self._abort(requests, e)
+
+    def _fail(self, requests: list, error: BaseException):
+        if len(requests) == 1:
+            # 호출 측에서 제한 시간 초과로 취소한 요청은 건너뜁니다.
+            if not requests[0].future.done():
+                requests[0].future.set_exception(error)
+            return
+        # 배치 실패 시 요청별로 다시 실행하여 잘못된 요청만 실패하도록 합니다.
+        logger.warning(f"배치 예측 실패, 요청별 재실행: {self.model_name} - {error}")
+        for request in requests:
+            self._execute([request])
+
+    def _complete(self, requests: list, rows: list, preds, model_version: str = None):
+        with self.cond:
+            self.batches += 1
+            self.requests += len(requests)
+            self.rows += len(rows)
+        offsets = np.cumsum([0] + [len(request.rows) for request in requests])
+        for request, start, end in zip(requests, offsets[:-1], offsets[1:]):
+            if not request.future.done():
+                # 실행기가 알려 준 모델 버전을 요청별 Future에도 남깁니다.
+                request.future.model_version = model_version
+                request.future.set_result(preds[start:end])
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "batches": self.batches,
+            "requests": self.requests,
+            "rows": self.rows,
+            "avg_batch_rows": round(self.rows / self.batches, 2) if self.batches else 0,
+            "pending_requests": len(self.pending),
+        }
+
+
+class InferenceBatcher:
+    """
+    동시에 들어온 예측 요청을 모델별로 모아 한 번의 predict 호출로 실행합니다.
+    predict_fn(model_name, rows) -> 행 순서대로의 예측 배열 (또는 그 배열을 돌려줄 Future)
+    각 요청은 Future로 자신의 행에 해당하는 예측만 돌려받습니다.
+    """
+    def __init__(self, predict_fn, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queues = {}
+        self._lock = threading.Lock()
+
+    def _queue(self, model_name: str) -> _ModelQueue:
+        with self._lock:
+            queue = self._queues.get(model_name)
+            if queue is None:
+                queue = _ModelQueue(self, model_name)
+                self._queues[model_name] = queue
+            return queue
+
+    def submit(self, model_name: str, rows: list) -> Future:
+        request = _PendingRequest(rows)
+        self._queue(model_name).put(request)
+        return request.future
+
+    def predict(self, model_name: str, rows: list):
+        """
+        submit 후 결과를 기다리는 동기 버전
+        """
+        return self.submit(model_name, rows).result()
+
+    def stats(self) -> list:
+        with self._lock:
+            queues = list(self._queues.values())
+        return [queue.stats() for queue in queues]
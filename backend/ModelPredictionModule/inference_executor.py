@@ -0,0 +1,212 @@
+# backend/ModelPredictionModule/inference_executor.py
+
+import os
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from .model_registry import get_registry
+
+logger = logging.getLogger("inference_executor")
+
+# 실행기 종류: "process" (코어별 워커 프로세스) 또는 "thread" (전용 스레드 풀)
+DEFAULT_EXECUTOR_KIND = os.getenv("ML_EXECUTOR", "process")
+DEFAULT_WORKERS = int(os.getenv("ML_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 예측 1건당 기본 제한 시간 (초)
+DEFAULT_TIMEOUT = float(os.getenv("ML_PREDICT_TIMEOUT", "10"))
+# 모델 교체 시 새 워커 풀이 모델을 로드/워밍업하는 제한 시간 (초)
+RELOAD_TIMEOUT = float(os.getenv("ML_EXECUTOR_RELOAD_TIMEOUT", "120"))
+
+
+def _init_worker(model_names):
+    """
+    워커 프로세스 시작 시 모델을 미리 로드하고 워밍업합니다.
+    """
+    get_registry().preload(model_names)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _worker_versions(model_names):
+    registry = get_registry()
+    # 공유 형식으로 올라간 모델은 pkl을 로드하지 않고 그 버전을 확인합니다.
+    return os.getpid(), {name: registry.version(name) or registry.get_entry(name, registry.serving_kind(name)).version
+                         for name in model_names}
+
+
+def _run_task(task_fn, model_name, rows):
+    """
+    task_fn을 실행하고 (결과, 실행한 프로세스에서 서빙 중인 모델 버전)을 반환합니다.
+    """
+    result = task_fn(model_name, rows)
+    return result, get_registry().version(model_name)
+
+
+class InferenceExecutor:
+    """
+    CPU를 많이 쓰는 모델 예측을 이벤트 루프/공용 스레드 풀 밖에서 실행합니다.
+    task_fn(model_name, rows) 은 모듈 최상위 함수여야 합니다. (프로세스 풀로 전달)
+    """
+    def __init__(self, task_fn, kind: str = DEFAULT_EXECUTOR_KIND, workers: int = DEFAULT_WORKERS,
+                 timeout: float = DEFAULT_TIMEOUT, preload_models=None):
+        self.task_fn = task_fn
+        self.kind = kind
+        self.workers = workers
+        self.timeout = timeout
+        self.preload_models = preload_models
+        self._pool = None
+        self._lock = threading.Lock()
+
+        # 지표 (큐 깊이, 처리 건수, 지연 시간)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+        self.total_latency_ms = 0.0
+        self.reloads = 0
+
+    def _new_pool(self):
+        if self.kind == "process":
+            # fork 대신 spawn: 배칭 스레드/OpenMP 스레드가 있는 상태에서 fork 하지 않도록
+            return ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.preload_models,),
+            )
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = self._new_pool()
+        return self._pool
+
+    def start(self):
+        """
+        서버 기동 시 호출: 워커를 미리 띄우고 모델을 로드해 둡니다.
+        """
+        pool = self._get_pool()
+        if self.kind == "process":
+            pids = {f.result() for f in [pool.submit(_ping) for _ in range(self.workers)]}
+            logger.info(f"추론 워커 프로세스 {len(pids)}개 준비 완료")
+        else:
+            get_registry().preload(self.preload_models)
+
+    def reload_workers(self, expected_versions: dict):
+        """
+        모델 교체 시 호출 (프로세스 실행기): 새 워커 풀을 띄워 모델을 로드/워밍업하고,
+        모든 워커의 모델 버전이 expected_versions와 같을 때만 풀을 교체합니다.
+        기존 풀에 이미 들어간 작업은 기존 워커(이전 버전 모델)에서 끝까지 실행됩니다.
+        스레드 실행기는 레지스트리를 같이 쓰므로 할 일이 없습니다.
+        """
+        if self.kind != "process" or self._pool is None:
+            return
+        pool = self._new_pool()
+        try:
+            futures = [pool.submit(_worker_versions, list(expected_versions)) for _ in range(self.workers)]
+            for pid, versions in (f.result(timeout=RELOAD_TIMEOUT) for f in futures):
+                if versions != expected_versions:
+                    raise RuntimeError(f"워커 {pid}의 모델 버전이 다릅니다: {versions} != {expected_versions}")
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        with self._lock:
+            old, self._pool = self._pool, pool
+            self.reloads += 1
+        old.shutdown(wait=False)
+        logger.info(f"추론 워커 풀 교체 완료: {expected_versions}")
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self.submitted - self.completed - self.failed
+
+    def submit(self, model_name: str, rows: list) -> Future:
+        """
+        반환하는 Future의 결과는 task_fn의 결과이고, model_version 속성에 예측한 모델 버전이 들어갑니다.
+        """
+        started = time.perf_counter()
+        task = self._get_pool().submit(_run_task, self.task_fn, model_name, rows)
+        with self._lock:
+            self.submitted += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        task.add_done_callback(lambda f: self._record(f, started))
+
+        future = Future()
+        future.model_version = None
+
+        def on_done(f: Future):
+            if f.cancelled():
+                future.cancel()
+            elif f.exception() is not None:
+                if not future.done():
+                    future.set_exception(f.exception())
+            elif not future.done():
+                result, future.model_version = f.result()
+                future.set_result(result)
+
+        task.add_done_callback(on_done)
+        # 호출 측이 (제한 시간 초과 등으로) 취소하면 아직 시작하지 않은 작업도 취소합니다.
+        future.add_done_callback(lambda f: task.cancel() if f.cancelled() else None)
+        return future
+
+    def _record(self, future: Future, started: float):
+        with self._lock:
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.total_latency_ms += (time.perf_counter() - started) * 1000
+
+    def predict(self, model_name: str, rows: list, timeout: float = None):
+        """
+        동기 호출용: 결과를 기다립니다. (제한 시간 초과 시 TimeoutError)
+        """
+        return self.wait(self.submit(model_name, rows), timeout)
+
+    def wait(self, future: Future, timeout: float = None):
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    async def wait_async(self, future: Future, timeout: float = None):
+        """
+        비동기 호출용: 이벤트 루프를 막지 않고 결과를 기다립니다.
+        """
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "reloads": self.reloads,
+                "avg_latency_ms": round(self.total_latency_ms / self.completed, 3) if self.completed else 0,
+            }
@@ -0,0 +1,486 @@
+# backend/ModelPredictionModule/model_registry.py
+
+import io
+import os
+import json
+import time
+import pickle
+import hashlib
+import importlib
+import logging
+import threading
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("model_registry")
+
+FILE_DIR = os.path.dirname(__file__)
+MODEL_DIR = os.path.join(FILE_DIR, "models")
+# 공유 형식: 모델의 큰 수치 배열(트리 노드, 중심점)을 .npy로 저장해 두고 모든 프로세스가 읽기 전용 메모리맵으로 엽니다.
+# (같은 파일의 페이지 캐시를 공유하므로 워커 수가 늘어도 모델 메모리는 거의 늘지 않습니다)
+SHARED_DIR = os.path.join(MODEL_DIR, "shared")
+# 공유 형식 사용 여부 (ML_SHARED_MODELS=0 이면 항상 pkl에서 로드)
+SHARED_ENABLED = os.getenv("ML_SHARED_MODELS", "1") != "0"
+
+# 서버 기동 시 미리 올려 두는 모델 (예측 API에서 사용하는 모델)
+DEFAULT_PRELOAD_MODELS = [
+    "xgb_reg_accumulated_sales_planning",
+    "xgb_reg_accumulated_sales_selling",
+    "xgb_reg_roi_bep_planning",
+    "xgb_reg_roi_bep_selling",
+    "rf_cls_ticket_risk",
+]
+
+# 메모리 예산 (MB) - 초과 시 가장 오래 사용되지 않은 모델부터 내립니다.
+DEFAULT_MEMORY_BUDGET_MB = float(os.getenv("ML_MODEL_MEMORY_BUDGET_MB", "512"))
+
+
+class ModelEntry:
+    """
+    레지스트리에 올라간 모델 1개에 대한 정보
+    """
+    def __init__(self, name, model, path, load_time_ms, size_bytes, version=None):
+        self.name = name
+        self.model = model
+        self.path = path
+        self.version = version
+        self.load_time_ms = load_time_ms
+        self.size_bytes = size_bytes
+        self.warmup_ms = None
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.hits = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "path": self.path,
+            "version": self.version,
+            "load_time_ms": round(self.load_time_ms, 3),
+            "warmup_ms": None if self.warmup_ms is None else round(self.warmup_ms, 3),
+            "size_bytes": self.size_bytes,
+            "loaded_at": self.loaded_at,
+            "last_used": self.last_used,
+            "hits": self.hits,
+        }
+
+
+def _estimate_size(model) -> int:
+    """
+    모델이 메모리에서 차지하는 크기를 직렬화 크기로 근사합니다.
+    """
+    try:
+        return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+def artifact_version(path: str) -> str:
+    """
+    모델 파일 내용의 해시 앞 12자리 (파일이 같으면 프로세스/서버가 달라도 같은 버전)
+    """
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def _warmup_frame(model) -> pd.DataFrame:
+    """
+    파이프라인 입력 컬럼 기준 더미 1행을 만듭니다.
+    범주형 컬럼은 학습된 OneHotEncoder의 첫 번째 범주, 나머지는 0으로 채웁니다.
+    """
+    columns = list(getattr(model, "feature_names_in_", []))
+    row = {col: 0.0 for col in columns}
+    preprocessing = model.steps[0][1] if hasattr(model, "steps") else None
+    for _, transformer, cols in getattr(preprocessing, "transformers_", []):
+        for col, categories in zip(cols, getattr(transformer, "categories_", [])):
+            row[col] = categories[0]
+    return pd.DataFrame([row], columns=columns)
+
+
+# -----------------
+# 공유 형식 (models/shared/<모델 이름>/manifest.json + 배열별 .npy)
+# -----------------
+
+def write_shared(model_name: str, kind: str, arrays: dict, params: dict, source: str,
+                 shared_dir: str = SHARED_DIR) -> str:
+    """
+    배열을 .npy로 저장하고 manifest.json을 마지막에 원자적으로 교체합니다.
+    배열 파일 이름에 원본 pkl 버전을 붙여, 이전 버전 파일을 메모리맵으로 연 프로세스에 영향이 없게 합니다.
+    """
+    version = artifact_version(source)
+    directory = os.path.join(shared_dir, model_name)
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    for name, array in arrays.items():
+        files[name] = f"{name}.{version}.npy"
+        np.save(os.path.join(directory, files[name]), np.ascontiguousarray(array))
+    manifest = {
+        "model_name": model_name,
+        "kind": kind,
+        "source": os.path.basename(source),
+        "source_version": version,
+        "arrays": files,
+        "params": params,
+    }
+    manifest_path = os.path.join(directory, "manifest.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    # 이미 열린 메모리맵은 파일을 지워도 유지됩니다.
+    for filename in os.listdir(directory):
+        if filename.endswith(".npy") and filename not in files.values():
+            os.remove(os.path.join(directory, filename))
+    return manifest_path
+
+
+def shared_manifest(model_name: str, shared_dir: str = SHARED_DIR) -> dict:
+    """
+    공유 형식의 manifest (없거나, pkl이 다시 배포되어 버전이 다르면 None)
+    """
+    path = os.path.join(shared_dir, model_name, "manifest.json")
+    if not SHARED_ENABLED or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    source_version = artifact_version(os.path.join(MODEL_DIR, f"{model_name}.pkl"))
+    if source_version not in (None, manifest["source_version"]):
+        logger.warning(f"{model_name}: 공유 형식 파일이 pkl과 버전이 달라 pkl을 사용합니다.")
+        return None
+    manifest["path"] = path
+    return manifest
+
+
+def read_shared(model_name: str, kind: str, shared_dir: str = SHARED_DIR):
+    """
+    공유 형식 배열을 읽기 전용 메모리맵으로 엽니다.
+    반환: (배열 dict, manifest) 또는 (형식이 다르거나 없으면) None
+    """
+    manifest = shared_manifest(model_name, shared_dir)
+    if manifest is None or manifest["kind"] != kind:
+        return None
+    directory = os.path.dirname(manifest["path"])
+    arrays = {name: np.load(os.path.join(directory, filename), mmap_mode="r")
+              for name, filename in manifest["arrays"].items()}
+    return arrays, manifest
+
+
+def _warmup_rows(encoder) -> list:
+    """
+    FeatureEncoder 기준 더미 1행 (범주형은 첫 번째 범주, 수치형은 0)
+    """
+    row = {col: next(iter(mapping), None) for col, mapping in encoder.categorical}
+    row.update({col: 0.0 for col in encoder.numeric})
+    return [row]
+
+
+# 모델 형식별 로더: kind -> fn(model_name, registry) -> (모델 객체, 경로[, 버전])
+# 기본 형식 "pkl" 외의 형식(예: XGBoost 네이티브)은 해당 모듈에서 register_loader로 등록합니다.
+# 버전을 돌려주지 않는 로더는 원본 pkl의 버전을 따릅니다. (공유 형식 로더는 pkl을 로드하지 않고 manifest의 버전 사용)
+_LOADERS = {}
+# 공유 형식 로더를 등록하는 모듈 (워커 프로세스처럼 아직 import되지 않았을 수 있음)
+_SHARED_LOADER_MODULES = {
+    "trees": "xgb_native",
+    "forest": "forest_evaluator",
+    "centroids": "audience_segmentation",
+}
+
+
+def register_loader(kind: str, loader):
+    _LOADERS[kind] = loader
+
+
+class ReloadCandidate:
+    """
+    다시 로드 중인 모델의 새 항목들 (commit 전까지 서빙 경로에 보이지 않습니다)
+    로더에는 레지스트리 대신 이 객체가 전달되어, 파생 형식(native, forest 등)도 새 pkl 기준으로 만들어집니다.
+    """
+    def __init__(self, registry, model_name: str):
+        self.registry = registry
+        self.model_name = model_name
+        self.entries = OrderedDict()
+
+    def model_path(self, model_name: str) -> str:
+        return self.registry.model_path(model_name)
+
+    def get_entry(self, model_name: str, kind: str = "pkl") -> ModelEntry:
+        if model_name != self.model_name:
+            return self.registry.get_entry(model_name, kind)
+        key = self.registry._key(model_name, kind)
+        if key not in self.entries:
+            self.entries[key] = self.registry._load(model_name, kind, self)
+        return self.entries[key]
+
+    def get(self, model_name: str, kind: str = "pkl"):
+        return self.get_entry(model_name, kind).model
+
+    def version(self, model_name: str = None) -> str:
+        if model_name not in (None, self.model_name):
+            return self.registry.version(model_name)
+        return self.get_entry(self.model_name).version
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 모델 레지스트리
+    - 각 pkl 파일은 최초 1회만 joblib.load 합니다.
+    - 여러 요청 스레드에서 동시에 호출해도 안전합니다.
+    - 메모리 예산을 넘으면 LRU 순서로 모델을 내립니다.
+    """
+    def __init__(self, model_dir: str = MODEL_DIR, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB):
+        self.model_dir = model_dir
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._listeners = []
+        self._serving_kinds = {}
+
+    def model_path(self, model_name: str) -> str:
+        return os.path.join(self.model_dir, f"{model_name}.pkl")
+
+    @staticmethod
+    def _key(model_name: str, kind: str) -> str:
+        return model_name if kind == "pkl" else f"{model_name}@{kind}"
+
+    def _load_lock(self, model_name: str) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(model_name, threading.Lock())
+
+    def get_entry(self, model_name: str, kind: str = "pkl") -> ModelEntry:
+        key = self._key(model_name, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                entry.last_used = time.time()
+                entry.hits += 1
+                return entry
+
+        # 같은 모델을 여러 스레드가 동시에 로드하지 않도록 모델별 락을 사용합니다.
+        with self._load_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is None:
+                entry = self._load(model_name, kind)
+                with self._lock:
+                    self._entries[key] = entry
+                    self._evict(keep=key)
+            with self._lock:
+                entry.last_used = time.time()
+                entry.hits += 1
+            return entry
+
+    def get(self, model_name: str, kind: str = "pkl"):
+        """
+        model_name: 예) 'xgb_reg_accumulated_sales_planning' (확장자 제외)
+        kind: 모델 형식 ("pkl" 또는 register_loader로 등록된 형식)
+        메모리에 올라간 모델 객체를 반환합니다. (없으면 로드)
+        """
+        return self.get_entry(model_name, kind).model
+
+    def _load(self, model_name: str, kind: str = "pkl", source=None) -> ModelEntry:
+        # source: 로더에 넘길 레지스트리 (다시 로드 중이면 ReloadCandidate)
+        source = source or self
+        start = time.perf_counter()
+        if kind == "pkl":
+            path = self.model_path(model_name)
+            # 읽는 도중 파일이 교체되어도 버전과 내용이 어긋나지 않도록 한 번 읽은 바이트로 계산/로드합니다.
+            with open(path, "rb") as f:
+                data = f.read()
+            version = hashlib.sha256(data).hexdigest()[:12]
+            model = joblib.load(io.BytesIO(data))
+        else:
+            if kind not in _LOADERS and kind in _SHARED_LOADER_MODULES:
+                importlib.import_module(f"{__package__}.{_SHARED_LOADER_MODULES[kind]}")
+            model, path, *loaded_version = _LOADERS[kind](model_name, source)
+            # 파생 형식의 버전은 원본 pkl의 버전을 따릅니다.
+            version = loaded_version[0] if loaded_version else source.get_entry(model_name).version
+        load_time_ms = (time.perf_counter() - start) * 1000
+        entry = ModelEntry(self._key(model_name, kind), model, path, load_time_ms, _estimate_size(model), version)
+        logger.info(f"모델 로드: {entry.name} v{version} ({load_time_ms:.1f} ms, {entry.size_bytes / 1024:.0f} KB)")
+        return entry
+
+    def _evict(self, keep: str):
+        # self._lock을 잡은 상태에서 호출해야 합니다.
+        total = sum(e.size_bytes for e in self._entries.values())
+        for name in list(self._entries.keys()):
+            if total <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            evicted = self._entries.pop(name)
+            total -= evicted.size_bytes
+            logger.info(f"모델 메모리 해제 (LRU): {name}")
+
+    def warmup(self, model_name: str, kind: str = "pkl") -> float:
+        """
+        더미 입력으로 1회 예측하여 첫 요청의 지연을 없앱니다. (소요 시간 ms 반환)
+        """
+        entry = self.get_entry(model_name, kind)
+        start = time.perf_counter()
+        if kind == "pkl":
+            entry.model.predict(_warmup_frame(entry.model))
+        elif getattr(entry.model, "encoder", None) is not None:
+            entry.model.predict_rows(_warmup_rows(entry.model.encoder))
+        entry.warmup_ms = (time.perf_counter() - start) * 1000
+        return entry.warmup_ms
+
+    def serving_kind(self, model_name: str) -> str:
+        """
+        공유 형식으로 내보낸 모델이면 그 형식(trees, forest, centroids), 아니면 "pkl"
+        (pkl 해시 비교는 모델마다 한 번만 하고, 교체되면 다시 확인합니다)
+        """
+        with self._lock:
+            kind = self._serving_kinds.get(model_name)
+        if kind is None:
+            manifest = shared_manifest(model_name)
+            kind = manifest["kind"] if manifest is not None else "pkl"
+            with self._lock:
+                self._serving_kinds[model_name] = kind
+        return kind
+
+    def preload(self, model_names=None, warmup: bool = True) -> list:
+        """
+        서버 기동 시 모델을 미리 로드(및 워밍업)합니다.
+        """
+        if model_names is None:
+            env_models = os.getenv("ML_PRELOAD_MODELS")
+            model_names = env_models.split(",") if env_models else DEFAULT_PRELOAD_MODELS
+        for name in model_names:
+            name = name.strip()
+            if not name:
+                continue
+            try:
+                # 공유 형식이 있으면 pkl은 로드하지 않고 메모리맵 배열만 엽니다.
+                kind = self.serving_kind(name)
+                self.get_entry(name, kind)
+                if warmup:
+                    self.warmup(name, kind)
+            except Exception as e:
+                logger.error(f"모델 사전 로드 실패: {name} - {e}")
+        return self.stats()
+
+    def unload(self, model_name: str, kind: str = "pkl"):
+        with self._lock:
+            self._entries.pop(self._key(model_name, kind), None)
+
+    def version(self, model_name: str) -> str:
+        """
+        현재 서빙 중인 모델 버전 (로드되지 않았으면 None)
+        pkl 없이 공유 형식만 올라가 있어도 그 버전을 반환합니다.
+        """
+        model_name = model_name.partition("@")[0]
+        with self._lock:
+            entry = self._entries.get(model_name) or next(
+                (e for key, e in self._entries.items() if key.partition("@")[0] == model_name), None)
+        return None if entry is None else entry.version
+
+    def loaded_models(self) -> list:
+        with self._lock:
+            return list(dict.fromkeys(key.partition("@")[0] for key in self._entries))
+
+    # -----------------
+    # 무중단 교체 (prepare -> 카나리 -> commit)
+    # -----------------
+
+    def prepare(self, model_name: str) -> ReloadCandidate:
+        """
+        모델 파일을 새로 로드하고, 지금 올라가 있는 파생 형식도 새 모델 기준으로 다시 만든 뒤
+        카나리 예측으로 검증합니다. 실패하면 예외가 나고 서빙 중인 모델은 그대로입니다.
+        """
+        candidate = ReloadCandidate(self, model_name)
+        new = candidate.get_entry(model_name)
+        with self._lock:
+            old = self._entries.get(model_name)
+            kinds = [key.partition("@")[2] for key in self._entries if key.partition("@")[0] == model_name]
+        for kind in kinds:
+            if kind:
+                candidate.get_entry(model_name, kind)
+        self._canary(model_name, new, old, candidate)
+        return candidate
+
+    def _canary(self, model_name: str, new: ModelEntry, old: ModelEntry, candidate: ReloadCandidate):
+        """
+        더미 입력 예측: 새 모델과 파생 형식이 모두 유한한 값을 내고, 출력 형태가 기존 모델과 같아야 합니다.
+        """
+        frame = _warmup_frame(new.model)
+        start = time.perf_counter()
+        preds = np.asarray(new.model.predict(frame))
+        new.warmup_ms = (time.perf_counter() - start) * 1000
+        if preds.dtype.kind in "fc" and not np.isfinite(preds).all():
+            raise ValueError(f"{model_name} v{new.version}: 카나리 예측값이 유한하지 않습니다.")
+        if old is not None:
+            old_preds = np.asarray(old.model.predict(_warmup_frame(old.model)))
+            if old_preds.shape != preds.shape:
+                raise ValueError(f"{model_name} v{new.version}: 출력 형태가 다릅니다. {old_preds.shape} -> {preds.shape}")
+        rows = frame.to_dict(orient="records")
+        for key, entry in candidate.entries.items():
+            if key != model_name and hasattr(entry.model, "predict_rows"):
+                if not np.isfinite(np.asarray(entry.model.predict_rows(rows), dtype=np.float64)).all():
+                    raise ValueError(f"{key} v{new.version}: 카나리 예측값이 유한하지 않습니다.")
+
+    def commit(self, candidate: ReloadCandidate) -> str:
+        """
+        검증된 새 항목들을 한 번에 교체합니다.
+        이미 기존 모델 객체를 받아 간 요청은 그 객체로 끝까지 예측합니다.
+        """
+        model_name = candidate.model_name
+        with self._lock:
+            for key in [key for key in self._entries if key.partition("@")[0] == model_name]:
+                if key not in candidate.entries:
+                    del self._entries[key]
+            for key, entry in candidate.entries.items():
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+            self._evict(keep=model_name)
+            self._serving_kinds.pop(model_name, None)
+            listeners = list(self._listeners)
+        version = candidate.version()
+        logger.info(f"모델 교체 완료: {model_name} v{version}")
+        for listener in listeners:
+            try:
+                listener(model_name, version)
+            except Exception as e:
+                logger.error(f"모델 교체 알림 실패: {model_name} - {e}")
+        return version
+
+    def reload(self, model_name: str) -> str:
+        return self.commit(self.prepare(model_name))
+
+    def add_listener(self, listener):
+        """
+        listener(model_name, version): 모델이 교체된 뒤 호출됩니다. (예: 예측 캐시 비우기)
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def stats(self) -> list:
+        """
+        모델별 로드 시간, 워밍업 시간, 메모리 크기 등을 반환합니다.
+        """
+        with self._lock:
+            return [entry.to_dict() for entry in self._entries.values()]
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """
+    프로세스 전역 레지스트리를 반환합니다.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
@@ -0,0 +1,152 @@
+# backend/ModelPredictionModule/model_watcher.py
+#
+# 모델 파일 핫 리로드
+# models/ 의 pkl 파일을 주기적으로 확인하여 서빙 중인 모델의 파일이 바뀌면,
+# 백그라운드 스레드에서 새 모델 로드 -> 카나리 예측 검증 -> 서빙 경로에 한 번에 교체합니다.
+# 교체 전에 시작된 요청은 이전 버전 모델로 끝까지 실행되고, 서버 재시작은 필요 없습니다.
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+
+from .model_registry import get_registry, artifact_version
+
+logger = logging.getLogger("model_watcher")
+
+# 파일 확인 주기 (초)
+WATCH_INTERVAL = float(os.getenv("ML_MODEL_WATCH_INTERVAL", "2"))
+
+
+class ModelWatcher:
+    """
+    서빙 중인 모델 파일 감시 + 무중단 교체
+    - 파일 상태(수정 시각, 크기)가 바뀐 뒤 다음 확인에서도 같을 때(복사 완료) 교체를 시작합니다.
+    - 내용 해시(버전)가 서빙 중인 버전과 같으면 (touch 등) 교체하지 않습니다.
+    - 카나리에 실패한 버전은 파일이 다시 바뀔 때까지 재시도하지 않습니다.
+    - hook(model_name, version)은 카나리 통과 후 교체 직전에 호출됩니다. 예외가 나면 교체를 취소합니다.
+      (예: 프로세스 실행기의 워커 풀을 새 버전으로 미리 띄우기)
+    """
+    def __init__(self, registry=None, interval: float = WATCH_INTERVAL):
+        self.registry = registry or get_registry()
+        self.interval = interval
+        self._hooks = []
+        self._seen = {}      # 모델 이름 -> 마지막으로 반영한 파일 상태
+        self._pending = {}   # 모델 이름 -> 바뀐 뒤 한 번 관찰한 파일 상태
+        self._rejected = {}  # 모델 이름 -> 카나리에 실패한 버전
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.checks = 0
+        self.reloads = 0
+        self.failures = 0
+        self.history = deque(maxlen=20)
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def _stat(self, model_name: str):
+        try:
+            st = os.stat(self.registry.model_path(model_name))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self) -> list:
+        """
+        한 번 확인하고 교체한 (모델 이름, 버전) 목록을 반환합니다.
+        """
+        self.checks += 1
+        swapped = []
+        for model_name in self.registry.loaded_models():
+            stat = self._stat(model_name)
+            if stat is None or stat == self._seen.get(model_name):
+                self._pending.pop(model_name, None)
+                continue
+            if self._pending.get(model_name) != stat:
+                self._pending[model_name] = stat
+                continue
+            del self._pending[model_name]
+            self._seen[model_name] = stat
+
+            version = artifact_version(self.registry.model_path(model_name))
+            if version in (self.registry.version(model_name), self._rejected.get(model_name)):
+                continue
+            try:
+                swapped.append((model_name, self.reload(model_name)))
+            except Exception as e:
+                self._rejected[model_name] = version
+                logger.error(f"모델 교체 실패 (기존 버전 유지): {model_name} v{version} - {e}")
+        return swapped
+
+    def reload(self, model_name: str) -> str:
+        """
+        모델 1개를 새로 로드/검증하여 교체합니다. (파일 변경 여부와 상관없이 수동 호출 가능)
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            previous = self.registry.version(model_name)
+            try:
+                candidate = self.registry.prepare(model_name)
+                version = candidate.version()
+                for hook in self._hooks:
+                    hook(model_name, version)
+                self.registry.commit(candidate)
+            except Exception as e:
+                self.failures += 1
+                self.history.append({"model": model_name, "from": previous, "ok": False,
+                                     "error": str(e), "at": time.time()})
+                raise
+            self.reloads += 1
+            self.history.append({"model": model_name, "from": previous, "to": version, "ok": True,
+                                 "elapsed_ms": round((time.perf_counter() - started) * 1000, 3), "at": time.time()})
+            return version
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"모델 파일 확인 실패: {e}")
+
+    def start(self):
+        if self._thread is not None:
+            return
+        for model_name in self.registry.loaded_models():
+            self._seen[model_name] = self._stat(model_name)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"모델 파일 감시 시작 ({self.registry.model_dir}, {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "interval": self.interval,
+            "checks": self.checks,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "versions": {name: self.registry.version(name) for name in self.registry.loaded_models()},
+            "history": list(self.history),
+        }
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_model_watcher() -> ModelWatcher:
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = ModelWatcher()
+    return _watcher
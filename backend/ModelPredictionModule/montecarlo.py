@@ -0,0 +1,260 @@
+# backend/ModelPredictionModule/montecarlo.py
+#
+# ROI/BEP 몬테카를로 시뮬레이션
+# - 입력 변수별 분포(normal / uniform / triangular / lognormal / fixed)에서 N개 시나리오를 뽑아
+#   xgb_reg_roi_bep_* 모델로 청크 단위 일괄 예측합니다.
+# - 원시 샘플은 보관하지 않고 청크마다 히스토그램/합계만 누적하므로 메모리는 청크 크기에만 비례합니다.
+# - 청크별 난수는 SeedSequence로 나누어, 병렬 여부와 상관없이 같은 seed면 같은 결과가 나옵니다.
+
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .model_registry import get_registry
+from .xgb_native import get_matrix_model
+
+logger = logging.getLogger("montecarlo")
+
+SIMULATION_MODELS = {
+    "planning": "xgb_reg_roi_bep_planning",
+    "selling": "xgb_reg_roi_bep_selling",
+}
+TARGETS = ["roi", "bep"]
+
+MIN_SIMULATIONS = 100
+MAX_SIMULATIONS = 1_000_000
+DEFAULT_CHUNK_SIZE = int(os.getenv("ML_MC_CHUNK_SIZE", "50000"))
+DEFAULT_WORKERS = int(os.getenv("ML_MC_WORKERS", str(os.cpu_count() or 1)))
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+# 표시용 히스토그램 구간 1개를 몇 개의 세부 구간으로 나눠 누적할지 (분위수 정밀도)
+FINE_BINS_PER_BIN = 64
+
+DISTRIBUTIONS = {
+    "fixed": ["value"],
+    "normal": ["mean", "std_dev"],
+    "lognormal": ["mean", "std_dev"],
+    "uniform": ["min", "max"],
+    "triangular": ["min", "mode", "max"],
+}
+
+
+def validate_variables(input_variables: dict, allowed: list):
+    """
+    분포 정의 검사 (잘못된 경우 ValueError)
+    """
+    for name, spec in input_variables.items():
+        if name not in allowed:
+            raise ValueError(f"{name}: 시뮬레이션할 수 없는 변수입니다. (가능: {allowed})")
+        kind = spec.get("distribution", "fixed")
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"{name}: 지원하지 않는 분포입니다: {kind}")
+        missing = [p for p in DISTRIBUTIONS[kind] if spec.get(p) is None]
+        if missing:
+            raise ValueError(f"{name}: {kind} 분포에 필요한 값이 없습니다: {missing}")
+        if kind in ("normal", "lognormal") and spec["std_dev"] < 0:
+            raise ValueError(f"{name}: std_dev는 0 이상이어야 합니다.")
+        if kind == "uniform" and spec["min"] > spec["max"]:
+            raise ValueError(f"{name}: min이 max보다 큽니다.")
+        if kind == "triangular" and not spec["min"] <= spec["mode"] <= spec["max"]:
+            raise ValueError(f"{name}: min <= mode <= max 이어야 합니다.")
+        if kind == "lognormal" and spec["mean"] <= 0:
+            raise ValueError(f"{name}: lognormal 분포의 mean은 0보다 커야 합니다.")
+
+
+def sample(spec: dict, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    분포 정의 1개에서 size개를 뽑습니다.
+    normal / lognormal 은 min, max가 있으면 그 범위로 자릅니다.
+    lognormal 의 mean, std_dev 는 (로그가 아닌) 실제 값의 평균/표준편차입니다.
+    """
+    kind = spec.get("distribution", "fixed")
+    if kind == "fixed":
+        return np.full(size, spec["value"], dtype=np.float64)
+    if kind == "uniform":
+        return rng.uniform(spec["min"], spec["max"], size)
+    if kind == "triangular":
+        if spec["min"] == spec["max"]:
+            return np.full(size, spec["min"], dtype=np.float64)
+        return rng.triangular(spec["min"], spec["mode"], spec["max"], size)
+    if kind == "normal":
+        values = rng.normal(spec["mean"], spec["std_dev"], size)
+    else:
+        sigma2 = np.log1p((spec["std_dev"] / spec["mean"]) ** 2)
+        values = rng.lognormal(np.log(spec["mean"]) - sigma2 / 2, np.sqrt(sigma2), size)
+    if spec.get("min") is not None or spec.get("max") is not None:
+        values = np.clip(values, spec.get("min"), spec.get("max"))
+    return values
+
+
+class _ChunkStats:
+    """
+    청크 1개의 타깃별 누적값 (세부 히스토그램, 구간 밖 개수, 합계, 최소/최대)
+    """
+    def __init__(self, values: np.ndarray, edges: list):
+        self.n = values.shape[0]
+        self.sum = values.sum(axis=0, dtype=np.float64)
+        self.sumsq = np.square(values, dtype=np.float64).sum(axis=0)
+        self.min = values.min(axis=0).astype(np.float64)
+        self.max = values.max(axis=0).astype(np.float64)
+        self.counts = []
+        self.under = []
+        self.over = []
+        for j, target_edges in enumerate(edges):
+            column = values[:, j]
+            self.counts.append(np.histogram(column, bins=target_edges)[0])
+            self.under.append(int((column < target_edges[0]).sum()))
+            self.over.append(int((column > target_edges[-1]).sum()))
+
+
+def _fine_edges(pilot: np.ndarray, bins: int) -> list:
+    """
+    첫 청크의 분포 범위를 양쪽으로 25% 넓혀 세부 히스토그램 구간을 정합니다.
+    """
+    edges = []
+    for j in range(pilot.shape[1]):
+        column = pilot[:, j]
+        column = column[np.isfinite(column)]
+        low, high = (float(column.min()), float(column.max())) if column.size else (0.0, 1.0)
+        margin = (high - low) * 0.25 or max(abs(low) * 0.01, 1e-6)
+        edges.append(np.linspace(low - margin, high + margin, bins * FINE_BINS_PER_BIN + 1))
+    return edges
+
+
+def _quantile(counts: np.ndarray, edges: np.ndarray, under: int, over: int,
+              low: float, high: float, q: float) -> float:
+    """
+    세부 히스토그램에서 선형 보간으로 분위수를 구합니다. (구간 밖 값은 [최소, 첫 경계], [끝 경계, 최대]로 취급)
+    """
+    all_counts = np.concatenate([[under], counts, [over]])
+    all_edges = np.concatenate([[min(low, edges[0])], edges, [max(high, edges[-1])]])
+    cumulative = np.cumsum(all_counts)
+    target = q * cumulative[-1]
+    i = int(np.searchsorted(cumulative, target, side="left"))
+    i = min(i, len(all_counts) - 1)
+    before = cumulative[i - 1] if i > 0 else 0
+    fraction = (target - before) / all_counts[i] if all_counts[i] else 0.0
+    return float(all_edges[i] + fraction * (all_edges[i + 1] - all_edges[i]))
+
+
+def _summarize(chunks: list, edges: list, bins: int) -> dict:
+    n = sum(c.n for c in chunks)
+    total = np.sum([c.sum for c in chunks], axis=0)
+    total_sq = np.sum([c.sumsq for c in chunks], axis=0)
+    low = np.min([c.min for c in chunks], axis=0)
+    high = np.max([c.max for c in chunks], axis=0)
+
+    results = {}
+    for j, target in enumerate(TARGETS[:len(edges)]):
+        counts = np.sum([c.counts[j] for c in chunks], axis=0)
+        under = sum(c.under[j] for c in chunks)
+        over = sum(c.over[j] for c in chunks)
+        mean = total[j] / n
+        std = float(np.sqrt(max(total_sq[j] / n - mean ** 2, 0.0)))
+        results[target] = {
+            "mean": float(mean),
+            "std": std,
+            "min": float(low[j]),
+            "max": float(high[j]),
+            "quantiles": {
+                f"p{int(q * 100)}": _quantile(counts, edges[j], under, over, low[j], high[j], q)
+                for q in QUANTILES
+            },
+            "histogram": {
+                "edges": edges[j][::FINE_BINS_PER_BIN].tolist(),
+                "counts": counts.reshape(bins, FINE_BINS_PER_BIN).sum(axis=1).tolist(),
+                "below_range": under,
+                "above_range": over,
+            },
+        }
+    if "roi" in results:
+        # ROI < 0 (손실) 확률: 0이 구간 안에 있으면 세부 히스토그램에서 보간
+        roi_counts = np.sum([c.counts[0] for c in chunks], axis=0)
+        roi_edges = edges[0]
+        if roi_edges[0] < 0 < roi_edges[-1]:
+            k = int(np.searchsorted(roi_edges, 0.0, side="right")) - 1
+            partial = roi_counts[k] * (0.0 - roi_edges[k]) / (roi_edges[k + 1] - roi_edges[k])
+            losses = sum(c.under[0] for c in chunks) + roi_counts[:k].sum() + partial
+        else:
+            losses = n if roi_edges[-1] <= 0 else sum(c.under[0] for c in chunks)
+        results["roi"]["loss_probability"] = float(losses / n)
+    return results
+
+
+def simulate_roi_bep(input_variables: dict, base: dict, stage: str = "planning",
+                     simulation_count: int = 10000, bins: int = 50, seed: int = None,
+                     parallel: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     workers: int = DEFAULT_WORKERS) -> dict:
+    """
+    input_variables: {변수명: {"distribution": "normal", "mean": ..., "std_dev": ...}, ...}
+                     (frontend/public/montecarlo_roi_bep.json 의 simulation_info.input_variables 형식)
+    base: 분포를 지정하지 않은 모델 입력 변수의 고정값
+    반환: 타깃(roi, bep)별 평균/표준편차/분위수/히스토그램 (원시 샘플은 반환하지 않음)
+    """
+    if stage not in SIMULATION_MODELS:
+        raise ValueError(f"stage는 {list(SIMULATION_MODELS)} 중 하나여야 합니다.")
+    if not MIN_SIMULATIONS <= simulation_count <= MAX_SIMULATIONS:
+        raise ValueError(f"simulation_count는 {MIN_SIMULATIONS}~{MAX_SIMULATIONS} 사이여야 합니다.")
+    model_name = SIMULATION_MODELS[stage]
+    encoder, predict = get_matrix_model(model_name)
+    model_version = get_registry().version(model_name)
+    validate_variables(input_variables, encoder.numeric)
+
+    start = time.perf_counter()
+    # 고정값 행 1개를 인코딩해 두고, 청크마다 복제한 뒤 분포 변수 컬럼만 덮어씁니다.
+    base_row = dict(base)
+    for name, spec in input_variables.items():
+        base_row.setdefault(name, spec.get("value", spec.get("mean", spec.get("min", 0.0))))
+    base_vector = encoder.encode([base_row])[0]
+    columns = [(encoder.output_columns.index(name), name) for name in encoder.numeric if name in input_variables]
+
+    sizes = [chunk_size] * (simulation_count // chunk_size)
+    if simulation_count % chunk_size:
+        sizes.append(simulation_count % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    def run_chunk(i: int, edges: list = None):
+        rng = np.random.default_rng(seeds[i])
+        X = np.tile(base_vector, (sizes[i], 1))
+        for j, name in columns:
+            X[:, j] = sample(input_variables[name], sizes[i], rng)
+        if encoder.zero_as_missing:
+            X[X == 0] = np.nan
+        preds = np.asarray(predict(X)).reshape(sizes[i], -1)
+        if edges is None:
+            return preds
+        return _ChunkStats(preds, edges)
+
+    # 첫 청크로 히스토그램 범위를 정한 뒤 나머지 청크는 (선택적으로) 병렬 실행
+    pilot = run_chunk(0)
+    edges = _fine_edges(pilot, bins)
+    chunks = [_ChunkStats(pilot, edges)]
+    del pilot
+    n_workers = max(1, min(workers, len(sizes) - 1)) if parallel else 1
+    if n_workers > 1:
+        # NumPy 난수 생성과 XGBoost 예측은 GIL을 풀기 때문에 스레드로도 여러 코어를 사용합니다.
+        with ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="montecarlo") as pool:
+            chunks += list(pool.map(lambda i: run_chunk(i, edges), range(1, len(sizes))))
+    else:
+        chunks += [run_chunk(i, edges) for i in range(1, len(sizes))]
+
+    results = _summarize(chunks, edges, bins)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"몬테카를로 {simulation_count}회 ({model_name}, 청크 {len(sizes)}개, 워커 {n_workers}개): {elapsed_ms:.1f} ms")
+    return {
+        "simulation_info": {
+            "simulation_count": simulation_count,
+            "model": model_name,
+            "model_version": model_version,
+            "input_variables": input_variables,
+            "fixed_inputs": {name: base_row[name] for name in encoder.numeric if name not in input_variables},
+            "seed": seed,
+            "chunk_size": chunk_size,
+            "chunks": len(sizes),
+            "workers": n_workers,
+            "elapsed_ms": round(elapsed_ms, 3),
+        },
+        "results": results,
+    }
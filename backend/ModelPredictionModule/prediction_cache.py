@@ -0,0 +1,250 @@
+# backend/ModelPredictionModule/prediction_cache.py
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+from .model_registry import artifact_version, get_registry, shared_manifest
+from .feature_encoder import FeatureEncoder, get_encoder
+from .xgb_native import NATIVE_DIR
+
+logger = logging.getLogger("prediction_cache")
+
+# 캐시 최대 항목 수 (행 단위), 유효 시간 (초)
+DEFAULT_MAX_ENTRIES = int(os.getenv("ML_CACHE_MAX_ENTRIES", "10000"))
+DEFAULT_TTL = float(os.getenv("ML_CACHE_TTL", "600"))
+# 금액 필드 양자화 단위 (원). 0이면 양자화하지 않습니다.
+# 예) 1000 -> ticket_price 40439.5 와 40100 은 모두 40000 으로 예측/캐시됩니다.
+DEFAULT_MONEY_STEP = float(os.getenv("ML_CACHE_MONEY_STEP", "0"))
+
+MONETARY_FIELDS = ["ticket_price", "marketing_budget", "production_cost"]
+
+
+def quantize_rows(rows: list, step: float, fields=MONETARY_FIELDS) -> list:
+    """
+    금액 필드를 step 단위로 반올림한 새 행 리스트를 반환합니다. (원본 dict는 바꾸지 않음)
+    숫자로 읽을 수 없는 값은 그대로 둡니다.
+    """
+    if not step:
+        return rows
+    quantized = []
+    for row in rows:
+        row = dict(row)
+        for field in fields:
+            value = row.get(field)
+            if value is None or isinstance(value, bool):
+                continue
+            try:
+                row[field] = round(float(value) / step) * step
+            except (ValueError, TypeError):
+                pass
+        quantized.append(row)
+    return quantized
+
+
+def load_key_encoder(model_name: str):
+    """
+    캐시 키용 (모델 버전, FeatureEncoder)
+    공유 형식 manifest / 네이티브 schema.json에 인코더 스키마가 있으면 pkl을 로드하지 않고 그것을 씁니다.
+    (버전은 둘 다 원본 pkl 내용 해시라 레지스트리 버전과 같습니다)
+    """
+    manifest = shared_manifest(model_name)
+    if manifest is not None and manifest["params"].get("encoder"):
+        return manifest["source_version"], FeatureEncoder.from_dict(manifest["params"]["encoder"])
+    registry = get_registry()
+    schema_path = os.path.join(NATIVE_DIR, f"{model_name}.schema.json")
+    if os.path.exists(schema_path):
+        with open(schema_path, encoding="utf-8") as f:
+            schema = json.load(f)
+        version = artifact_version(registry.model_path(model_name))
+        if schema.get("source_version") is not None and schema["source_version"] == version:
+            return version, FeatureEncoder.from_dict(schema["encoder"])
+    entry = registry.get_entry(model_name)
+    return entry.version, get_encoder(model_name, entry.model)
+
+
+class PredictionCache:
+    """
+    (모델 이름, 정규화된 특성 벡터) -> 예측값 캐시
+
+    - 키는 FeatureEncoder가 만든 float32 행을 바이트로 바꾼 값이라, 필드 순서/정수·실수 표기/
+      날짜 문자열과 일수 표기 차이와 상관없이 같은 입력이면 같은 키가 됩니다.
+    - LRU + TTL, 적중/미적중 카운터
+    - 키에 서빙 중인 모델 버전이 들어가므로, 모델이 교체되면 이전 버전 항목은 더 이상 적중하지 않습니다.
+      (교체 알림을 받으면 해당 모델 항목과 키 인코더를 바로 버립니다)
+    - 키 인코더는 모델별로 처음 한 번 파일에서 읽습니다. 이벤트 루프에서는 ready()가 False이면
+      prepare()를 스레드에서 먼저 호출합니다.
+    - submit()은 캐시에 없는 행만 묶어서 실제 예측 경로(submit_fn)로 넘깁니다.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 money_step: float = DEFAULT_MONEY_STEP):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.money_step = money_step
+        self._entries = OrderedDict()
+        self._encoders = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    def invalidate(self, model_name: str = None) -> int:
+        """
+        model_name의 캐시 항목을 모두 버립니다. (None이면 전체)
+        """
+        with self._lock:
+            keys = [key for key in self._entries if model_name is None or key[0].partition("@")[0] == model_name]
+            for key in keys:
+                del self._entries[key]
+            if model_name is None:
+                self._encoders.clear()
+            else:
+                self._encoders.pop(model_name, None)
+            self.invalidations += 1
+            return len(keys)
+
+    # -----------------
+    # 조회 / 저장
+    # -----------------
+
+    def ready(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name.partition("@")[0] in self._encoders
+
+    def key_encoder(self, model_name: str):
+        """
+        (모델 버전, 인코더). 처음 호출하면 파일을 읽습니다.
+        """
+        # '모델@모드' 형식(예: 예측 구간)도 같은 모델의 인코더로 키를 만듭니다.
+        base_name = model_name.partition("@")[0]
+        with self._lock:
+            cached = self._encoders.get(base_name)
+        if cached is None:
+            cached = load_key_encoder(base_name)
+            with self._lock:
+                self._encoders[base_name] = cached
+        return cached
+
+    def prepare(self, model_name: str):
+        """
+        키 인코더를 미리 읽어 둡니다. 실패는 무시합니다. (submit()에서 원래 예측 경로로 넘어가 같은 예외가 납니다)
+        """
+        try:
+            self.key_encoder(model_name)
+        except Exception as e:
+            logger.debug(f"{model_name}: 캐시 키 인코더를 읽지 못했습니다. - {e}")
+
+    def keys(self, model_name: str, rows: list) -> list:
+        version, encoder = self.key_encoder(model_name)
+        X = encoder.encode(rows)
+        return [(model_name, version, x.tobytes()) for x in X]
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at < now:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (np.array(value, copy=True), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def submit(self, model_name: str, rows: list, submit_fn) -> Future:
+        """
+        submit_fn(model_name, rows) -> Future 와 같은 형태로, 캐시에 있는 행은 바로 채우고
+        없는 행만 (요청 안의 중복도 제거하여) submit_fn으로 예측합니다.
+        """
+        rows = quantize_rows([rows] if isinstance(rows, dict) else list(rows), self.money_step)
+        try:
+            keys = self.keys(model_name, rows)
+        except Exception:
+            # 입력 오류(필수 컬럼 누락 등)는 원래 예측 경로에서 같은 예외가 나도록 그대로 넘깁니다.
+            return submit_fn(model_name, rows)
+
+        cached = [self.get(key) for key in keys]
+        missing = OrderedDict()
+        for i, (key, value) in enumerate(zip(keys, cached)):
+            if value is None:
+                missing.setdefault(key, i)
+
+        result = Future()
+        result.model_version = keys[0][1] if keys else None
+        if not missing:
+            result.set_result(np.stack(cached))
+            return result
+
+        def on_done(future: Future):
+            if future.cancelled():
+                result.cancel()
+                return
+            error = future.exception()
+            if error is not None:
+                result.set_exception(error)
+                return
+            try:
+                computed = dict(zip(missing.keys(), future.result()))
+                result.model_version = getattr(future, "model_version", None) or result.model_version
+                for key, value in computed.items():
+                    self.put(key, value)
+                result.set_result(np.stack([
+                    value if value is not None else computed[key] for key, value in zip(keys, cached)
+                ]))
+            except Exception as e:
+                result.set_exception(e)
+
+        submit_fn(model_name, [rows[i] for i in missing.values()]).add_done_callback(on_done)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "money_step": self.money_step,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache()
+                get_registry().add_listener(lambda model_name, version: _cache.invalidate(model_name))
+    return _cache
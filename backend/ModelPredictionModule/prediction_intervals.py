@@ -0,0 +1,126 @@
+# backend/ModelPredictionModule/prediction_intervals.py
+#
+# 트리 앙상블의 트리별/반복별 출력으로 예측 구간을 계산합니다.
+# - XGBoost: pred_leaf로 모든 트리의 리프를 한 번에 구해 반복(iteration)별 누적 예측을 만들고,
+#   학습 후반부 반복들의 누적 예측이 최종 예측에서 벗어난 거리의 분위수만큼 최종 예측 양쪽으로 넓힌 수렴 폭
+#   (boosting_convergence)을 구합니다. 모델이 아직 얼마나 흔들리는지를 나타내며, 커버리지가 보장된 예측 구간은 아닙니다.
+# - RandomForest: 트리별 클래스 확률의 경험적 분위수 (tree_quantiles)
+#
+# 결과 배열의 마지막 축은 [예측값, 하한, 상한] 입니다.
+#   XGB 타깃 1개: (n, 3), 타깃 여러 개: (n, 타깃 수, 3), RF: (n, 클래스 수, 3)
+
+import os
+import json
+import logging
+
+import numpy as np
+import xgboost as xgb
+
+from .model_registry import get_registry, register_loader
+from .xgb_native import NativeXGBModel
+from .forest_evaluator import get_flat_forest
+
+logger = logging.getLogger("prediction_intervals")
+
+# 구간 분위수 (하한, 상한)
+INTERVAL_QUANTILES = tuple(float(q) for q in os.getenv("ML_INTERVAL_QUANTILES", "0.05,0.95").split(","))
+# XGBoost: 누적 예측을 모을 학습 후반부 반복 비율 (0.5 -> 마지막 50% 반복)
+INTERVAL_TAIL = float(os.getenv("ML_INTERVAL_TAIL", "0.5"))
+# XGBoost: 수렴 폭의 반폭 = |누적 예측 - 최종 예측|의 이 분위수
+CONVERGENCE_QUANTILE = float(os.getenv("ML_INTERVAL_CONVERGENCE_QUANTILE", "0.9"))
+
+# 응답에 함께 내보내는 구간 계산 방식
+XGB_INTERVAL_INFO = {"method": "boosting_convergence", "deviation_quantile": CONVERGENCE_QUANTILE,
+                     "tail": INTERVAL_TAIL}
+FOREST_INTERVAL_INFO = {"method": "tree_quantiles", "quantiles": list(INTERVAL_QUANTILES)}
+
+
+def _leaf_table(booster: xgb.Booster):
+    """
+    booster의 트리별 노드 값 표 (트리 수, 최대 노드 수)와 base_score
+    리프 노드의 split_conditions 값이 리프 출력값입니다.
+    """
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]").split(",")[0])
+    trees = learner["gradient_booster"]["model"]["trees"]
+    width = max(len(tree["split_conditions"]) for tree in trees)
+    table = np.zeros((len(trees), width), dtype=np.float32)
+    for i, tree in enumerate(trees):
+        table[i, :len(tree["split_conditions"])] = tree["split_conditions"]
+    return table, base_score
+
+
+class StagedXGBModel:
+    """
+    NativeXGBModel + 부스터별 리프 값 표
+    predict_intervals(X): 점 예측은 inplace_predict 결과 그대로, 구간은 점 예측을 중심으로 한 수렴 폭
+    """
+    def __init__(self, native: NativeXGBModel, quantile: float = CONVERGENCE_QUANTILE, tail: float = INTERVAL_TAIL):
+        self.native = native
+        self.encoder = native.encoder
+        self.quantile = quantile
+        self.tail = tail
+        self.tables = [_leaf_table(booster) for booster in native.boosters]
+
+    def _target_intervals(self, booster, table, base_score, X, preds) -> np.ndarray:
+        leaves = booster.predict(xgb.DMatrix(X, nthread=self.native.nthread), pred_leaf=True)
+        leaves = np.asarray(leaves, dtype=np.int64).reshape(X.shape[0], -1)
+        n_trees = table.shape[0]
+        contributions = table[np.arange(n_trees), leaves]
+        start = min(int(n_trees * (1 - self.tail)), n_trees - 1)
+        staged = base_score + np.cumsum(contributions, axis=1, dtype=np.float64)[:, start:]
+        # 누적 예측은 최종 예측에서 끝나므로 그 분포의 분위수를 그대로 쓰면 예측값이 구간 한쪽 끝에 붙습니다.
+        # 최종 예측에서 벗어난 거리로 반폭을 정해 예측값을 중심에 둡니다.
+        half_width = np.quantile(np.abs(staged - preds[:, None]), self.quantile, axis=1)
+        return np.stack([preds, preds - half_width, preds + half_width], axis=-1)
+
+    def predict_intervals(self, X: np.ndarray) -> np.ndarray:
+        preds = self.native.predict(X).reshape(X.shape[0], -1)
+        intervals = [
+            self._target_intervals(booster, table, base_score, X, preds[:, j])
+            for j, (booster, (table, base_score)) in enumerate(zip(self.native.boosters, self.tables))
+        ]
+        if len(intervals) == 1:
+            return intervals[0]
+        return np.stack(intervals, axis=1)
+
+    def predict_rows(self, input_data) -> np.ndarray:
+        return self.predict_intervals(self.encoder.encode(input_data))
+
+
+def forest_intervals(forest, X: np.ndarray, quantiles=INTERVAL_QUANTILES) -> np.ndarray:
+    """
+    FlatForest: 한 번의 순회로 얻은 리프에서 (포레스트 확률, 트리별 확률의 하한/상한)
+    """
+    leaves = forest.apply(X)
+    proba = forest.predict_proba_leaves(leaves)
+    per_tree = forest.leaf_proba[leaves]  # (n, 트리 수, 클래스 수)
+    lower, upper = np.quantile(per_tree, quantiles, axis=1)
+    return np.stack([proba, np.minimum(lower, proba), np.maximum(upper, proba)], axis=-1)
+
+
+def _load_staged(model_name: str, registry):
+    """
+    레지스트리 로더: XGBoost 모델이면 StagedXGBModel, 아니면 None
+    """
+    native = registry.get(model_name, kind="native")
+    if native is None:
+        return None, registry.model_path(model_name)
+    return StagedXGBModel(native), registry.model_path(model_name)
+
+
+register_loader("staged", _load_staged)
+
+
+def predict_intervals(model_name: str, input_data) -> np.ndarray:
+    """
+    요청 payload -> [예측값, 하한, 상한] 배열 (XGBoost / RandomForest 모델만 지원)
+    """
+    staged = get_registry().get(model_name, kind="staged")
+    if staged is not None:
+        return staged.predict_rows(input_data)
+    forest = get_flat_forest(model_name)
+    if forest is not None:
+        return forest_intervals(forest, forest.encoder.encode(input_data))
+    raise ValueError(f"{model_name}: 예측 구간을 지원하지 않는 모델입니다.")
@@ -0,0 +1,225 @@
+# backend/ModelPredictionModule/price_optimizer.py
+#
+# 티켓 가격 최적화 (선택: 마케팅 예산 함께)
+# 공연별로 가격(x 예산) 후보 격자를 만들어 xgb_reg_accumulated_sales_* 모델로 판매량을 예측하고,
+# 매출 / 이익 / ROI가 가장 큰 후보를 찾습니다.
+# - 모든 공연의 후보를 한 행렬로 만들어 라운드당 예측 호출은 1번입니다. (sweep과 같은 인코딩 후 컬럼 덮어쓰기)
+# - 거친 격자에서 최적 후보를 찾고, 그 주변(격자 한 칸 범위)을 더 촘촘한 격자로 다시 찾는 과정을 반복합니다.
+# - 예측 판매량은 capacity(> 0)를 넘지 않도록 자릅니다.
+# - 이익 / ROI는 예측 판매량을 손익 계산식(roi_bep_formula)에 넣어 계산합니다.
+
+import os
+import time
+import logging
+
+import numpy as np
+
+from .model_registry import get_registry
+from .xgb_native import get_matrix_model
+from .roi_bep_formula import roi_bep
+
+logger = logging.getLogger("price_optimizer")
+
+OPTIMIZER_MODELS = {
+    "planning": "xgb_reg_accumulated_sales_planning",
+    "selling": "xgb_reg_accumulated_sales_selling",
+}
+OBJECTIVES = ["revenue", "profit", "roi"]
+# 손익 계산에 필요한데 판매량 모델 입력에는 없는 값 (손익 예측 API 기본값과 동일)
+COST_DEFAULTS = {"production_cost": 570111934.0, "variable_cost_rate": 0.17755}
+
+# 탐색 범위를 지정하지 않으면 현재 값의 배수 범위
+DEFAULT_PRICE_RANGE = (0.5, 2.0)
+DEFAULT_BUDGET_RANGE = (0.5, 2.0)
+COARSE_STEPS = int(os.getenv("ML_OPTIMIZER_COARSE_STEPS", "33"))
+BUDGET_STEPS = int(os.getenv("ML_OPTIMIZER_BUDGET_STEPS", "9"))
+REFINE_STEPS = int(os.getenv("ML_OPTIMIZER_REFINE_STEPS", "9"))
+REFINE_ROUNDS = int(os.getenv("ML_OPTIMIZER_REFINE_ROUNDS", "3"))
+# 라운드당 예측 행 수 상한 (공연 수 x 후보 수)
+MAX_ROWS = int(os.getenv("ML_OPTIMIZER_MAX_ROWS", "500000"))
+
+
+def _bounds(base: np.ndarray, value_range, name: str) -> tuple:
+    """
+    value_range: None(현재 값의 기본 배수 범위) / {"min": .., "max": ..} 절대 범위 / {"scale_min": .., "scale_max": ..}
+    """
+    value_range = {key: value for key, value in (value_range or {}).items() if value is not None}
+    default = DEFAULT_PRICE_RANGE if name == "ticket_price" else DEFAULT_BUDGET_RANGE
+    lo = np.full(len(base), value_range["min"], dtype=np.float64) if "min" in value_range else \
+        base * value_range.get("scale_min", default[0])
+    hi = np.full(len(base), value_range["max"], dtype=np.float64) if "max" in value_range else \
+        base * value_range.get("scale_max", default[1])
+    if (lo <= 0).any() or (hi < lo).any():
+        raise ValueError(f"{name}: 탐색 범위는 0보다 크고 min <= max 이어야 합니다. (현재 값이 0이면 min/max를 지정하세요)")
+    return lo, hi
+
+
+def _grid(lo: np.ndarray, hi: np.ndarray, steps: int) -> np.ndarray:
+    # (공연 수, steps) 공연별 등간격 후보
+    return lo[:, None] + (hi - lo)[:, None] * np.linspace(0.0, 1.0, steps)[None, :]
+
+
+class _Evaluator:
+    """
+    공연별 기준 행(인코딩 1회)에 가격/예산 후보를 덮어써서 판매량과 목표값을 계산합니다.
+    """
+    def __init__(self, model_name: str, rows: list, objective: str):
+        self.encoder, self.predict = get_matrix_model(model_name)
+        self.objective = objective
+        self.X = self.encoder.encode(rows)
+        self.price_col = self.encoder.output_columns.index("ticket_price")
+        self.budget_col = self.encoder.output_columns.index("marketing_budget")
+        column = lambda key, default=np.nan: np.array(
+            [row.get(key) if row.get(key) is not None else default for row in rows], dtype=np.float64)
+        self.capacity = column("capacity", 0.0)
+        self.production_cost = column("production_cost", COST_DEFAULTS["production_cost"])
+        self.variable_cost_rate = column("variable_cost_rate", COST_DEFAULTS["variable_cost_rate"])
+        self.rows_evaluated = 0
+
+    def __call__(self, price: np.ndarray, budget: np.ndarray) -> dict:
+        """
+        price, budget: (공연 수, 후보 수) -> 후보별 판매량/매출/이익/ROI (공연 수, 후보 수)
+        """
+        n, candidates = price.shape
+        X = np.repeat(self.X, candidates, axis=0)
+        X[:, self.price_col] = price.ravel()
+        X[:, self.budget_col] = budget.ravel()
+        if self.encoder.zero_as_missing:
+            for j in (self.price_col, self.budget_col):
+                X[X[:, j] == 0, j] = np.nan
+        sales = np.asarray(self.predict(X), dtype=np.float64).reshape(n, candidates)
+        self.rows_evaluated += len(X)
+        capped = self.capacity > 0
+        sales = np.maximum(sales, 0.0)
+        sales[capped] = np.minimum(sales[capped], self.capacity[capped, None])
+        result = roi_bep(self.production_cost[:, None], budget, price, self.variable_cost_rate[:, None], sales)
+        return {"sales": sales, "revenue": result["revenue"], "profit": result["profit"], "roi": result["roi"],
+                "capacity_bound": capped[:, None] & (sales >= self.capacity[:, None])}
+
+    def score(self, result: dict) -> np.ndarray:
+        # 계산할 수 없는 목표값(NaN)은 선택되지 않게 -inf
+        return np.nan_to_num(result[self.objective], nan=-np.inf)
+
+
+def _pick(result: dict, index: np.ndarray) -> dict:
+    rows = np.arange(len(index))
+    return {key: values[rows, index] for key, values in result.items()}
+
+
+def _number(value):
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def optimize_prices(stage: str, performances: list, objective: str = "revenue", price_range: dict = None,
+                    optimize_budget: bool = False, budget_range: dict = None, coarse_steps: int = COARSE_STEPS,
+                    refine_steps: int = REFINE_STEPS, rounds: int = REFINE_ROUNDS,
+                    include_curve: bool = False) -> dict:
+    """
+    stage: planning / selling (판매량 모델 선택)
+    performances: 판매량 모델 입력 dict 리스트 (+ 선택: production_cost, variable_cost_rate, performance_id)
+    objective: revenue(매출) / profit(이익) / roi
+    반환: 공연별 최적 가격(예산)과 그때의 예측 판매량/매출/이익/ROI, 현재 값 기준 결과와 개선량,
+          비용을 주지 않아 기본값을 쓴 항목(defaults_used)
+    """
+    if stage not in OPTIMIZER_MODELS:
+        raise ValueError(f"stage는 {list(OPTIMIZER_MODELS)} 중 하나여야 합니다.")
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective는 {OBJECTIVES} 중 하나여야 합니다.")
+    if not performances:
+        raise ValueError("최적화할 공연이 없습니다.")
+    if coarse_steps < 2 or refine_steps < 3 or rounds < 0:
+        raise ValueError("coarse_steps >= 2, refine_steps >= 3, rounds >= 0 이어야 합니다.")
+    budget_steps = BUDGET_STEPS if optimize_budget else 1
+    if len(performances) * (coarse_steps * budget_steps + 1) > MAX_ROWS:
+        raise ValueError(f"공연 수 x 후보 수가 최대 {MAX_ROWS:,}행을 넘습니다.")
+
+    start = time.perf_counter()
+    model_name = OPTIMIZER_MODELS[stage]
+    evaluate = _Evaluator(model_name, performances, objective)
+    base_price = np.array([float(row.get("ticket_price") or 0.0) for row in performances])
+    base_budget = np.array([float(row.get("marketing_budget") or 0.0) for row in performances])
+    price_lo, price_hi = _bounds(base_price, price_range, "ticket_price")
+    budget_lo, budget_hi = _bounds(base_budget, budget_range, "marketing_budget") if optimize_budget else \
+        (base_budget, base_budget)
+
+    # 1라운드: 거친 격자 + 현재 값(마지막 후보)을 한 번에 예측
+    price_steps = coarse_steps
+    lo, hi, b_lo, b_hi = price_lo, price_hi, budget_lo, budget_hi
+    best, best_score, curve = None, None, None
+    for round_index in range(rounds + 1):
+        prices, budgets = _grid(lo, hi, price_steps), _grid(b_lo, b_hi, budget_steps)
+        price = np.repeat(prices, budget_steps, axis=1)
+        budget = np.tile(budgets, (1, price_steps))
+        if round_index == 0:
+            price = np.concatenate([price, base_price[:, None]], axis=1)
+            budget = np.concatenate([budget, base_budget[:, None]], axis=1)
+        result = evaluate(price, budget)
+        result.update({"ticket_price": price, "marketing_budget": budget})
+        score = evaluate.score(result)
+        if round_index == 0:
+            # 현재 값도 후보에 포함하므로 최적 후보가 현재보다 나빠지지 않습니다. (improvement >= 0)
+            baseline = _pick(result, np.full(len(performances), price.shape[1] - 1))
+            if include_curve:
+                # 가격별 목표값 (예산도 찾는 경우 가격마다 가장 좋은 예산 기준)
+                curve = score[:, :-1].reshape(len(performances), price_steps, budget_steps).max(axis=2)
+                curve_prices = prices
+        index = np.argmax(score, axis=1)
+        candidate, candidate_score = _pick(result, index), score[np.arange(len(index)), index]
+        if best is None:
+            best, best_score = candidate, candidate_score
+        else:
+            better = candidate_score > best_score
+            for key in best:
+                best[key] = np.where(better, candidate[key], best[key])
+            best_score = np.maximum(best_score, candidate_score)
+
+        # 다음 라운드: 현재 최적 후보의 격자 한 칸 범위 (전체 탐색 범위 안으로 제한)
+        price_step = (hi - lo) / max(price_steps - 1, 1)
+        # (현재 값이 탐색 범위 밖인데 최적이면 범위 끝을 다시 찾습니다)
+        lo = np.clip(best["ticket_price"] - price_step, price_lo, price_hi)
+        hi = np.clip(best["ticket_price"] + price_step, price_lo, price_hi)
+        if optimize_budget:
+            budget_step = (b_hi - b_lo) / max(budget_steps - 1, 1)
+            b_lo = np.clip(best["marketing_budget"] - budget_step, budget_lo, budget_hi)
+            b_hi = np.clip(best["marketing_budget"] + budget_step, budget_lo, budget_hi)
+        price_steps = refine_steps
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"가격 최적화 {stage}/{objective}: {len(performances)}건, {evaluate.rows_evaluated:,} rows, "
+                f"{elapsed_ms:.1f} ms")
+
+    def summary(values: dict, k: int) -> dict:
+        return {
+            "ticket_price": float(values["ticket_price"][k]),
+            "marketing_budget": float(values["marketing_budget"][k]),
+            "predicted_sales": float(values["sales"][k]),
+            "revenue": float(values["revenue"][k]),
+            "profit": float(values["profit"][k]),
+            "roi": _number(values["roi"][k]),
+            "capacity_bound": bool(values["capacity_bound"][k]),
+        }
+
+    results = []
+    for k, row in enumerate(performances):
+        item = {"best": summary(best, k), "current": summary(baseline, k)}
+        if row.get("performance_id") is not None:
+            item = {"performance_id": row["performance_id"], **item}
+        gain = best[objective][k] - baseline[objective][k]
+        item["improvement"] = _number(gain)
+        # 손익 계산에 기본값(COST_DEFAULTS)을 쓴 비용 항목 (profit / roi는 이 값에 따라 달라집니다)
+        item["defaults_used"] = [key for key in COST_DEFAULTS if row.get(key) is None]
+        if include_curve:
+            item["curve"] = {"ticket_price": curve_prices[k].tolist(),
+                             objective: [None if np.isinf(v) else float(v) for v in curve[k]]}
+        results.append(item)
+
+    return {
+        "stage": stage,
+        "model": model_name,
+        "model_version": get_registry().version(model_name),
+        "objective": objective,
+        "optimize_budget": optimize_budget,
+        "results": results,
+        "rows_evaluated": evaluate.rows_evaluated,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
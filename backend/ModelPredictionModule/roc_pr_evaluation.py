@@ -0,0 +1,379 @@
+# backend/ModelPredictionModule/roc_pr_evaluation.py
+#
+# 티켓 위험 모델 ROC/PR 스트리밍 평가
+# ticket_risk_roc_pr.compute_roc_pr 처럼 전체 라벨/확률을 메모리에 올려 roc_curve를 그리지 않고,
+# 클래스별(one-vs-rest) 점수를 고정 구간 히스토그램(양성 수, 음성 수)에 청크 단위로 누적합니다.
+# 곡선과 AUC는 히스토그램 누적합으로 계산하므로 메모리는 행 수와 상관없이 (클래스 수 x 2 x 구간 수) 입니다.
+#
+# - AUC 오차 상한: 같은 구간 안의 (양성, 음성) 쌍만 순서를 모르므로 0.5 * sum(양성_b * 음성_b) / (P * N)
+# - AP(평균 정밀도): 구간 안 순서의 최악/최선 경우로 [하한, 상한]을 함께 반환합니다.
+# - 곡선은 곡선 길이 기준으로 균등하게 골라 points개 이하로 줄여서 반환합니다.
+#
+# 홀드아웃 평가 (sales_tb 일자별 기록 -> 공연 종료 시점 예매율로 정한 실제 위험 등급):
+#   cd backend
+#   python -m ModelPredictionModule.roc_pr_evaluation \
+#       --performances ../frontend/public/performance_tb.json --sales ../frontend/public/sales_tb.json \
+#       --state roc_pr_state.npz --output roc_pr.json
+# 이미 예측한 결과 파일 (라벨 컬럼 + 클래스별 확률 컬럼) 스트리밍 평가:
+#   python -m ModelPredictionModule.roc_pr_evaluation --scores scored.parquet --label-column actual_risk
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.special import digamma
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry
+from ModelPredictionModule.forest_evaluator import get_flat_forest
+from ModelPredictionModule.bulk_score import iter_frames, load_catalog, prepare_rows
+from ModelPredictionModule.backtest import RISK_MODEL, risk_level, performance_partitions
+
+logger = logging.getLogger("roc_pr_evaluation")
+
+# 0: 안정 (저위험), 1: 중위험, 2: 고위험 (backtest.RISK_THRESHOLDS 기준)
+RISK_CLASSES = [0, 1, 2]
+RISK_CLASS_NAMES = ["안정", "중위험", "고위험"]
+
+# 점수 구간 수 (AUC 오차 상한은 구간이 촘촘할수록 작아짐)
+DEFAULT_BINS = int(os.getenv("ML_ROC_PR_BINS", "1000"))
+# 응답 곡선의 최대 점 수
+DEFAULT_POINTS = int(os.getenv("ML_ROC_PR_POINTS", "101"))
+DEFAULT_CHUNK_SIZE = int(os.getenv("ML_ROC_PR_CHUNK_SIZE", "262144"))
+
+_PUBLIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public"))
+# API 평가 데이터: 저장된 히스토그램(있으면 우선) 또는 홀드아웃 원본
+STATE_PATH = os.getenv("ML_ROC_PR_STATE")
+HOLDOUT_PERFORMANCES = os.getenv("ML_ROC_PR_PERFORMANCES", os.path.join(_PUBLIC_DIR, "performance_tb.json"))
+HOLDOUT_SALES = os.getenv("ML_ROC_PR_SALES", os.path.join(_PUBLIC_DIR, "sales_tb.json"))
+
+
+class ScoreHistogram:
+    """
+    클래스별 점수 히스토그램: counts[클래스, 0=음성/1=양성, 구간]
+    점수 s는 구간 floor(s * bins)에 들어갑니다. (0~1 밖의 값은 양 끝 구간)
+    """
+    def __init__(self, classes=RISK_CLASSES, bins: int = DEFAULT_BINS, counts: np.ndarray = None):
+        self.classes = list(classes)
+        self.bins = int(bins)
+        self.counts = np.zeros((len(self.classes), 2, self.bins), dtype=np.int64) if counts is None else counts
+
+    @property
+    def rows(self) -> int:
+        return int(self.counts[0].sum()) if len(self.classes) else 0
+
+    def update(self, y_true, y_proba) -> int:
+        """
+        y_true: (n,) 클래스 라벨, y_proba: (n, 클래스 수) 클래스별 확률 (self.classes 순서)
+        """
+        y_true = np.asarray(y_true)
+        y_proba = np.asarray(y_proba, dtype=np.float64).reshape(len(y_true), -1)
+        if y_proba.shape[1] != len(self.classes):
+            raise ValueError(f"확률 컬럼 수({y_proba.shape[1]})가 클래스 수({len(self.classes)})와 다릅니다.")
+        # 잘못된 값이 섞이면 일부만 누적되지 않도록, 세기 전에 전체를 확인합니다.
+        unknown = ~np.isin(y_true, self.classes)
+        if unknown.any():
+            raise ValueError(f"알 수 없는 라벨 {np.unique(y_true[unknown]).tolist()} (가능: {list(self.classes)})")
+        invalid = ~(np.isfinite(y_proba) & (y_proba >= 0) & (y_proba <= 1))
+        if invalid.any():
+            row = int(np.argwhere(invalid)[0][0])
+            raise ValueError(f"확률은 0~1 사이의 유한한 값이어야 합니다. ({row}번째 행: {y_proba[row].tolist()})")
+        idx = np.clip((y_proba * self.bins).astype(np.int64), 0, self.bins - 1)
+        for k, cls in enumerate(self.classes):
+            # 양성 행은 뒤쪽 bins칸에 세도록 오프셋을 더해 bincount 1회로 양성/음성을 함께 셉니다.
+            flat = idx[:, k] + self.bins * (y_true == cls)
+            self.counts[k] += np.bincount(flat, minlength=2 * self.bins).reshape(2, self.bins)
+        return len(y_true)
+
+    def merge(self, other: "ScoreHistogram") -> "ScoreHistogram":
+        if other.classes != self.classes or other.bins != self.bins:
+            raise ValueError("클래스와 구간 수가 같은 히스토그램만 합칠 수 있습니다.")
+        self.counts += other.counts
+        return self
+
+    def save(self, path: str, **meta):
+        np.savez(path, counts=self.counts, classes=np.asarray(self.classes), bins=self.bins,
+                 meta=json.dumps(meta, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        반환: (히스토그램, 저장 시 메타 정보)
+        """
+        with np.load(path) as data:
+            histogram = cls(data["classes"].tolist(), int(data["bins"]), data["counts"].astype(np.int64))
+            return histogram, json.loads(str(data["meta"]))
+
+    def curves(self, k: int) -> dict:
+        """
+        클래스 k의 구간 단위 ROC/PR 곡선과 AUC, AP (다운샘플 전)
+        """
+        # 높은 점수 구간부터 누적: 임계값 = 구간 하한 (score >= 임계값이면 양성 예측)
+        neg = self.counts[k, 0, ::-1].astype(np.float64)
+        pos = self.counts[k, 1, ::-1].astype(np.float64)
+        thresholds = np.arange(self.bins, 0, -1) / self.bins - 1.0 / self.bins
+        P, N = pos.sum(), neg.sum()
+        result = {"positives": int(P), "negatives": int(N)}
+        if P == 0 or N == 0:
+            return result
+
+        tp, fp = np.cumsum(pos), np.cumsum(neg)
+        tpr = np.concatenate([[0.0], tp / P])
+        fpr = np.concatenate([[0.0], fp / N])
+        result["auc"] = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+        result["auc_error_bound"] = float(0.5 * np.sum(pos * neg) / (P * N))
+
+        # AP: 양성이 있는 구간마다 (이전 누적 tp=a, fp=f, 구간 양성 p, 음성 n)
+        # 구간 안 k번째 양성의 정밀도 (a+k)/(c+k), 최선 c=a+f (양성 먼저), 최악 c=a+f+n (음성 먼저)
+        # sum_{k=1..p} (a+k)/(c+k) = p - (c-a) * (digamma(c+p+1) - digamma(c+1))
+        has_pos = pos > 0
+        a, f = (tp - pos)[has_pos], (fp - neg)[has_pos]
+        p, n = pos[has_pos], neg[has_pos]
+
+        def precision_sum(c):
+            return p - (c - a) * (digamma(c + p + 1) - digamma(c + 1))
+
+        result["average_precision"] = float(np.sum(p * (a + p) / (a + f + p + n)) / P)
+        result["average_precision_bounds"] = [float(precision_sum(a + f + n).sum() / P),
+                                              float(precision_sum(a + f).sum() / P)]
+
+        # 비어 있는 구간은 곡선 점이 겹치므로 제외합니다.
+        keep = (pos + neg) > 0
+        result["roc"] = (fpr[np.concatenate([[True], keep])], tpr[np.concatenate([[True], keep])],
+                         np.concatenate([[1.0], thresholds])[np.concatenate([[True], keep])])
+        precision = tp[keep] / (tp[keep] + fp[keep])
+        result["pr"] = (np.concatenate([[0.0], (tp / P)[keep]]), np.concatenate([[1.0], precision]),
+                        np.concatenate([[1.0], thresholds[keep]]))
+        return result
+
+
+def downsample(x: np.ndarray, y: np.ndarray, points: int = DEFAULT_POINTS) -> np.ndarray:
+    """
+    곡선 길이 기준으로 균등한 위치의 점 인덱스 (양 끝점 포함, points개 이하)
+    """
+    if len(x) <= points:
+        return np.arange(len(x))
+    length = np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    idx = np.searchsorted(length, np.linspace(0.0, length[-1], points))
+    return np.unique(np.clip(np.concatenate([[0], idx, [len(x) - 1]]), 0, len(x) - 1))
+
+
+def _rounded(values: np.ndarray) -> list:
+    return np.round(values, 6).tolist()
+
+
+def curve_payload(histogram: ScoreHistogram, points: int = DEFAULT_POINTS, class_names: list = None) -> dict:
+    """
+    히스토그램 -> compute_roc_pr와 같은 형식(roc_curve, pr_curve) + 클래스별 AUC/AP와 오차 범위
+    """
+    names = class_names or [str(cls) for cls in histogram.classes]
+    roc_data, pr_data = [], []
+    for k, cls in enumerate(histogram.classes):
+        curves = histogram.curves(k)
+        counts = {"class": cls, "name": names[k], "positives": curves["positives"], "negatives": curves["negatives"]}
+        if "roc" not in curves:
+            # 양성 또는 음성이 하나도 없으면 곡선을 정의할 수 없습니다.
+            roc_data.append({**counts, "fpr": [], "tpr": [], "thresholds": [], "auc": None, "auc_error_bound": None})
+            pr_data.append({**counts, "precision": [], "recall": [], "thresholds": [],
+                            "average_precision": None, "average_precision_bounds": None})
+            continue
+        fpr, tpr, roc_thresholds = curves["roc"]
+        idx = downsample(fpr, tpr, points)
+        roc_data.append({
+            **counts,
+            "fpr": _rounded(fpr[idx]),
+            "tpr": _rounded(tpr[idx]),
+            "thresholds": _rounded(roc_thresholds[idx]),
+            "auc": curves["auc"],
+            "auc_error_bound": curves["auc_error_bound"],
+        })
+        recall, precision, pr_thresholds = curves["pr"]
+        idx = downsample(recall, precision, points)
+        pr_data.append({
+            **counts,
+            "precision": _rounded(precision[idx]),
+            "recall": _rounded(recall[idx]),
+            "thresholds": _rounded(pr_thresholds[idx]),
+            "average_precision": curves["average_precision"],
+            "average_precision_bounds": curves["average_precision_bounds"],
+        })
+    return {"rows": histogram.rows, "bins": histogram.bins, "roc_curve": roc_data, "pr_curve": pr_data}
+
+
+# -----------------
+# 홀드아웃 채점
+# -----------------
+
+def class_proba(proba: np.ndarray, model_classes, classes=RISK_CLASSES) -> np.ndarray:
+    """
+    모델 classes_ 순서의 확률 -> classes 순서 (모델이 모르는 클래스는 확률 0)
+    """
+    result = np.zeros((proba.shape[0], len(classes)), dtype=np.float64)
+    position = {cls: j for j, cls in enumerate(np.asarray(model_classes).tolist())}
+    for k, cls in enumerate(classes):
+        if cls in position:
+            result[:, k] = proba[:, position[cls]]
+    return result
+
+
+def holdout_chunk(frame: pd.DataFrame, catalog: dict, model_name: str = RISK_MODEL):
+    """
+    공연 여러 개의 전체 판매 기록 -> (일자별 실제 위험 등급, 클래스별 예측 확률)
+    """
+    frame = frame.sort_values(["performance_id", "date"], kind="stable").reset_index(drop=True)
+    final_booking_rate = frame.groupby("performance_id", sort=False)["booking_rate"].transform("last")
+    y_true = risk_level(final_booking_rate.to_numpy(dtype=np.float64))
+    forest = get_flat_forest(model_name)
+    if forest is None:
+        raise ValueError(f"{model_name}: 랜덤 포레스트 분류 모델이 아닙니다.")
+    _, proba = forest.predict_with_proba(forest.encoder.encode(prepare_rows(frame, catalog)))
+    return y_true, class_proba(proba, forest.classes_)
+
+
+def evaluate_holdout(performances: str, sales: str, bins: int = DEFAULT_BINS,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, model_name: str = RISK_MODEL) -> ScoreHistogram:
+    catalog = load_catalog(performances)
+    sales_frame = pd.concat(list(iter_frames(sales, chunk_size)), ignore_index=True)
+    histogram = ScoreHistogram(RISK_CLASSES, bins)
+    for part in performance_partitions(sales_frame, chunk_size):
+        histogram.update(*holdout_chunk(part, catalog, model_name))
+    return histogram
+
+
+def evaluate_scores(source: str, label_column: str, proba_columns: list, bins: int = DEFAULT_BINS,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE, classes=RISK_CLASSES) -> ScoreHistogram:
+    """
+    예측 결과 파일(또는 sql:<쿼리>)을 청크로 읽어 히스토그램에 누적합니다.
+    """
+    histogram = ScoreHistogram(classes, bins)
+    for frame in iter_frames(source, chunk_size):
+        proba = np.column_stack([pd.to_numeric(frame[col], errors="coerce").to_numpy(dtype=np.float64)
+                                 for col in proba_columns])
+        histogram.update(frame[label_column].to_numpy(), np.nan_to_num(proba))
+    return histogram
+
+
+# -----------------
+# API 서비스
+# -----------------
+
+class RocPrEvaluator:
+    """
+    서빙 중인 티켓 위험 모델의 ROC/PR 히스토그램
+    - 처음 요청 시 저장된 히스토그램(STATE_PATH, 같은 모델 버전)을 읽거나 홀드아웃을 채점해 만듭니다.
+    - update()로 새로 라벨이 확정된 예측을 계속 누적할 수 있습니다.
+    - 모델이 교체되면 이전 버전의 누적값은 버립니다.
+    """
+    def __init__(self, model_name: str = RISK_MODEL, bins: int = DEFAULT_BINS, state_path: str = STATE_PATH,
+                 performances: str = HOLDOUT_PERFORMANCES, sales: str = HOLDOUT_SALES):
+        self.model_name = model_name
+        self.bins = bins
+        self.state_path = state_path
+        self.performances = performances
+        self.sales = sales
+        self._histogram = None
+        self._version = None
+        self._source = None
+        self._lock = threading.Lock()
+
+    def _build(self, version: str) -> ScoreHistogram:
+        if self.state_path and os.path.exists(self.state_path):
+            histogram, meta = ScoreHistogram.load(self.state_path)
+            if meta.get("model_version") == version:
+                self._source = self.state_path
+                return histogram
+            logger.warning(f"저장된 ROC/PR 히스토그램의 모델 버전이 다릅니다: {meta.get('model_version')} != {version}")
+        if not (os.path.exists(self.performances) and os.path.exists(self.sales)):
+            raise FileNotFoundError("ROC/PR 평가용 홀드아웃 데이터가 없습니다.")
+        start = time.perf_counter()
+        histogram = evaluate_holdout(self.performances, self.sales, self.bins, model_name=self.model_name)
+        self._source = "holdout"
+        logger.info(f"ROC/PR 홀드아웃 평가: {histogram.rows:,} rows, {time.perf_counter() - start:.2f} s")
+        return histogram
+
+    def _current(self) -> ScoreHistogram:
+        get_flat_forest(self.model_name)  # 버전 확인 전에 모델을 로드해 둡니다.
+        version = get_registry().version(self.model_name)
+        if self._histogram is None or self._version != version:
+            self._histogram = self._build(version)
+            self._version = version
+        return self._histogram
+
+    def update(self, y_true, y_proba) -> int:
+        with self._lock:
+            return self._current().update(y_true, y_proba)
+
+    def report(self, points: int = DEFAULT_POINTS) -> dict:
+        with self._lock:
+            histogram = self._current()
+            payload = curve_payload(histogram, points, RISK_CLASS_NAMES)
+            payload.update({"source": self._source, "model_version": self._version})
+            return payload
+
+    def reset(self, model_name: str = None, version: str = None):
+        if model_name not in (None, self.model_name):
+            return
+        with self._lock:
+            self._histogram = None
+            self._version = None
+
+
+_evaluator = None
+_evaluator_lock = threading.Lock()
+
+
+def get_roc_pr_evaluator() -> RocPrEvaluator:
+    global _evaluator
+    if _evaluator is None:
+        with _evaluator_lock:
+            if _evaluator is None:
+                _evaluator = RocPrEvaluator()
+                get_registry().add_listener(_evaluator.reset)
+    return _evaluator
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="티켓 위험 모델 ROC/PR 스트리밍 평가")
+    parser.add_argument("--performances", default=HOLDOUT_PERFORMANCES, help="performance_tb (홀드아웃 평가)")
+    parser.add_argument("--sales", default=HOLDOUT_SALES, help="sales_tb (홀드아웃 평가)")
+    parser.add_argument("--scores", help="예측 결과 파일 (json/jsonl/csv/parquet 또는 sql:<쿼리>), 지정 시 홀드아웃 대신 사용")
+    parser.add_argument("--label-column", default="actual_risk")
+    parser.add_argument("--proba-columns", default=",".join(f"proba_{cls}" for cls in RISK_CLASSES),
+                        help="클래스 0, 1, 2 순서의 확률 컬럼 (쉼표 구분)")
+    parser.add_argument("--bins", type=int, default=DEFAULT_BINS)
+    parser.add_argument("--points", type=int, default=DEFAULT_POINTS)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--state", help="히스토그램 저장 경로 (.npz, API의 ML_ROC_PR_STATE로 사용)")
+    parser.add_argument("--output", help="ROC/PR JSON 경로 (없으면 표준 출력)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    if args.scores:
+        histogram = evaluate_scores(args.scores, args.label_column, args.proba_columns.split(","),
+                                    args.bins, args.chunk_size)
+    else:
+        histogram = evaluate_holdout(args.performances, args.sales, args.bins, args.chunk_size)
+    version = get_registry().version(RISK_MODEL) if not args.scores else None
+    if args.state:
+        histogram.save(args.state, model_version=version)
+    payload = curve_payload(histogram, args.points, RISK_CLASS_NAMES)
+    payload["model_version"] = version
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    print(f"완료: {histogram.rows:,} rows, {time.perf_counter() - start:.2f} s", file=sys.stderr, flush=True)
+
+
+if __name__ == "__main__":
+    main()
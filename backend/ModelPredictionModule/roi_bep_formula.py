@@ -0,0 +1,200 @@
+# backend/ModelPredictionModule/roi_bep_formula.py
+#
+# ROI/BEP 계산식 (모델 없이 정확한 값)
+# roi_bep_data.json의 ROI/BEP는 아래 식으로 정해지는 값이므로, 입력이 모두 있으면 모델 대신 배열 연산으로 바로 계산합니다.
+#   고정비 = production_cost + marketing_budget
+#   매출 = ticket_price x accumulated_sales,  변동비 = variable_cost_rate x 매출
+#   ROI = (매출 - 총비용) / 총비용,  BEP(손익분기 관객 수) = 고정비 / (ticket_price x (1 - variable_cost_rate))
+# - 포트폴리오(공연 P개) x 시나리오 S개를 (P, S) 배열 한 번으로 계산합니다.
+# - deviation()은 같은 입력에서 xgb_reg_roi_bep_* 모델 예측이 계산식과 얼마나 다른지 요약합니다.
+#
+#   cd backend
+#   python -m ModelPredictionModule.roi_bep_formula
+
+import os
+import sys
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.bulk_score import load_catalog, prepare_rows
+
+logger = logging.getLogger("roi_bep_formula")
+
+FORMULA_COLUMNS = ["production_cost", "marketing_budget", "ticket_price", "variable_cost_rate", "accumulated_sales"]
+OUTPUT_COLUMNS = ["revenue", "fixed_cost", "variable_cost", "total_cost", "profit", "roi", "bep"]
+TARGETS = ["roi", "bep"]
+
+# 포트폴리오 계산 최대 셀 수 (공연 수 x 시나리오 수)
+MAX_CELLS = int(os.getenv("ML_ROI_FORMULA_MAX_CELLS", "5000000"))
+
+_PUBLIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public"))
+# 편차 보고서 기본 데이터: 공연 카탈로그 + 공연별 누적 판매량(roi_bep_data)
+REFERENCE_PERFORMANCES = os.getenv("ML_ROI_FORMULA_PERFORMANCES", os.path.join(_PUBLIC_DIR, "performance_tb.json"))
+REFERENCE_SALES = os.getenv("ML_ROI_FORMULA_SALES", os.path.join(_PUBLIC_DIR, "roi_bep_data.json"))
+
+
+def roi_bep(production_cost, marketing_budget, ticket_price, variable_cost_rate, accumulated_sales) -> dict:
+    """
+    입력 배열(브로드캐스트 가능) -> OUTPUT_COLUMNS 배열 dict
+    총비용이 0이면 ROI, 공헌이익(가격 x (1 - 변동비율))이 0 이하이면 BEP는 NaN입니다.
+    """
+    price = np.asarray(ticket_price, dtype=np.float64)
+    rate = np.asarray(variable_cost_rate, dtype=np.float64)
+    fixed_cost = np.asarray(production_cost, dtype=np.float64) + np.asarray(marketing_budget, dtype=np.float64)
+    revenue = price * np.asarray(accumulated_sales, dtype=np.float64)
+    variable_cost = rate * revenue
+    total_cost = fixed_cost + variable_cost
+    profit = revenue - total_cost
+    margin = price * (1.0 - rate)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(total_cost > 0, profit / total_cost, np.nan)
+        bep = np.where(margin > 0, fixed_cost / margin, np.nan)
+    return {"revenue": revenue, "fixed_cost": fixed_cost, "variable_cost": variable_cost,
+            "total_cost": total_cost, "profit": profit, "roi": roi, "bep": bep}
+
+
+def input_arrays(input_data: list) -> dict:
+    """
+    요청 payload(dict 리스트) -> 계산식 입력 컬럼별 float64 배열
+    """
+    missing = [col for col in FORMULA_COLUMNS if any(row.get(col) is None for row in input_data)]
+    if missing:
+        raise ValueError(f"columns are missing: {missing}")
+    return {col: np.fromiter((row[col] for row in input_data), dtype=np.float64, count=len(input_data))
+            for col in FORMULA_COLUMNS}
+
+
+def predict_rows(input_data: list) -> np.ndarray:
+    """
+    xgb_reg_roi_bep_* 모델과 같은 형식의 (n, 2) [roi, bep] 배열
+    """
+    result = roi_bep(**input_arrays(input_data))
+    return np.column_stack([result[target] for target in TARGETS])
+
+
+def detail(row: dict) -> dict:
+    """
+    입력 1건의 손익 내역 (응답의 roi_bep_detail), 입력이 빠져 계산할 수 없는 항목은 None
+    """
+    result = roi_bep(**{col: np.nan if row.get(col) is None else row[col] for col in FORMULA_COLUMNS})
+    number = lambda value: None if np.isnan(value) else float(value)
+    return {
+        "total_revenue": number(result["revenue"]),
+        "total_cost": number(result["total_cost"]),
+        "fixed_cost": number(result["fixed_cost"]),
+        "variable_cost_rate": number(np.float64(row.get("variable_cost_rate", np.nan))),
+    }
+
+
+def json_list(values: np.ndarray) -> list:
+    # NaN(계산 불가)은 JSON null로 내보냅니다.
+    return np.where(np.isnan(values), None, values).tolist() if np.isnan(values).any() else values.tolist()
+
+
+def portfolio(performances: list, scenarios: list = None, include_rows: bool = False) -> dict:
+    """
+    공연 P개 x 시나리오 S개 손익
+    scenarios: [{"name": ..., "set": {컬럼: 값}, "scale": {컬럼: 배수}}, ...]
+      set은 모든 공연의 값을 바꾸고, scale은 공연별 값에 곱합니다. (없으면 현재 값 그대로인 시나리오 1개)
+    반환: 시나리오별 포트폴리오 합계/ROI/흑자 공연 수, include_rows=True 이면 (P, S) 공연별 값
+    """
+    scenarios = scenarios or [{"name": "base"}]
+    if len(performances) * len(scenarios) > MAX_CELLS:
+        raise ValueError(f"공연 수 x 시나리오 수는 {MAX_CELLS:,} 이하여야 합니다.")
+    base = input_arrays(performances)
+    values = {col: np.full(len(scenarios), np.nan) for col in FORMULA_COLUMNS}
+    scales = {col: np.ones(len(scenarios)) for col in FORMULA_COLUMNS}
+    for s, scenario in enumerate(scenarios):
+        for kind, target in (("set", values), ("scale", scales)):
+            for col, value in (scenario.get(kind) or {}).items():
+                if col not in FORMULA_COLUMNS:
+                    raise ValueError(f"{col}: 시나리오에서 바꿀 수 없는 변수입니다. (가능: {FORMULA_COLUMNS})")
+                target[col][s] = value
+    inputs = {col: np.where(np.isnan(values[col])[None, :], base[col][:, None] * scales[col][None, :],
+                            values[col][None, :])
+              for col in FORMULA_COLUMNS}
+    result = roi_bep(**inputs)
+
+    revenue, total_cost = result["revenue"].sum(axis=0), result["total_cost"].sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        portfolio_roi = np.where(total_cost > 0, (revenue - total_cost) / total_cost, np.nan)
+    all_nan = np.isnan(result["roi"]).all(axis=0)
+    roi = np.where(np.isnan(result["roi"]), 0.0, result["roi"])
+    counts = (~np.isnan(result["roi"])).sum(axis=0)
+    payload = {
+        "performances": len(performances),
+        "scenarios": [scenario.get("name") or f"scenario_{s + 1}" for s, scenario in enumerate(scenarios)],
+        "summary": {
+            "total_revenue": revenue.tolist(),
+            "total_cost": total_cost.tolist(),
+            "total_profit": (revenue - total_cost).tolist(),
+            "portfolio_roi": json_list(portfolio_roi),
+            "mean_roi": json_list(np.where(all_nan, np.nan, roi.sum(axis=0) / np.maximum(counts, 1))),
+            "profitable_count": (result["profit"] >= 0).sum(axis=0).tolist(),
+        },
+    }
+    if include_rows:
+        payload["rows"] = {col: [json_list(row) for row in result[col]] for col in OUTPUT_COLUMNS}
+    return payload
+
+
+def deviation(preds: np.ndarray, formula: np.ndarray, top: int = 5) -> dict:
+    """
+    모델 예측 (n, 2)와 계산식 (n, 2)의 타깃별 차이 요약
+    상대오차는 계산식 값이 0이 아닌 행만 사용하고, worst_rows는 상대오차가 가장 큰 행 번호입니다.
+    """
+    preds = np.asarray(preds, dtype=np.float64).reshape(len(formula), -1)
+    report = {"rows": int(len(formula))}
+    for j, target in enumerate(TARGETS):
+        valid = ~np.isnan(formula[:, j])
+        error = preds[valid, j] - formula[valid, j]
+        if not len(error):
+            report[target] = {"rows": 0}
+            continue
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.abs(error) / np.abs(formula[valid, j])
+        relative = np.where(np.isfinite(relative), relative, np.nan)
+        order = np.argsort(-np.nan_to_num(relative, nan=-1.0))[:top]
+        report[target] = {
+            "rows": int(valid.sum()),
+            "mae": float(np.abs(error).mean()),
+            "rmse": float(np.sqrt((error ** 2).mean())),
+            "bias": float(error.mean()),
+            "max_abs_error": float(np.abs(error).max()),
+            "median_relative_error": None if np.isnan(relative).all() else float(np.nanmedian(relative)),
+            "worst_rows": np.flatnonzero(valid)[order].tolist(),
+        }
+    return report
+
+
+def reference_rows(performances: str = REFERENCE_PERFORMANCES, sales: str = REFERENCE_SALES) -> list:
+    """
+    편차 보고서 기본 입력: 공연 카탈로그 속성 + 공연별 누적 판매량 (모델 입력 형식)
+    """
+    if not (os.path.exists(performances) and os.path.exists(sales)):
+        raise FileNotFoundError("ROI/BEP 편차 보고서용 데이터가 없습니다.")
+    catalog = load_catalog(performances)
+    with open(sales, encoding="utf-8") as f:
+        frame = pd.DataFrame(json.load(f))
+    frame = frame[frame["performance_id"].isin(catalog)][["performance_id", "accumulated_sales"]]
+    rows = prepare_rows(frame, catalog)
+    return [{key: row.get(key) for key in ["performance_id", "capacity", "duration"] + FORMULA_COLUMNS}
+            for row in rows]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    rows = reference_rows()
+    with open(REFERENCE_SALES, encoding="utf-8") as f:
+        expected = pd.DataFrame(json.load(f)).set_index("performance_id").loc[[row["performance_id"] for row in rows]]
+    computed = predict_rows(rows)
+    print(json.dumps({
+        "rows": len(rows),
+        "max_roi_error": float(np.nanmax(np.abs(computed[:, 0] - expected["roi"].to_numpy()))),
+        "max_bep_relative_error": float(np.nanmax(np.abs(computed[:, 1] / expected["bep"].to_numpy() - 1))),
+    }, indent=2))
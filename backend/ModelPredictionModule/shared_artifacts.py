@@ -0,0 +1,94 @@
+# backend/ModelPredictionModule/shared_artifacts.py
+#
+# 모델 공유 형식 내보내기
+# pkl 모델의 큰 수치 배열을 models/shared/<모델 이름>/ 에 배열별 .npy + manifest.json으로 저장합니다.
+# 서버/추론 워커 프로세스는 pkl을 unpickle하지 않고 이 배열을 읽기 전용 메모리맵으로 열기 때문에,
+# 워커가 몇 개든 같은 파일의 페이지 캐시를 함께 사용합니다.
+# - XGBoost: 펼친 트리 (xgb_native.FlatXGBModel)
+# - RandomForest: 펼친 포레스트 (forest_evaluator.FlatForest)
+# - KMeans: 표준화 파라미터 + 중심점 (학습 데이터 라벨 labels_ 제외)
+# pkl이 다시 배포되면(내용 해시가 다르면) 내보낸 파일은 무시하고 pkl을 사용하므로, 배포 후 다시 내보내면 됩니다.
+#
+#   cd backend
+#   python -m ModelPredictionModule.shared_artifacts
+#   python -m ModelPredictionModule.shared_artifacts kmeans_audience_seg
+
+import os
+import sys
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .model_registry import SHARED_DIR, DEFAULT_PRELOAD_MODELS, get_registry, write_shared, read_shared
+from .xgb_native import NativeXGBModel, FlatXGBModel, pipeline_boosters, sample_rows, verify
+from .forest_evaluator import FlatForest, pipeline_forest
+from .audience_segmentation import CentroidAssigner, SEGMENT_MODEL
+
+logger = logging.getLogger("shared_artifacts")
+
+SHARED_MODELS = DEFAULT_PRELOAD_MODELS + [SEGMENT_MODEL]
+
+
+def flatten(pipeline) -> tuple:
+    """
+    pkl 파이프라인 -> (공유 형식 종류, 공유 형식 모델)
+    """
+    if pipeline_boosters(pipeline) is not None:
+        return "trees", FlatXGBModel.from_native(NativeXGBModel.from_pipeline(pipeline))
+    if pipeline_forest(pipeline) is not None:
+        return "forest", FlatForest.from_pipeline(pipeline)
+    if hasattr(pipeline, "steps") and hasattr(pipeline.steps[-1][1], "cluster_centers_"):
+        return "centroids", CentroidAssigner.from_pipeline(pipeline)
+    raise ValueError("공유 형식을 지원하지 않는 모델입니다. (XGBoost, RandomForest, KMeans)")
+
+
+def _mismatch(kind: str, model_name: str, shared, pipeline, n: int = 1000) -> int:
+    """
+    메모리맵으로 다시 연 모델의 예측이 pkl 파이프라인과 같은지 확인합니다. (불일치 행 수 반환)
+    """
+    if kind == "trees":
+        return verify(model_name, shared, pipeline, n)
+    if kind == "forest":
+        rows = sample_rows(shared.encoder, n)
+        expected = pipeline.predict_proba(pd.DataFrame(rows))
+        return int((expected != shared.predict_rows(rows)).any(axis=1).sum())
+    rng = np.random.default_rng(0)
+    X = shared.mean + shared.scale * rng.normal(scale=2.0, size=(n, len(shared.features)))
+    expected = pipeline.predict(pd.DataFrame(X, columns=shared.features))
+    return int((expected != shared.assign(X)[0]).sum())
+
+
+def export_shared(model_name: str, shared_dir: str = SHARED_DIR) -> dict:
+    """
+    pkl을 공유 형식으로 내보내고, 메모리맵으로 다시 열어 pkl과 예측이 일치하는지 검증합니다.
+    """
+    registry = get_registry()
+    pipeline = registry.get(model_name)
+    source = registry.model_path(model_name)
+    kind, model = flatten(pipeline)
+    arrays, params = model.to_shared()
+    manifest_path = write_shared(model_name, kind, arrays, params, source, shared_dir)
+
+    shared = read_shared(model_name, kind, shared_dir)
+    if shared is None:
+        raise ValueError(f"{model_name}: 내보낸 공유 형식을 다시 열 수 없습니다. (ML_SHARED_MODELS 확인)")
+    reloaded = type(model).from_shared(shared[0], shared[1]["params"])
+    mismatch = _mismatch(kind, model_name, reloaded, pipeline)
+    if mismatch:
+        raise ValueError(f"{model_name}: 공유 형식 예측이 pkl과 다릅니다. (불일치 {mismatch}건)")
+    return {
+        "model_name": model_name,
+        "kind": kind,
+        "manifest": manifest_path,
+        "version": shared[1]["source_version"],
+        "pkl_bytes": os.path.getsize(source),
+        "shared_bytes": int(sum(array.nbytes for array in shared[0].values())),
+        "verified": True,
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for name in sys.argv[1:] or SHARED_MODELS:
+        print(export_shared(name))
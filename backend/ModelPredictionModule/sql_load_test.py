@@ -0,0 +1,115 @@
+# backend/ModelPredictionModule/sql_load_test.py
+#
+# DB 연결 계층 부하 테스트 (오프라인)
+# frontend/public의 JSON 데이터로 로컬 SQLite DB(dbo.*_tb 테이블)를 만들고,
+# execute_query_async를 동시에 여러 건 실행해 지연 시간 분포와 연결 풀 상태를 출력합니다.
+#
+#   cd backend
+#   python -m ModelPredictionModule.sql_load_test --requests 2000 --concurrency 64
+#   AZURE_SQL_URL=sqlite:///stats.db python -m ModelPredictionModule.sql_load_test --seed-only
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_PUBLIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public"))
+
+# 로컬 DB 테이블 -> frontend/public 원본 JSON (컬럼 이름 변경)
+LOCAL_TABLES = {
+    "genre_stats_tb": [("장르별_통계.json", {}, {})],
+    "region_stats_tb": [("지역별_통계.json", {}, {})],
+    "facility_stats_tb": [
+        (f"공연시설_From{year}.json",
+         {"scale": "규모", "performance_count": "공연건수", "total_ticket_sales": "총티켓판매수"}, {"연도": year})
+        for year in (2023, 2024)
+    ],
+    "performance_tb": [("performance_tb.json", {}, {})],
+    "sales_tb": [("sales_tb.json", {}, {})],
+}
+
+QUERIES = [
+    "SELECT * FROM dbo.genre_stats_tb;",
+    "SELECT * FROM dbo.region_stats_tb;",
+    "SELECT * FROM dbo.facility_stats_tb;",
+    "SELECT performance_id, SUM(daily_sales) AS daily_sales FROM dbo.sales_tb GROUP BY performance_id;",
+]
+
+
+def local_frames(public_dir: str = _PUBLIC_DIR) -> dict:
+    frames = {}
+    for table, sources in LOCAL_TABLES.items():
+        parts = []
+        for file_name, rename, constants in sources:
+            with open(os.path.join(public_dir, file_name), encoding="utf-8") as f:
+                frame = pd.DataFrame(json.load(f)).rename(columns=rename)
+            for col, value in constants.items():
+                frame[col] = value
+            parts.append(frame)
+        frames[table] = pd.concat(parts, ignore_index=True)
+    return frames
+
+
+def seed(public_dir: str = _PUBLIC_DIR):
+    from AzureServiceModule.AzureSQLClient import load_local_tables
+    frames = local_frames(public_dir)
+    load_local_tables(frames)
+    return {table: len(frame) for table, frame in frames.items()}
+
+
+async def run(requests: int, concurrency: int, timeout: float) -> dict:
+    from AzureServiceModule.AzureSQLClient import execute_query_async, pool_status
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await execute_query_async(QUERIES[i % len(QUERIES)], timeout=timeout)
+                latencies.append((time.perf_counter() - start) * 1000)
+            except Exception:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = np.asarray(latencies)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_qps": round(requests / elapsed, 1),
+        "latency_ms": {f"p{q}": round(float(np.percentile(latencies, q)), 2) for q in (50, 90, 99)}
+        if len(latencies) else {},
+        "pool": pool_status(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DB 연결 계층 오프라인 부하 테스트")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--seed-only", action="store_true", help="로컬 DB 테이블만 만들고 종료")
+    args = parser.parse_args(argv)
+
+    # AZURE_SQL_URL이 없으면 임시 SQLite 파일 사용 (Azure SQL에는 부하를 주지 않음)
+    if not os.getenv("AZURE_SQL_URL"):
+        os.environ["AZURE_SQL_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "load_test.db")
+    print(json.dumps({"url": os.environ["AZURE_SQL_URL"], "tables": seed()}, ensure_ascii=False))
+    if not args.seed_only:
+        print(json.dumps(asyncio.run(run(args.requests, args.concurrency, args.timeout)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
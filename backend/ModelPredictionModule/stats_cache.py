@@ -0,0 +1,301 @@
+# backend/ModelPredictionModule/stats_cache.py
+#
+# 집계 통계 캐시 (/genre_stats, /regional_stats, /venue_scale_stats)
+# DB 집계(get_*_stats_db) 결과를 메모리에 두고 응답합니다.
+# - TTL 안: 캐시된 값 그대로
+# - TTL이 지난 뒤 MAX_STALE까지: 이전 값을 바로 응답하고 백그라운드에서 다시 집계 (stale-while-revalidate)
+# - 값이 없거나 너무 오래됨: 집계를 기다립니다. 동시에 들어온 요청은 같은 집계 1건을 함께 기다립니다. (single-flight)
+# - 백그라운드 갱신 스레드가 REFRESH_INTERVAL마다 모든 통계를 다시 집계하므로 보통 요청은 DB를 기다리지 않습니다.
+# - 응답 본문(JSON 바이트) 해시를 ETag로, 내용이 마지막으로 바뀐 시각을 Last-Modified로 씁니다.
+#   다시 집계해도 내용이 같으면 둘 다 그대로라 프론트엔드는 304 Not Modified를 받습니다.
+# - 집계가 실패하면 RETRY_INTERVAL 동안 다시 시도하지 않고 이전 값으로 응답합니다.
+#   이전 값도 없으면 더미 집계(get_*_stats)로 응답합니다. (ML_STATS_FALLBACK=0 이면 오류)
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from email.utils import formatdate, parsedate_to_datetime
+
+from .analysis_module import (
+    get_genre_stats_db,
+    get_regional_stats_db,
+    get_venue_scale_stats_db,
+    get_genre_stats,
+    get_regional_stats,
+    get_venue_scale_stats,
+)
+
+logger = logging.getLogger("stats_cache")
+
+STATS_TTL = float(os.getenv("ML_STATS_TTL", "300"))                 # 이 시간(초) 동안은 다시 집계하지 않음
+STATS_MAX_STALE = float(os.getenv("ML_STATS_MAX_STALE", "86400"))   # TTL 이후 이전 값을 바로 응답하는 최대 시간(초)
+REFRESH_INTERVAL = float(os.getenv("ML_STATS_REFRESH_INTERVAL", str(STATS_TTL)))  # 0이면 백그라운드 갱신 안 함
+RETRY_INTERVAL = float(os.getenv("ML_STATS_RETRY_INTERVAL", "30"))  # 집계 실패 후 다시 시도하기까지(초)
+MISS_WAIT = float(os.getenv("ML_STATS_MISS_WAIT", "5"))             # 대체 값이 있을 때 집계를 기다리는 최대 시간(초)
+FALLBACK = os.getenv("ML_STATS_FALLBACK", "1") != "0"
+
+LOADERS = {
+    "genre_stats": get_genre_stats_db,
+    "regional_stats": get_regional_stats_db,
+    "venue_scale_stats": get_venue_scale_stats_db,
+}
+FALLBACKS = {
+    "genre_stats": get_genre_stats,
+    "regional_stats": get_regional_stats,
+    "venue_scale_stats": get_venue_scale_stats,
+}
+
+
+class StatsEntry:
+    """
+    집계 결과 1건: 응답 dict, 직렬화된 본문, ETag, Last-Modified
+    """
+    __slots__ = ("name", "value", "source", "body", "etag", "loaded", "last_modified")
+
+    def __init__(self, name: str, value: dict, source: str, previous=None):
+        self.name = name
+        self.value = value
+        self.source = source  # db / fallback
+        self.body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = '"' + hashlib.sha1(self.body).hexdigest()[:20] + '"'
+        self.loaded = time.monotonic()
+        # 내용이 그대로면 마지막 변경 시각도 그대로 둡니다.
+        if previous is not None and previous.etag == self.etag:
+            self.last_modified = previous.last_modified
+        else:
+            self.last_modified = int(time.time())
+
+    def age(self) -> float:
+        return time.monotonic() - self.loaded
+
+    def headers(self) -> dict:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": "no-cache",
+            "X-Stats-Source": self.source,
+        }
+
+    def not_modified(self, if_none_match: str = None, if_modified_since: str = None) -> bool:
+        """
+        조건부 요청 헤더 확인 (If-None-Match가 있으면 If-Modified-Since는 보지 않음)
+        """
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or any(tag.removeprefix("W/") == self.etag for tag in tags)
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified <= since
+        return False
+
+
+class StatsCache:
+    """
+    통계 이름 -> StatsEntry 캐시 + 백그라운드 갱신
+    """
+    def __init__(self, loaders: dict = LOADERS, fallbacks: dict = None, ttl: float = STATS_TTL,
+                 max_stale: float = STATS_MAX_STALE, interval: float = REFRESH_INTERVAL,
+                 retry_interval: float = RETRY_INTERVAL, miss_wait: float = MISS_WAIT):
+        self.loaders = dict(loaders)
+        self.fallbacks = dict(fallbacks or {})
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.miss_wait = miss_wait
+        self._entries = {}
+        self._inflight = {}  # 통계 이름 -> 진행 중인 집계 Future
+        self._failed = {}    # 통계 이름 -> (실패 시각, 예외)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.fallback_hits = 0
+
+    def _check(self, name: str):
+        if name not in self.loaders:
+            raise KeyError(f"{name}: 알 수 없는 통계입니다. (가능: {list(self.loaders)})")
+
+    def _recent_failure(self, name: str):
+        failed = self._failed.get(name)
+        if failed is not None and time.monotonic() - failed[0] < self.retry_interval:
+            return failed[1]
+        return None
+
+    def _load(self, name: str, future: Future):
+        start = time.perf_counter()
+        try:
+            value = self.loaders[name]()
+            with self._lock:
+                entry = StatsEntry(name, value, "db", self._entries.get(name))
+                self._entries[name] = entry
+                self._failed.pop(name, None)
+                self._inflight.pop(name, None)
+                self.refreshes += 1
+        except BaseException as e:
+            with self._lock:
+                self._failed[name] = (time.monotonic(), e)
+                self._inflight.pop(name, None)
+                self.failures += 1
+            logger.error(f"통계 집계 실패: {name} - {e}")
+            future.set_exception(e)
+            return
+        logger.info(f"통계 집계: {name} {(time.perf_counter() - start) * 1000:.1f} ms (ETag {entry.etag})")
+        future.set_result(entry)
+
+    def refresh(self, name: str) -> Future:
+        """
+        백그라운드 집계를 시작하고 Future를 반환합니다. (이미 진행 중이면 그 Future)
+        """
+        self._check(name)
+        with self._lock:
+            future = self._inflight.get(name)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._inflight[name] = Future()
+        threading.Thread(target=self._load, args=(name, future), name=f"stats-{name}", daemon=True).start()
+        return future
+
+    def cached(self, name: str):
+        """
+        기다리지 않고 응답할 수 있는 값 (TTL 안 / 오래됐지만 MAX_STALE 안), 없으면 None
+        오래된 값이면 백그라운드 집계를 시작합니다.
+        """
+        self._check(name)
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        age = entry.age()
+        if entry.source == "db" and age < self.ttl:
+            self.hits += 1
+            return entry
+        if entry.source != "db" or age < self.ttl + self.max_stale:
+            self.stale_hits += 1
+            if self._recent_failure(name) is None:
+                self.refresh(name)
+            return entry
+        return None
+
+    def get(self, name: str) -> StatsEntry:
+        """
+        캐시된 값, 없으면 집계를 기다립니다. (요청 스레드에서 호출, 이벤트 루프에서는 asyncio.to_thread로)
+        집계가 실패하거나 MISS_WAIT 안에 끝나지 않으면 이전 값 -> 더미 값 순으로 응답하고, 둘 다 없으면 예외
+        """
+        entry = self.cached(name)
+        if entry is not None:
+            return entry
+        self.misses += 1
+        entry = self._entries.get(name)
+        error = self._recent_failure(name)
+        if error is None:
+            # 대신 응답할 값이 없으면 쿼리 제한 시간까지 기다립니다.
+            wait = self.miss_wait if (entry is not None or name in self.fallbacks) else None
+            try:
+                return self.refresh(name).result(timeout=wait)
+            except FutureTimeoutError:
+                error = TimeoutError(f"{name}: 집계가 {wait}초 안에 끝나지 않았습니다.")
+                logger.warning(f"{error} (이전 값 또는 더미 값으로 응답)")
+            except Exception as e:
+                error = e
+        if entry is not None:
+            return entry
+        if name in self.fallbacks:
+            return self._fallback(name)
+        raise error
+
+    def _fallback(self, name: str) -> StatsEntry:
+        entry = StatsEntry(name, self.fallbacks[name](), "fallback")
+        with self._lock:
+            # 그 사이 DB 집계가 끝났으면 그 값을 씁니다.
+            current = self._entries.get(name)
+            if current is not None:
+                return current
+            self._entries[name] = entry
+            self.fallback_hits += 1
+        return entry
+
+    def refresh_all(self, wait: bool = False) -> dict:
+        futures = {name: self.refresh(name) for name in self.loaders if self._recent_failure(name) is None}
+        if not wait:
+            return futures
+        for name, future in futures.items():
+            try:
+                future.result()
+            except Exception:
+                pass
+        return futures
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh_all(wait=True)
+            except Exception as e:
+                logger.error(f"통계 갱신 실패: {e}")
+
+    def start(self):
+        """
+        바로 한 번 집계(워밍업)하고, REFRESH_INTERVAL마다 다시 집계하는 스레드를 시작합니다.
+        """
+        if self._thread is not None:
+            return
+        self.refresh_all()
+        if self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stats-refresher", daemon=True)
+        self._thread.start()
+        logger.info(f"통계 캐시 갱신 시작 ({list(self.loaders)}, {self.interval}s)")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._thread is not None,
+            "ttl": self.ttl,
+            "max_stale": self.max_stale,
+            "interval": self.interval,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "fallback_hits": self.fallback_hits,
+            "entries": {
+                name: {"source": entry.source, "etag": entry.etag, "age": round(entry.age(), 3),
+                       "last_modified": formatdate(entry.last_modified, usegmt=True), "bytes": len(entry.body)}
+                for name, entry in list(self._entries.items())
+            },
+            "errors": {name: str(error) for name, (_, error) in list(self._failed.items())},
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_stats_cache() -> StatsCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = StatsCache(fallbacks=FALLBACKS if FALLBACK else None)
+    return _cache
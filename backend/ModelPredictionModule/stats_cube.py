@@ -0,0 +1,375 @@
+# backend/ModelPredictionModule/stats_cube.py
+#
+# 다차원 집계 큐브 (/aggregate)
+# 데이터 소스별로 차원(연도, 월, 장르, 지역, 공연장 규모) x 측정값을 메모리에 올려 두고,
+# 차원 조합(부분집합)마다 미리 집계(cuboid)해 두었다가 요청이 오면 SQL 없이 응답합니다.
+# - 차원 값은 정렬된 코드로 바꿔 저장하고, 요청 차원 + 필터 차원을 담은 가장 작은 cuboid에서
+#   필터 -> 요청 차원으로 다시 합산합니다. (numpy, 보통 1 ms 미만)
+# - 소스
+#   sales: 공연(performance_tb) + 일별 판매(sales_tb). 판매량/판매액은 판매일, 개막 편수는 공연 시작일 기준 연/월
+#          공연장 규모는 capacity를 공연시설 통계와 같은 구간으로 나눈 값 (0/없음은 "좌석 미상")
+#   genre_stats / regional_stats / venue_scale_stats: 통계 테이블 (stats_queries의 컬럼 매핑, 연도 제한 없음)
+#          다른 행의 합인 행(지역별 통계의 합계, 권역)은 빼고 올립니다. (넣으면 지역을 합칠 때 중복 집계)
+# - 데이터는 스냅샷(stats_snapshot)이 있으면 스냅샷, 없으면 DB에서 읽습니다. (stats_queries.table_frame)
+#   스냅샷 버전이 바뀌거나 CUBE_TTL이 지나면 이전 큐브로 응답하면서 백그라운드에서 다시 만듭니다.
+# - 요청 처리 중에는 큐브를 만들지 않습니다. 아직 없으면 백그라운드 생성을 시작하고 바로 오류(API는 503)를 냅니다.
+#   생성이 실패하면 CUBE_RETRY_INTERVAL 동안은 다시 만들지 않습니다.
+
+import os
+import time
+import logging
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .stats_queries import STATS_TABLES, table_frame
+from .stats_snapshot import get_snapshot_store
+
+logger = logging.getLogger("stats_cube")
+
+CUBE_TTL = float(os.getenv("ML_CUBE_TTL", "300"))  # 이 시간(초)이 지나면 다시 만듦 (스냅샷 버전이 바뀌어도)
+CUBE_RETRY_INTERVAL = float(os.getenv("ML_CUBE_RETRY_INTERVAL", "30"))  # 생성 실패 후 다시 시도하기까지(초)
+
+DIMENSIONS = ["year", "month", "genre", "region", "venue_scale"]
+# 통계 테이블 그룹 키(API 필드) -> 큐브 차원
+STATS_DIMENSIONS = {"genre": "genre", "region": "region", "year": "year", "scale": "venue_scale"}
+# 통계 테이블에서 다른 행의 합인 행: 소스 -> {차원: 값 목록}
+# (지역별 통계: 합계 = 모든 지역, 경기/인천 = 경기 + 인천, 경상도 = 경남 + 경북 + 대구 + 부산 + 울산,
+#  전라도 = 광주 + 전남 + 전북, 충청도 = 대전 + 세종 + 충남 + 충북)
+NON_ADDITIVE_ROWS = {
+    "regional_stats": {"region": ["합계", "경기/인천", "경상도", "전라도", "충청도"]},
+}
+# 공연장 규모 구간 (공연시설 통계와 같은 이름), capacity가 0/없으면 UNKNOWN_SCALE
+VENUE_SCALES = [
+    (1, "1~300석 미만"),
+    (300, "300~500석 미만"),
+    (500, "500~1,000석 미만"),
+    (1000, "1,000~5,000석 미만"),
+    (5000, "5,000~10,000석 미만"),
+    (10000, "10,000석 이상"),
+]
+UNKNOWN_SCALE = "좌석 미상"
+
+# 소스 이름 -> 차원, 측정값 (요청에 source가 없으면 이 순서로 차원/측정값을 모두 가진 첫 소스 사용)
+CUBE_SOURCES = {
+    "sales": {
+        "dimensions": DIMENSIONS,
+        "measures": ["opening_count", "ticket_sales", "ticket_revenue"],
+    },
+    **{
+        name: {
+            "dimensions": [STATS_DIMENSIONS[field] for field in spec["keys"].values()],
+            "measures": list(spec["measures"].values()),
+        }
+        for name, spec in STATS_TABLES.items()
+    },
+}
+
+
+def venue_scale(capacity) -> np.ndarray:
+    capacity = pd.to_numeric(pd.Series(capacity), errors="coerce").to_numpy(dtype=np.float64)
+    bounds = np.array([bound for bound, _ in VENUE_SCALES], dtype=np.float64)
+    labels = np.array([UNKNOWN_SCALE] + [label for _, label in VENUE_SCALES], dtype=object)
+    index = np.searchsorted(bounds, np.nan_to_num(capacity, nan=0.0), side="right")
+    return labels[index]
+
+
+def _year_month(dates: pd.Series) -> tuple:
+    dates = pd.to_datetime(dates, errors="coerce")
+    return dates.dt.year.astype("Int64"), dates.dt.month.astype("Int64")
+
+
+def sales_fact() -> pd.DataFrame:
+    """
+    sales 소스 행: 판매 행(판매일 기준) + 공연 행(시작일 기준 개막 1편)
+    """
+    performances = table_frame("dbo.performance_tb",
+                               ["performance_id", "genre", "region", "start_date", "capacity", "ticket_price"])
+    sales = table_frame("dbo.sales_tb", ["performance_id", "date", "daily_sales", "price_avg"])
+    performances = performances.drop_duplicates("performance_id", keep="last")
+    performances["venue_scale"] = venue_scale(performances["capacity"])
+    attrs = performances.set_index("performance_id").reindex(sales["performance_id"])
+
+    daily_sales = pd.to_numeric(sales["daily_sales"], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    price = pd.to_numeric(sales["price_avg"], errors="coerce").to_numpy(dtype=np.float64)
+    price = np.where(np.isnan(price), pd.to_numeric(attrs["ticket_price"], errors="coerce").to_numpy(dtype=np.float64),
+                     price)
+    year, month = _year_month(sales["date"])
+    sales_rows = pd.DataFrame({
+        "year": year.to_numpy(), "month": month.to_numpy(),
+        "genre": attrs["genre"].to_numpy(), "region": attrs["region"].to_numpy(),
+        "venue_scale": attrs["venue_scale"].to_numpy(),
+        "opening_count": 0.0, "ticket_sales": daily_sales, "ticket_revenue": daily_sales * np.nan_to_num(price),
+    })
+    year, month = _year_month(performances["start_date"])
+    opening_rows = pd.DataFrame({
+        "year": year.to_numpy(), "month": month.to_numpy(),
+        "genre": performances["genre"].to_numpy(), "region": performances["region"].to_numpy(),
+        "venue_scale": performances["venue_scale"].to_numpy(),
+        "opening_count": 1.0, "ticket_sales": 0.0, "ticket_revenue": 0.0,
+    })
+    return pd.concat([sales_rows, opening_rows], ignore_index=True)
+
+
+def stats_fact(name: str) -> pd.DataFrame:
+    """
+    통계 테이블 소스 행 (컬럼 이름을 큐브 차원/측정값으로 변경, 합계/권역 행 제외)
+    """
+    spec = STATS_TABLES[name]
+    frame = table_frame(spec["table"], list(spec["keys"]) + list(spec["measures"]))
+    frame = frame.rename(columns={**{col: STATS_DIMENSIONS[field] for col, field in spec["keys"].items()},
+                                  **spec["measures"]})
+    for dim, values in NON_ADDITIVE_ROWS.get(name, {}).items():
+        frame = frame[~frame[dim].isin(values)]
+    return frame.reset_index(drop=True)
+
+
+def _group(codes: np.ndarray, values: dict, radix: tuple) -> tuple:
+    """
+    (행 수, k) 차원 코드 -> 코드 조합별 합계 (조합은 코드 사전순)
+    """
+    if not radix:
+        return np.zeros((1, 0), dtype=np.int64), {m: np.array([v.sum()]) for m, v in values.items()}
+    key = np.ravel_multi_index(tuple(codes.T), radix)
+    unique, inverse = np.unique(key, return_inverse=True)
+    grouped = np.column_stack(np.unravel_index(unique, radix)) if len(unique) else \
+        np.zeros((0, len(radix)), dtype=np.int64)
+    return grouped, {m: np.bincount(inverse, weights=v, minlength=len(unique)) for m, v in values.items()}
+
+
+class Cube:
+    """
+    소스 1개의 큐브: 차원별 값 목록 + 모든 차원 부분집합의 미리 집계한 결과
+    """
+    def __init__(self, name: str, frame: pd.DataFrame, dimensions: list, measures: list):
+        self.name = name
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.rows = len(frame)
+        self.levels = {}
+        self._labels = {}
+        self._codes = {}
+        codes = []
+        for dim in self.dimensions:
+            code, uniques = pd.factorize(frame[dim], sort=True, use_na_sentinel=False)
+            labels = [None if pd.isna(value) else value for value in uniques.tolist()]
+            self.levels[dim] = labels
+            self._labels[dim] = np.array(labels, dtype=object)
+            # 필터 값은 JSON에서 문자열/숫자 어느 쪽으로 와도 같은 값으로 봅니다.
+            self._codes[dim] = {str(label): i for i, label in enumerate(labels)}
+            codes.append(code.astype(np.int64))
+        self._radix = tuple(max(len(self.levels[dim]), 1) for dim in self.dimensions)
+        values = {m: pd.to_numeric(frame[m], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+                  for m in self.measures}
+        self._integer = {m: bool(np.all(v == np.round(v))) for m, v in values.items()}
+
+        base_codes, base_values = _group(np.column_stack(codes) if codes else
+                                         np.zeros((self.rows, 0), dtype=np.int64), values, self._radix)
+        self._cuboids = {}
+        for size in range(len(self.dimensions) + 1):
+            for subset in combinations(range(len(self.dimensions)), size):
+                self._cuboids[subset] = _group(base_codes[:, list(subset)], base_values,
+                                               tuple(self._radix[j] for j in subset))
+
+    def covers(self, dimensions: list, measures: list) -> bool:
+        return set(dimensions) <= set(self.dimensions) and set(measures) <= set(self.measures)
+
+    def query(self, dimensions: list, measures: list = None, filters: dict = None, order_by: str = None,
+              limit: int = None) -> dict:
+        measures = list(measures or self.measures)
+        filters = filters or {}
+        for dim in list(dimensions) + list(filters):
+            if dim not in self.dimensions:
+                raise ValueError(f"{self.name}: 차원은 {self.dimensions} 중에서 고를 수 있습니다. ({dim})")
+        for measure in measures:
+            if measure not in self.measures:
+                raise ValueError(f"{self.name}: 측정값은 {self.measures} 중에서 고를 수 있습니다. ({measure})")
+        if len(set(dimensions)) != len(dimensions):
+            raise ValueError("차원이 중복되었습니다.")
+        if order_by is not None and order_by not in measures:
+            raise ValueError(f"order_by는 요청한 측정값 {measures} 중 하나여야 합니다.")
+
+        # 요청 차원 + 필터 차원을 가진 가장 작은 cuboid
+        subset = tuple(sorted({self.dimensions.index(dim) for dim in list(dimensions) + list(filters)}))
+        codes, values = self._cuboids[subset]
+        values = {m: values[m] for m in measures}
+        mask = None
+        for dim, allowed in filters.items():
+            lookup = self._codes[dim]
+            allowed = [lookup[str(value)] for value in allowed if str(value) in lookup]
+            matched = np.isin(codes[:, subset.index(self.dimensions.index(dim))], allowed)
+            mask = matched if mask is None else mask & matched
+        if mask is not None:
+            codes, values = codes[mask], {m: v[mask] for m, v in values.items()}
+        target = [subset.index(self.dimensions.index(dim)) for dim in dimensions]
+        codes, values = _group(codes[:, target], values, tuple(self._radix[subset[j]] for j in target))
+
+        order = None
+        if order_by is not None:
+            order = np.argsort(-values[order_by], kind="stable")
+        if limit is not None:
+            order = (order if order is not None else np.arange(len(codes)))[:limit]
+        if order is not None:
+            codes, values = codes[order], {m: v[order] for m, v in values.items()}
+
+        data = {dim: self._labels[dim][codes[:, i]].tolist() for i, dim in enumerate(dimensions)}
+        for m in measures:
+            data[m] = values[m].astype(np.int64).tolist() if self._integer[m] else values[m].tolist()
+        return {
+            "source": self.name,
+            "dimensions": list(dimensions),
+            "measures": measures,
+            "filters": filters,
+            "rows": int(len(codes)),
+            "data": data,
+        }
+
+    def schema(self) -> dict:
+        return {"dimensions": self.dimensions, "measures": self.measures, "rows": self.rows,
+                "cuboids": len(self._cuboids), "levels": self.levels}
+
+
+class StatsCubeStore:
+    """
+    소스 이름 -> Cube (요청 스레드에서는 만들어 둔 큐브만 읽고, 다시 만들기는 백그라운드 1건)
+    """
+    def __init__(self, ttl: float = CUBE_TTL, retry_interval: float = CUBE_RETRY_INTERVAL):
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self._cubes = {}
+        self._errors = {}
+        self._failed = None  # 마지막으로 생성에 실패한 시각 (소스 1개라도)
+        self._signature = None
+        self._built = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.builds = 0
+        self.build_ms = None
+        self.queries = 0
+
+    @staticmethod
+    def _build_source(name: str) -> Cube:
+        frame = sales_fact() if name == "sales" else stats_fact(name)
+        spec = CUBE_SOURCES[name]
+        return Cube(name, frame, spec["dimensions"], spec["measures"])
+
+    def build(self) -> dict:
+        """
+        모든 소스의 큐브를 새로 만들어 교체합니다. (실패한 소스는 이전 큐브 유지)
+        """
+        start = time.perf_counter()
+        signature = get_snapshot_store().versions()
+        cubes, errors = dict(self._cubes), {}
+        for name in CUBE_SOURCES:
+            try:
+                cubes[name] = self._build_source(name)
+            except Exception as e:
+                errors[name] = str(e)
+                logger.error(f"큐브 생성 실패 (이전 큐브 유지): {name} - {e}")
+        self._cubes, self._errors = cubes, errors
+        self._signature, self._built = signature, time.monotonic()
+        self._failed = self._built if errors else None
+        self.builds += 1
+        self.build_ms = round((time.perf_counter() - start) * 1000, 3)
+        logger.info(f"집계 큐브 생성: {list(cubes)} {self.build_ms} ms")
+        return cubes
+
+    def _run_refresh(self):
+        try:
+            self.build()
+        except Exception as e:
+            self._failed = time.monotonic()
+            logger.error(f"큐브 생성 실패: {e}")
+        finally:
+            self._refreshing = False
+
+    def _recent_failure(self) -> bool:
+        return self._failed is not None and time.monotonic() - self._failed < self.retry_interval
+
+    def refresh(self, wait: bool = False):
+        """
+        큐브를 다시 만듭니다. wait=False 이면 백그라운드 (이미 진행 중이면 새로 시작하지 않음)
+        """
+        if wait:
+            with self._lock:
+                return self.build()
+        with self._lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+        threading.Thread(target=self._run_refresh, name="stats-cube", daemon=True).start()
+        return None
+
+    def ready(self) -> bool:
+        return bool(self._cubes)
+
+    def cubes(self) -> dict:
+        """
+        만들어 둔 큐브 (없으면 빈 dict), 없거나 오래됐거나 실패한 소스가 있으면 백그라운드 생성을 시작합니다.
+        """
+        if self._recent_failure():
+            return self._cubes
+        if not self._cubes or self._errors or time.monotonic() - self._built > self.ttl \
+                or get_snapshot_store().versions() != self._signature:
+            self.refresh()
+        return self._cubes
+
+    def _ready_cubes(self) -> dict:
+        cubes = self.cubes()
+        if not cubes:
+            errors = f" (마지막 실패: {self._errors})" if self._errors else ""
+            raise RuntimeError(f"집계 큐브를 만드는 중입니다.{errors}")
+        return cubes
+
+    def query(self, dimensions: list = None, measures: list = None, filters: dict = None, source: str = None,
+              order_by: str = None, limit: int = None) -> dict:
+        """
+        source가 없으면 요청 차원(+필터 차원)과 측정값을 모두 가진 첫 소스를 사용합니다.
+        큐브가 아직 없으면 RuntimeError (백그라운드 생성 시작)
+        """
+        dimensions, filters = list(dimensions or []), filters or {}
+        cubes = self._ready_cubes()
+        if source is None:
+            wanted = dimensions + [dim for dim in filters if dim not in dimensions]
+            source = next((name for name, cube in cubes.items() if cube.covers(wanted, measures or [])), None)
+            if source is None:
+                available = {name: CUBE_SOURCES[name] for name in cubes}
+                raise ValueError(f"요청한 차원/측정값을 모두 가진 데이터 소스가 없습니다. (소스: {available})")
+        elif source not in CUBE_SOURCES:
+            raise ValueError(f"source는 {list(CUBE_SOURCES)} 중 하나여야 합니다.")
+        if source not in cubes:
+            raise RuntimeError(f"{source}: 큐브를 만들지 못했습니다. ({self._errors.get(source)})")
+        self.queries += 1
+        return cubes[source].query(dimensions, measures, filters, order_by, limit)
+
+    def schema(self) -> dict:
+        return {name: cube.schema() for name, cube in self._ready_cubes().items()}
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready(),
+            "ttl": self.ttl,
+            "builds": self.builds,
+            "build_ms": self.build_ms,
+            "age": None if self._built is None else round(time.monotonic() - self._built, 3),
+            "retry_interval": self.retry_interval,
+            "snapshot_versions": self._signature,
+            "queries": self.queries,
+            "sources": {name: {"rows": cube.rows, "cuboids": len(cube._cuboids)} for name, cube in self._cubes.items()},
+            "errors": self._errors,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_stats_cube() -> StatsCubeStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StatsCubeStore()
+    return _store
@@ -0,0 +1,147 @@
+# backend/ModelPredictionModule/stats_queries.py
+#
+# 통계 테이블 집계 쿼리 생성
+# 테이블별 컬럼 매핑(DB 한글 컬럼 -> API 필드)으로 필요한 컬럼만 고른 SELECT ... SUM(...) GROUP BY ... 쿼리를 만들어
+# 집계는 DB에서 하고, 결과(그룹 수만큼의 행)만 가져옵니다.
+# - 측정값의 NULL은 0으로 더합니다. 그룹 키가 NULL인 행은 집계에서 제외합니다.
+#   (기존 fillna(0) 후 groupby().sum()은 이 행들을 키 0 그룹으로 묶어 응답에 넣었습니다)
+# - 정렬은 DB 콜레이션에 따라 달라질 수 있으므로, 가져온 결과를 pandas에서 정렬합니다.
+# - 테이블 스냅샷(stats_snapshot)이 있으면 같은 매핑으로 스냅샷(pyarrow Table)에서 집계합니다.
+#   ML_STATS_SOURCE=auto: 스냅샷 -> (없으면) DB,  db: DB -> (DB 오류 시) 스냅샷
+
+import os
+import logging
+
+import pandas as pd
+
+from AzureServiceModule.AzureSQLClient import execute_query
+from .stats_snapshot import get_snapshot_store
+
+logger = logging.getLogger("stats_queries")
+
+STATS_SOURCES = ["auto", "db"]
+STATS_SOURCE = os.getenv("ML_STATS_SOURCE", "auto")
+
+# 통계 이름 -> 테이블, 그룹 키 {DB 컬럼: API 필드}, 측정값 {DB 컬럼: API 필드}, 필터 {DB 컬럼: 허용 값 목록},
+#             키 형 변환 {API 필드: dtype} (DB / 스냅샷 컬럼 형식과 관계없이 응답 형식 고정)
+STATS_TABLES = {
+    "genre_stats": {
+        "table": "dbo.genre_stats_tb",
+        "keys": {"장르": "genre"},
+        "measures": {"개막편수": "performance_count", "관객수": "audience", "매출액": "ticket_revenue"},
+    },
+    "regional_stats": {
+        "table": "dbo.region_stats_tb",
+        "keys": {"지역명": "region"},
+        "measures": {"공연건수": "performance_count", "상연횟수": "show_count",
+                     "총티켓판매수": "total_ticket_sales", "총티켓판매액": "total_ticket_revenue"},
+    },
+    "venue_scale_stats": {
+        "table": "dbo.facility_stats_tb",
+        "keys": {"연도": "year", "규모": "scale"},
+        "measures": {"공연건수": "performance_count", "총티켓판매수": "total_ticket_sales"},
+        "filters": {"연도": [2023, 2024]},
+        "key_types": {"year": "int64"},
+    },
+}
+
+
+def quote(identifier: str) -> str:
+    # 표준 SQL 식별자 따옴표 (SQL Server / SQLite / DuckDB 공통)
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def build_query(spec: dict, filters: dict = None) -> tuple:
+    """
+    컬럼 매핑 -> (쿼리, 파라미터)
+    filters: {DB 컬럼: 허용 값 목록} (spec의 filters보다 우선), 값은 ? 파라미터로 전달합니다.
+    """
+    keys, measures = spec["keys"], spec["measures"]
+    columns = [f"{quote(col)} AS {quote(field)}" for col, field in keys.items()]
+    columns += [f"SUM(COALESCE({quote(col)}, 0)) AS {quote(field)}" for col, field in measures.items()]
+    conditions = [f"{quote(col)} IS NOT NULL" for col in keys]
+    params = []
+    for col, values in {**spec.get("filters", {}), **(filters or {})}.items():
+        values = list(values)
+        if not values:
+            conditions.append("1 = 0")
+            continue
+        conditions.append(f"{quote(col)} IN ({', '.join('?' for _ in values)})")
+        params.extend(values)
+    group_by = ", ".join(quote(col) for col in keys)
+    query = (f"SELECT {', '.join(columns)} FROM {spec['table']} "
+             f"WHERE {' AND '.join(conditions)} GROUP BY {group_by};")
+    return query, params
+
+
+def _finish(df: pd.DataFrame, spec: dict) -> pd.DataFrame:
+    keys, measures = list(spec["keys"].values()), list(spec["measures"].values())
+    df = df[keys + measures]
+    df[measures] = df[measures].fillna(0).astype("int64")
+    for field, dtype in spec.get("key_types", {}).items():
+        df[field] = df[field].astype(dtype)
+    return df.sort_values(by=keys, ignore_index=True)
+
+
+def aggregate_table(table, spec: dict, filters: dict = None) -> pd.DataFrame:
+    """
+    build_query와 같은 집계를 pyarrow Table(스냅샷)에서 실행합니다.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    mask = None
+    conditions = [pc.is_valid(table[col]) for col in spec["keys"]]
+    for col, values in {**spec.get("filters", {}), **(filters or {})}.items():
+        conditions.append(pc.is_in(table[col], value_set=pa.array(list(values), type=table.schema.field(col).type)))
+    for condition in conditions:
+        mask = condition if mask is None else pc.and_(mask, condition)
+    keys = list(spec["keys"])
+    grouped = table.filter(mask).group_by(keys).aggregate([(col, "sum") for col in spec["measures"]])
+    df = grouped.to_pandas()
+    df.columns = [spec["keys"].get(col) or spec["measures"][col[:-len("_sum")]] for col in df.columns]
+    return _finish(df, spec)
+
+
+def stats_frame(name: str, filters: dict = None, source: str = None) -> pd.DataFrame:
+    """
+    통계 이름 -> 집계 결과 DataFrame (API 필드 컬럼, 그룹 키 순 정렬, 측정값은 int)
+    """
+    source = source or STATS_SOURCE
+    if source not in STATS_SOURCES:
+        raise ValueError(f"source는 {STATS_SOURCES} 중 하나여야 합니다.")
+    spec = STATS_TABLES[name]
+    table = get_snapshot_store().table(spec["table"])
+    if source == "auto" and table is not None:
+        return aggregate_table(table, spec, filters)
+    query, params = build_query(spec, filters)
+    try:
+        df = execute_query(query, params=params or None)
+    except Exception as e:
+        if table is None:
+            raise
+        logger.warning(f"DB 집계 실패, 스냅샷으로 집계합니다: {name} - {e}")
+        return aggregate_table(table, spec, filters)
+    return _finish(df, spec)
+
+
+def table_frame(table: str, columns: list, source: str = None) -> pd.DataFrame:
+    """
+    테이블의 지정 컬럼 (집계 전 행), stats_frame과 같은 순서로 스냅샷 / DB에서 가져옵니다.
+    """
+    source = source or STATS_SOURCE
+    if source not in STATS_SOURCES:
+        raise ValueError(f"source는 {STATS_SOURCES} 중 하나여야 합니다.")
+    store = get_snapshot_store()
+    if source == "auto":
+        frame = store.frame(table, columns)
+        if frame is not None:
+            return frame
+    try:
+        return execute_query(f"SELECT {', '.join(quote(col) for col in columns)} FROM {table};")
+    except Exception as e:
+        frame = store.frame(table, columns)
+        if frame is None:
+            raise
+        logger.warning(f"DB 조회 실패, 스냅샷을 사용합니다: {table} - {e}")
+        return frame
@@ -0,0 +1,273 @@
+# backend/ModelPredictionModule/stats_snapshot.py
+#
+# 통계 테이블 컬럼 형식 스냅샷
+# DB 테이블(dbo.*_tb)을 snapshots/<테이블>.<내용 해시>.arrow (Arrow IPC, 또는 .parquet) 로 내보내고
+# manifest.json에 테이블별 버전/행 수/내보낸 시각(exported_at)/내용이 바뀐 시각(updated_at)을 기록합니다.
+# - 서버는 기동 시 manifest의 파일을 메모리맵으로 열고(Arrow IPC는 복사 없이), 통계 집계를 DB 대신 스냅샷에서 합니다.
+#   (stats_queries, ML_STATS_SOURCE=db 이면 DB를 먼저 쓰고 DB 오류 시에만 스냅샷 사용)
+# - manifest가 바뀌면(다시 내보내면) 다음 조회 때 새 파일로 교체합니다. 재시작은 필요 없습니다.
+# - 파일 이름에 내용 해시를 붙이고 manifest를 마지막에 원자적으로 교체하므로, 이전 파일을 열고 있는 프로세스에 영향이 없습니다.
+# - pyarrow가 없으면 스냅샷을 쓰지 않고 DB에서 집계합니다.
+#
+#   cd backend
+#   python -m ModelPredictionModule.stats_snapshot
+#   python -m ModelPredictionModule.stats_snapshot genre_stats_tb region_stats_tb --format parquet
+#   python -m ModelPredictionModule.stats_snapshot --status
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+logger = logging.getLogger("stats_snapshot")
+
+SNAPSHOT_DIR = os.getenv("ML_STATS_SNAPSHOT_DIR", os.path.join(os.path.dirname(__file__), "snapshots"))
+SNAPSHOT_TABLES = ["genre_stats_tb", "region_stats_tb", "facility_stats_tb", "performance_tb", "sales_tb"]
+FORMATS = {"arrow": ".arrow", "parquet": ".parquet"}
+DEFAULT_FORMAT = os.getenv("ML_STATS_SNAPSHOT_FORMAT", "arrow")
+SNAPSHOT_ENABLED = os.getenv("ML_STATS_SNAPSHOT", "1") != "0"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _file_version(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def read_manifest(directory: str = SNAPSHOT_DIR):
+    path = os.path.join(directory, "manifest.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_table(name: str, directory: str = SNAPSHOT_DIR, fmt: str = DEFAULT_FORMAT, previous: dict = None) -> dict:
+    """
+    DB 테이블 1개 -> 스냅샷 파일, manifest 항목 반환 (내용이 같으면 같은 파일/버전)
+    """
+    import pyarrow as pa
+    from AzureServiceModule.AzureSQLClient import execute_query
+
+    if name not in SNAPSHOT_TABLES:
+        raise ValueError(f"{name}: 스냅샷 대상 테이블이 아닙니다. (가능: {SNAPSHOT_TABLES})")
+    if fmt not in FORMATS:
+        raise ValueError(f"format은 {list(FORMATS)} 중 하나여야 합니다.")
+    start = time.perf_counter()
+    frame = execute_query(f"SELECT * FROM dbo.{name};")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f"{name}.tmp{FORMATS[fmt]}")
+    if fmt == "arrow":
+        # 압축하지 않아야 메모리맵에서 복사 없이 읽을 수 있습니다.
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        import pyarrow.parquet as pq
+        pq.write_table(table, tmp_path)
+    version = _file_version(tmp_path)
+    file_name = f"{name}.{version}{FORMATS[fmt]}"
+    os.replace(tmp_path, os.path.join(directory, file_name))
+
+    exported_at = _now()
+    unchanged = previous is not None and previous.get("file") == file_name
+    return {
+        "file": file_name,
+        "format": fmt,
+        "version": version,
+        "rows": table.num_rows,
+        "columns": table.column_names,
+        "bytes": os.path.getsize(os.path.join(directory, file_name)),
+        "exported_at": exported_at,
+        "updated_at": previous["updated_at"] if unchanged else exported_at,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def export_snapshots(tables: list = None, directory: str = SNAPSHOT_DIR, fmt: str = DEFAULT_FORMAT) -> dict:
+    """
+    테이블들을 내보내고 manifest를 교체합니다. (지정하지 않은 테이블은 이전 스냅샷 유지)
+    실패한 테이블은 이전 스냅샷을 유지하고 errors에 기록합니다.
+    """
+    manifest = read_manifest(directory) or {"tables": {}}
+    errors = {}
+    for name in tables or SNAPSHOT_TABLES:
+        try:
+            manifest["tables"][name] = export_table(name, directory, fmt, manifest["tables"].get(name))
+        except ValueError:
+            raise
+        except Exception as e:
+            errors[name] = str(e)
+            logger.error(f"스냅샷 내보내기 실패 (이전 스냅샷 유지): {name} - {e}")
+    manifest["created_at"] = _now()
+
+    manifest_path = os.path.join(directory, "manifest.json")
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    # 이미 열린 메모리맵은 파일을 지워도 유지됩니다.
+    files = {entry["file"] for entry in manifest["tables"].values()}
+    for file_name in os.listdir(directory):
+        if file_name.endswith(tuple(FORMATS.values())) and file_name not in files:
+            os.remove(os.path.join(directory, file_name))
+    return {**manifest, "errors": errors}
+
+
+class SnapshotStore:
+    """
+    manifest의 스냅샷 파일을 메모리맵으로 연 pyarrow Table 모음
+    - table()/frame()을 호출할 때 manifest 파일 상태가 바뀌었으면 다시 엽니다.
+    - 스냅샷이 없거나 pyarrow가 없으면 None을 반환합니다. (호출하는 쪽에서 DB 사용)
+    """
+    def __init__(self, directory: str = SNAPSHOT_DIR, enabled: bool = SNAPSHOT_ENABLED):
+        self.directory = directory
+        self.enabled = enabled
+        self._tables = {}
+        self._manifest = None
+        self._stamp = None
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.load_ms = None
+        self.error = None
+
+    def _manifest_stamp(self):
+        try:
+            st = os.stat(os.path.join(self.directory, "manifest.json"))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _open(path: str, fmt: str):
+        import pyarrow as pa
+        if fmt == "arrow":
+            return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        import pyarrow.parquet as pq
+        return pq.read_table(path, memory_map=True)
+
+    def load(self) -> bool:
+        """
+        manifest 기준으로 스냅샷을 (다시) 엽니다. 하나도 열지 못하면 False
+        """
+        with self._lock:
+            stamp = self._manifest_stamp()
+            if not self.enabled or stamp is None:
+                self._tables, self._manifest, self._stamp = {}, None, stamp
+                return False
+            start = time.perf_counter()
+            tables = {}
+            try:
+                manifest = read_manifest(self.directory)
+                for name, entry in manifest["tables"].items():
+                    tables[name] = self._open(os.path.join(self.directory, entry["file"]), entry["format"])
+            except ImportError:
+                self.error = "pyarrow가 설치되어 있지 않습니다. (pip install pyarrow)"
+                logger.warning(f"스냅샷을 사용하지 않습니다: {self.error}")
+                self._tables, self._manifest, self._stamp = {}, None, stamp
+                return False
+            except Exception as e:
+                # 교체 중 읽기 실패 등: 열어 둔 이전 스냅샷 유지, 상태(stamp)를 기록하지 않으므로 다음 조회 때 다시 엽니다.
+                self.error = str(e)
+                logger.error(f"스냅샷 열기 실패 (이전 스냅샷 유지): {e}")
+                return bool(self._tables)
+            self._tables, self._manifest, self._stamp = tables, manifest, stamp
+            self.error = None
+            self.loads += 1
+            self.load_ms = round((time.perf_counter() - start) * 1000, 3)
+            logger.info(f"스냅샷 로드: {len(tables)}개 테이블, {self.load_ms} ms ({self.directory})")
+            return bool(tables)
+
+    def table(self, name: str):
+        """
+        테이블 이름(dbo. 생략 가능) -> pyarrow Table 또는 None
+        """
+        if self._manifest_stamp() != self._stamp:
+            self.load()
+        return self._tables.get(name.split(".")[-1])
+
+    def versions(self) -> dict:
+        """
+        현재 열려 있는 테이블별 스냅샷 버전 (manifest가 바뀌었으면 다시 연 뒤)
+        """
+        if self._manifest_stamp() != self._stamp:
+            self.load()
+        return {name: entry["version"] for name, entry in (self._manifest or {}).get("tables", {}).items()
+                if name in self._tables}
+
+    def frame(self, name: str, columns: list = None):
+        table = self.table(name)
+        if table is None:
+            return None
+        return (table.select(columns) if columns else table).to_pandas()
+
+    def stats(self) -> dict:
+        manifest = self._manifest or {}
+        now = datetime.now(timezone.utc)
+        tables = {}
+        for name, entry in manifest.get("tables", {}).items():
+            exported_at = datetime.fromisoformat(entry["exported_at"])
+            tables[name] = {key: entry[key] for key in ("version", "rows", "format", "exported_at", "updated_at")}
+            tables[name]["age_seconds"] = round((now - exported_at).total_seconds(), 3)
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "loaded": bool(self._tables),
+            "loads": self.loads,
+            "load_ms": self.load_ms,
+            "created_at": manifest.get("created_at"),
+            "tables": tables,
+            "error": self.error,
+        }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = SnapshotStore()
+                store.load()
+                _store = store
+    return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="통계 테이블 스냅샷 내보내기")
+    parser.add_argument("tables", nargs="*", help=f"내보낼 테이블 (기본: {' '.join(SNAPSHOT_TABLES)})")
+    parser.add_argument("--format", default=DEFAULT_FORMAT, choices=list(FORMATS))
+    parser.add_argument("--dir", default=SNAPSHOT_DIR)
+    parser.add_argument("--status", action="store_true", help="내보내지 않고 현재 스냅샷 상태만 출력")
+    args = parser.parse_args()
+
+    if args.status:
+        store = SnapshotStore(args.dir)
+        store.load()
+        print(json.dumps(store.stats(), ensure_ascii=False, indent=2))
+        return
+    manifest = export_snapshots(args.tables or None, args.dir, args.format)
+    print(json.dumps(manifest, ensure_ascii=False, indent=2))
+    if manifest["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,108 @@
+# backend/ModelPredictionModule/sweep.py
+#
+# What-if 민감도 스윕
+# 기준 입력 1건에 대해 1~3개 변수(예: ticket_price, marketing_budget, capacity)의 값 목록을 받아
+# 데카르트 곱 격자 전체를 하나의 행렬로 만들고, 모델을 한 번만 호출해 격자 결과를 반환합니다.
+
+import time
+import logging
+
+import numpy as np
+
+from .model_registry import get_registry
+from .xgb_native import get_matrix_model
+
+logger = logging.getLogger("sweep")
+
+SWEEP_MODELS = {
+    "accumulated_sales_planning": ("xgb_reg_accumulated_sales_planning", ["predictions"]),
+    "accumulated_sales_selling": ("xgb_reg_accumulated_sales_selling", ["predictions"]),
+    "roi_bep_planning": ("xgb_reg_roi_bep_planning", ["roi", "bep"]),
+    "roi_bep_selling": ("xgb_reg_roi_bep_selling", ["roi", "bep"]),
+}
+
+MAX_AXES = 3
+MAX_AXIS_STEPS = 1000
+MAX_GRID_SIZE = 250_000
+
+
+def axis_values(axis: dict) -> np.ndarray:
+    """
+    축 정의 -> 값 배열
+    {"name": ..., "values": [...]} 또는 {"name": ..., "min": ..., "max": ..., "steps": ...}
+    """
+    if axis.get("values"):
+        values = np.asarray(axis["values"], dtype=np.float64)
+    elif axis.get("min") is not None and axis.get("max") is not None:
+        values = np.linspace(axis["min"], axis["max"], int(axis.get("steps") or 10))
+    else:
+        raise ValueError(f"{axis.get('name')}: values 또는 min/max/steps가 필요합니다.")
+    if not 1 <= len(values) <= MAX_AXIS_STEPS:
+        raise ValueError(f"{axis.get('name')}: 축 값은 1~{MAX_AXIS_STEPS}개여야 합니다.")
+    return values
+
+
+def sweep(analysis_type: str, base: dict, axes: list) -> dict:
+    """
+    analysis_type: SWEEP_MODELS의 키 (예: 'accumulated_sales_planning')
+    base: 기준 입력 1건 (API 입력 스키마 형식)
+    axes: [{"name": "ticket_price", "min": 20000, "max": 80000, "steps": 100}, ...] (1~3개)
+    반환: 타깃별 격자 (축 순서대로 중첩된 리스트, 2축이면 히트맵 행렬 그대로)
+    """
+    if analysis_type not in SWEEP_MODELS:
+        raise ValueError(f"analysis_type은 {list(SWEEP_MODELS)} 중 하나여야 합니다.")
+    if not 1 <= len(axes) <= MAX_AXES:
+        raise ValueError(f"축은 1~{MAX_AXES}개여야 합니다.")
+    model_name, targets = SWEEP_MODELS[analysis_type]
+    encoder, predict = get_matrix_model(model_name)
+    model_version = get_registry().version(model_name)
+
+    names = [axis.get("name") for axis in axes]
+    for name in names:
+        if name not in encoder.numeric:
+            raise ValueError(f"{name}: 스윕할 수 없는 변수입니다. (가능: {encoder.numeric})")
+    if len(set(names)) != len(names):
+        raise ValueError("같은 변수를 두 번 지정할 수 없습니다.")
+    values = [axis_values(axis) for axis in axes]
+    shape = tuple(len(v) for v in values)
+    size = int(np.prod(shape))
+    if size > MAX_GRID_SIZE:
+        raise ValueError(f"격자 크기({size})가 최대 {MAX_GRID_SIZE}를 넘습니다.")
+
+    start = time.perf_counter()
+    # 기준 행을 한 번 인코딩해 복제하고, 축 변수 컬럼만 격자 값으로 덮어씁니다.
+    base_vector = encoder.encode([dict(base)])[0]
+    X = np.tile(base_vector, (size, 1))
+    grids = np.meshgrid(*values, indexing="ij")
+    for name, grid in zip(names, grids):
+        j = encoder.output_columns.index(name)
+        X[:, j] = grid.ravel()
+        if encoder.zero_as_missing:
+            X[X[:, j] == 0, j] = np.nan
+    preds = np.asarray(predict(X)).reshape(size, -1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"스윕 {analysis_type} {shape}: {elapsed_ms:.1f} ms")
+
+    results = {}
+    for k, target in enumerate(targets):
+        grid = preds[:, k].reshape(shape)
+        best = np.unravel_index(int(np.argmax(grid)), shape)
+        worst = np.unravel_index(int(np.argmin(grid)), shape)
+        results[target] = {
+            "values": grid.tolist(),
+            "min": float(grid[worst]),
+            "max": float(grid[best]),
+            "argmax": {name: float(v[i]) for name, v, i in zip(names, values, best)},
+            "argmin": {name: float(v[i]) for name, v, i in zip(names, values, worst)},
+        }
+
+    return {
+        "analysis_type": analysis_type,
+        "model": model_name,
+        "model_version": model_version,
+        "base": {col: base.get(col) for col in encoder.input_columns if col not in names},
+        "axes": [{"name": name, "values": v.tolist()} for name, v in zip(names, values)],
+        "shape": list(shape),
+        "results": results,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
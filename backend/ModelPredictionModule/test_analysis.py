@@ -97,24 +97,28 @@ dummy_ticket_risk_input = [
 # -------------------------------------------
 # 테스트 실행
 # -------------------------------------------
+# (예측 실행기가 spawn으로 워커 프로세스를 띄우며 이 모듈을 다시 import하므로 main에서 실행합니다)
+def main():
+    print("=== (회귀) 관객 수 예측 - 기획 단계 ===")
+    res1 = predict_acc_sales_planning(dummy_acc_sales_planning_input)
+    pprint.pprint(res1)
 
-print("=== (회귀) 관객 수 예측 - 기획 단계 ===")
-res1 = predict_acc_sales_planning(dummy_acc_sales_planning_input)
-pprint.pprint(res1)
+    print("\n=== (회귀) 관객 수 예측 - 판매 단계 ===")
+    res2 = predict_acc_sales_selling(dummy_acc_sales_selling_input)
+    pprint.pprint(res2)
 
-print("\n=== (회귀) 관객 수 예측 - 판매 단계 ===")
-res2 = predict_acc_sales_selling(dummy_acc_sales_selling_input)
-pprint.pprint(res2)
+    print("\n=== (회귀) 손익 예측(ROI, BEP) - 기획 단계 ===")
+    res3 = predict_roi_bep_planning(dummy_roi_bep_planning_input)
+    pprint.pprint(res3)
 
-print("\n=== (회귀) 손익 예측(ROI, BEP) - 기획 단계 ===")
-res3 = predict_roi_bep_planning(dummy_roi_bep_planning_input)
-pprint.pprint(res3)
+    print("\n=== (회귀) 손익 예측(ROI, BEP) - 판매 단계 ===")
+    res4 = predict_roi_bep_selling(dummy_roi_bep_selling_input)
+    pprint.pprint(res4)
 
-print("\n=== (회귀) 손익 예측(ROI, BEP) - 판매 단계 ===")
-res4 = predict_roi_bep_selling(dummy_roi_bep_selling_input)
-pprint.pprint(res4)
+    print("\n=== (분류) 티켓 판매 위험 예측 - 판매 단계 ===")
+    res5 = predict_ticket_risk(dummy_ticket_risk_input)
+    pprint.pprint(res5)
 
-print("\n=== (분류) 티켓 판매 위험 예측 - 판매 단계 ===")
-res5 = predict_ticket_risk(dummy_ticket_risk_input)
-pprint.pprint(res5)
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/ModelPredictionModule/test_forest_evaluator.py
+#
+# FlatForest가 sklearn RandomForestClassifier(pkl)와 같은 라벨/확률을 내는지 확인합니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_forest_evaluator
+import sys
+import os
+import pprint
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry
+from ModelPredictionModule.xgb_native import sample_rows
+from ModelPredictionModule.forest_evaluator import FlatForest, pipeline_forest, memory_report
+
+
+def _assert_same(forest, flat, X):
+    labels, proba = flat.predict_with_proba(X)
+    expected_proba = forest.predict_proba(X)
+    assert proba.shape == expected_proba.shape
+    assert np.array_equal(proba, expected_proba), "클래스 확률이 다릅니다."
+    assert np.array_equal(labels, forest.predict(X)), "라벨이 다릅니다."
+    assert np.array_equal(flat.apply(X), forest.apply(X) + flat.roots), "리프 인덱스가 다릅니다."
+
+
+def test_ticket_risk_pickle():
+    """
+    rf_cls_ticket_risk.pkl: 파이프라인 predict / predict_proba 와 비교
+    """
+    pipeline = get_registry().get("rf_cls_ticket_risk")
+    flat = FlatForest.from_pipeline(pipeline)
+    rows = sample_rows(flat.encoder, 2000)
+    df = pd.DataFrame(rows)
+
+    proba = flat.predict_rows(rows)
+    assert np.array_equal(proba, pipeline.predict_proba(df))
+    assert np.array_equal(flat.classes_.take(proba.argmax(axis=1)), pipeline.predict(df))
+    for row in rows[:20]:
+        assert np.array_equal(flat.predict_rows([row]), pipeline.predict_proba(pd.DataFrame([row])))
+
+
+def test_synthetic_forest():
+    """
+    깊은 트리 + 다중 클래스 + 문자열 라벨로 새로 학습한 포레스트와 비교
+    """
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 12)).astype(np.float32)
+    y = np.array(["고위험", "중위험", "저위험"])[(X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(size=3000) > 0).astype(int)
+                                             + (X[:, 3] > 0.5).astype(int)]
+    forest = RandomForestClassifier(n_estimators=50, random_state=0).fit(X, y)
+    flat = FlatForest.from_estimator(forest)
+
+    X_test = rng.normal(size=(10000, 12)).astype(np.float32)
+    _assert_same(forest, flat, X_test)
+    # 임계값과 정확히 같은 값(경계) 입력
+    X_edge = X_test[:100].copy()
+    X_edge[:, 0] = np.resize(flat.threshold[flat.feature == 0], 100).astype(np.float32)
+    _assert_same(forest, flat, X_edge)
+
+
+def test_missing_values():
+    """
+    결측값(NaN)으로 학습한 포레스트: missing_go_to_left 방향 재현
+    """
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(2000, 6)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(int) + (X[:, 1] > 0).astype(int)
+    X[rng.random(X.shape) < 0.2] = np.nan
+    forest = RandomForestClassifier(n_estimators=30, max_depth=8, random_state=0).fit(X, y)
+    flat = FlatForest.from_estimator(forest)
+
+    X_test = rng.normal(size=(5000, 6)).astype(np.float32)
+    X_test[rng.random(X_test.shape) < 0.3] = np.nan
+    _assert_same(forest, flat, X_test)
+
+
+def test_memory_report():
+    pipeline = get_registry().get("rf_cls_ticket_risk")
+    report = memory_report(pipeline_forest(pipeline), FlatForest.from_pipeline(pipeline))
+    assert report["flat_bytes"] == report["arrays"]["total"]
+    assert report["n_trees"] == len(pipeline_forest(pipeline).estimators_)
+
+
+def main():
+    test_ticket_risk_pickle()
+    test_synthetic_forest()
+    test_missing_values()
+    test_memory_report()
+    print("=== FlatForest 동등성 테스트 통과 ===")
+
+    print("\n=== 메모리 사용량 (rf_cls_ticket_risk) ===")
+    pipeline = get_registry().get("rf_cls_ticket_risk")
+    pprint.pprint(memory_report(pipeline_forest(pipeline), FlatForest.from_pipeline(pipeline)))
+
+    print("\n=== 메모리 사용량 (합성 포레스트 200 trees) ===")
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(5000, 36)).astype(np.float32)
+    y = (X[:, 0] + rng.normal(size=5000) > 0).astype(int) + (X[:, 1] > 1).astype(int)
+    forest = RandomForestClassifier(n_estimators=200, random_state=0).fit(X, y)
+    pprint.pprint(memory_report(forest, FlatForest.from_estimator(forest)))
+
+
+if __name__ == "__main__":
+    main()
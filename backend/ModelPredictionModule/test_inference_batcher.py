@@ -0,0 +1,104 @@
+# backend/ModelPredictionModule/test_inference_batcher.py
+#
+# InferenceBatcher가 잘못된 요청만 실패시키고 같은 배치의 다른 요청 / 이후 요청은 계속 처리하는지 확인합니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_inference_batcher
+import sys
+import os
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.inference_batcher import InferenceBatcher
+
+
+def _predict(model_name: str, rows: list):
+    return np.array([float(row["x"]) for row in rows])
+
+
+def _error(future: Future):
+    try:
+        future.result(timeout=5)
+    except Exception as e:
+        return e
+    raise AssertionError("예외가 발생하지 않았습니다.")
+
+
+def test_batching():
+    batcher = InferenceBatcher(_predict, max_batch_size=64, max_wait_ms=50)
+    futures = [batcher.submit("m", [{"x": i}, {"x": i + 0.5}]) for i in range(20)]
+    for i, future in enumerate(futures):
+        assert future.result(timeout=5).tolist() == [i, i + 0.5]
+    stats = batcher.stats()[0]
+    assert stats["requests"] == 20 and stats["batches"] < 20
+
+
+def test_malformed_request():
+    """
+    행이 dict가 아닌 요청 (컬럼 구성 계산 실패): 그 요청만 실패
+    """
+    batcher = InferenceBatcher(_predict, max_wait_ms=50)
+    bad = batcher.submit("m", [1, 2])
+    good = batcher.submit("m", [{"x": 1}, {"x": 2}])
+    assert isinstance(_error(bad), AttributeError)
+    assert good.result(timeout=5).tolist() == [1.0, 2.0]
+    assert batcher.submit("m", [{"x": 5}]).result(timeout=5).tolist() == [5.0]
+
+
+def test_predict_error():
+    """
+    배치 예측 실패: 요청별로 다시 실행해 잘못된 값이 있는 요청만 실패
+    """
+    batcher = InferenceBatcher(_predict, max_wait_ms=50)
+    futures = [batcher.submit("m", [{"x": "abc" if i == 3 else i}]) for i in range(6)]
+    for i, future in enumerate(futures):
+        if i == 3:
+            assert isinstance(_error(future), ValueError)
+        else:
+            assert future.result(timeout=5).tolist() == [i]
+
+
+def test_future_result():
+    """
+    predict_fn이 Future를 반환하는 경우: 실패 / 결과 처리 오류도 요청에 전달되고 스레드는 계속 실행
+    """
+    def predict(model_name: str, rows: list):
+        future = Future()
+
+        def run():
+            if rows[0]["x"] < 0:
+                future.set_exception(RuntimeError("executor down"))
+            else:
+                future.set_result(_predict(model_name, rows))
+
+        threading.Thread(target=run).start()
+        return future
+
+    batcher = InferenceBatcher(predict, max_wait_ms=50)
+    assert isinstance(_error(batcher.submit("m", [{"x": -1}])), RuntimeError)
+    assert batcher.submit("m", [{"x": 7}]).result(timeout=5).tolist() == [7.0]
+
+    # 결과를 나눌 수 없는 값(None): 콜백 예외가 요청으로 전달
+    batcher = InferenceBatcher(lambda model_name, rows: _done(None), max_wait_ms=50)
+    assert isinstance(_error(batcher.submit("m", [{"x": 1}])), TypeError)
+
+
+def _done(value) -> Future:
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def main():
+    test_batching()
+    test_malformed_request()
+    test_predict_error()
+    test_future_result()
+    print("=== 배치 처리 테스트 통과 ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# backend/ModelPredictionModule/test_prediction_intervals.py
+#
+# XGBoost 수렴 폭이 점 예측을 중심으로 잡히는지 (예측값이 구간 한쪽 끝에 붙지 않는지) 확인합니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_prediction_intervals
+import sys
+import os
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from ModelPredictionModule.model_registry import get_registry
+from ModelPredictionModule.prediction_intervals import predict_intervals
+from ModelPredictionModule.xgb_native import sample_rows
+
+XGB_MODELS = ["xgb_reg_accumulated_sales_planning", "xgb_reg_roi_bep_planning"]
+
+
+def test_not_pinned():
+    checked = 0
+    for model_name in XGB_MODELS:
+        staged = get_registry().get(model_name, kind="staged")
+        rows = sample_rows(staged.encoder, 200)
+        result = predict_intervals(model_name, rows)
+        preds, lower, upper = result[..., 0], result[..., 1], result[..., 2]
+        assert np.allclose(preds, staged.native.predict(staged.encoder.encode(rows)).reshape(preds.shape))
+        assert np.all(lower <= preds) and np.all(preds <= upper), model_name
+        # 폭이 있는 구간에서는 예측값이 양 끝 어디에도 붙지 않고 가운데에 있어야 합니다.
+        spread = upper > lower
+        assert spread.mean() > 0.5, (model_name, spread.mean())
+        assert np.all(lower[spread] < preds[spread]) and np.all(preds[spread] < upper[spread]), model_name
+        assert np.allclose(preds - lower, upper - preds), model_name
+        checked += int(spread.sum())
+    return checked
+
+
+def main():
+    checked = test_not_pinned()
+    print(f"=== 예측 구간 테스트 통과 (구간 {checked}건) ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# backend/ModelPredictionModule/test_price_optimizer.py
+#
+# 가격 최적화(optimize_prices)와 /api/ml/price_optimization 입력 검증을 확인합니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_price_optimizer
+import sys
+import os
+import pprint
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ModelPredictionModule.price_optimizer import optimize_prices, OBJECTIVES, COST_DEFAULTS
+
+PERFORMANCE = {
+    "genre": "뮤지컬",
+    "region": "서울특별시",
+    "start_date_numeric": 1800,
+    "capacity": 500,
+    "star_power": 4,
+    "ticket_price": 80000,
+    "marketing_budget": 1000000,
+    "sns_mention_count": 3000,
+    "duration": 1,
+}
+
+
+def _raises(func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError(f"ValueError가 발생하지 않았습니다: {args} {kwargs}")
+
+
+def test_input_errors():
+    rows = [dict(PERFORMANCE)]
+    _raises(optimize_prices, "unknown", rows)
+    _raises(optimize_prices, "planning", rows, "margin")
+    _raises(optimize_prices, "planning", [])
+    _raises(optimize_prices, "planning", rows, price_range={"min": 100000, "max": 50000})
+    _raises(optimize_prices, "planning", [{**PERFORMANCE, "ticket_price": 0}])
+    _raises(optimize_prices, "planning", rows, coarse_steps=1)
+
+
+def test_never_worse_than_current():
+    """
+    현재 가격이 탐색 범위 밖이어도 최적 후보는 현재보다 나쁘지 않아야 합니다.
+    """
+    rows = [dict(PERFORMANCE), {**PERFORMANCE, "ticket_price": 30000, "capacity": 0}]
+    for objective in OBJECTIVES:
+        for price_range in (None, {"min": 1000, "max": 2000}, {"scale_min": 0.95, "scale_max": 1.05}):
+            result = optimize_prices("planning", rows, objective, price_range, optimize_budget=True)
+            for item in result["results"]:
+                assert item["improvement"] is None or item["improvement"] >= 0, (objective, price_range, item)
+
+
+def test_defaults_used():
+    rows = [dict(PERFORMANCE), {**PERFORMANCE, "production_cost": 2e8, "variable_cost_rate": 0.1}]
+    results = optimize_prices("planning", rows, "profit")["results"]
+    assert results[0]["defaults_used"] == list(COST_DEFAULTS)
+    assert results[1]["defaults_used"] == []
+
+
+def test_api_input_errors():
+    from routes import MLAnalysisAPI
+
+    app = FastAPI()
+    app.include_router(MLAnalysisAPI.router, prefix="/api/ml")
+    client = TestClient(app)
+    url = "/api/ml/price_optimization"
+
+    def post(**body):
+        return client.post(url, json={"performances": [PERFORMANCE], **body})
+
+    assert post(stage="unknown").status_code == 400
+    assert post(objective="margin").status_code == 400
+    assert post(price_range={"min": 100000, "max": 50000}).status_code == 400
+    assert client.post(url, json={"performances": []}).status_code == 422
+    for bad in ({"production_cost": "abc"}, {"production_cost": -1}, {"variable_cost_rate": 1.5}):
+        response = client.post(url, json={"performances": [{**PERFORMANCE, **bad}]})
+        assert response.status_code == 422, (bad, response.status_code)
+
+    response = client.post(url, json={"objective": "roi", "performances": [{**PERFORMANCE, "production_cost": 1e8}]})
+    assert response.status_code == 200
+    assert response.json()["results"][0]["defaults_used"] == ["variable_cost_rate"]
+
+
+def main():
+    test_input_errors()
+    test_never_worse_than_current()
+    test_defaults_used()
+    test_api_input_errors()
+    print("=== 가격 최적화 테스트 통과 ===")
+
+    print("\n=== 최적화 결과 (planning / profit, 예산 포함) ===")
+    pprint.pprint(optimize_prices("planning", [dict(PERFORMANCE)], "profit", optimize_budget=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# backend/ModelPredictionModule/test_stats_cache.py
+#
+# 통계 캐시(StatsCache)의 조건부 응답(304), 동시 요청 합치기(single-flight), 실패 시 대체 값/재시도 간격을 확인합니다.
+# DB 대신 메모리 집계 함수를 씁니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_stats_cache
+import sys
+import os
+import time
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ModelPredictionModule import stats_cache
+from ModelPredictionModule.stats_cache import StatsCache
+
+
+class Loader:
+    """
+    호출 횟수를 세는 집계 함수 (delay초 걸림, fail이면 예외)
+    """
+    def __init__(self, value: dict, delay: float = 0.0):
+        self.value = value
+        self.delay = delay
+        self.fail = False
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("db down")
+        return self.value
+
+
+def test_not_modified():
+    """
+    /genre_stats: ETag / Last-Modified 조건부 요청은 304, 다시 집계해도 내용이 같으면 ETag 유지
+    """
+    loader = Loader({"genre_stats": {"genre": ["뮤지컬", "연극"], "audience": [10, 20]}})
+    cache = StatsCache(loaders={"genre_stats": loader, "regional_stats": loader, "venue_scale_stats": loader},
+                       ttl=0.2, interval=0)
+    stats_cache._cache = cache
+    try:
+        from routes import MLAnalysisAPI
+        app = FastAPI()
+        app.include_router(MLAnalysisAPI.router, prefix="/api/ml")
+        client = TestClient(app)
+        url = "/api/ml/genre_stats"
+
+        response = client.get(url)
+        assert response.status_code == 200 and response.json() == loader.value
+        etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+        assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+        assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+        # TTL이 지나면 이전 값으로 응답하고 백그라운드에서 다시 집계 (내용이 같으므로 여전히 304)
+        time.sleep(0.3)
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+        time.sleep(0.1)
+        assert loader.calls == 2 and cache.stale_hits == 1
+        assert cache._entries["genre_stats"].etag == etag
+
+        # 내용이 바뀌면 200과 새 ETag
+        loader.value = {"genre_stats": {"genre": ["뮤지컬"], "audience": [30]}}
+        cache.refresh("genre_stats").result()
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["etag"] != etag
+    finally:
+        stats_cache._cache = None
+
+
+def test_single_flight():
+    """
+    값이 없을 때 동시에 들어온 요청은 집계 1건을 함께 기다립니다.
+    """
+    loader = Loader({"x": [1]}, delay=0.3)
+    cache = StatsCache(loaders={"x": loader}, interval=0)
+    etags = []
+    threads = [threading.Thread(target=lambda: etags.append(cache.get("x").etag)) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == 1, loader.calls
+    assert len(etags) == 20 and len(set(etags)) == 1
+    assert cache.coalesced == 19
+
+
+def test_failure_backoff():
+    """
+    집계 실패: 대체 값으로 응답하고 RETRY_INTERVAL 동안은 다시 집계하지 않습니다.
+    """
+    loader = Loader({"x": [1]})
+    loader.fail = True
+    cache = StatsCache(loaders={"x": loader}, fallbacks={"x": lambda: {"x": [0]}}, interval=0, retry_interval=0.3)
+    entry = cache.get("x")
+    assert entry.source == "fallback" and entry.value == {"x": [0]}
+    for _ in range(5):
+        assert cache.get("x").source == "fallback"
+    assert loader.calls == 1 and cache.failures == 1
+
+    # 재시도 간격이 지나면 다시 집계하고, 성공하면 DB 값으로 바뀝니다.
+    loader.fail = False
+    time.sleep(0.35)
+    cache.get("x")
+    time.sleep(0.1)
+    entry = cache.get("x")
+    assert loader.calls == 2 and entry.source == "db" and entry.value == {"x": [1]}
+
+    # 대체 값이 없으면 예외
+    failing = Loader({"x": [1]})
+    failing.fail = True
+    try:
+        StatsCache(loaders={"x": failing}, interval=0).get("x")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("대체 값이 없는데 예외가 발생하지 않았습니다.")
+
+
+def main():
+    test_not_modified()
+    test_single_flight()
+    test_failure_backoff()
+    print("=== 통계 캐시 테스트 통과 ===")
+
+
+if __name__ == "__main__":
+    main()
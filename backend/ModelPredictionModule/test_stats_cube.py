@@ -0,0 +1,218 @@
+# backend/ModelPredictionModule/test_stats_cube.py
+#
+# 집계 큐브(Cube)가 pandas groupby와 같은 합계를 내는지, 큐브가 준비되기 전 / 생성 실패 시 동작을 확인합니다.
+# DB 대신 합성 데이터를 씁니다.
+#   cd backend
+#   python -m ModelPredictionModule.test_stats_cube
+import sys
+import os
+import json
+import time
+import threading
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ModelPredictionModule import stats_cube
+from ModelPredictionModule.stats_cube import Cube, StatsCubeStore, CUBE_SOURCES, DIMENSIONS
+from ModelPredictionModule.stats_queries import STATS_TABLES
+
+MEASURES = CUBE_SOURCES["sales"]["measures"]
+_PUBLIC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "frontend", "public"))
+
+
+def synthetic_fact(rows: int = 5000, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "year": pd.array(rng.choice([2023, 2024, 2025], rows), dtype="Int64"),
+        "month": pd.array(rng.integers(1, 13, rows), dtype="Int64"),
+        "genre": rng.choice(["뮤지컬", "연극", "클래식", "무용"], rows).astype(object),
+        "region": rng.choice(["서울특별시", "부산광역시", "경기도"], rows).astype(object),
+        "venue_scale": rng.choice(["1~300석 미만", "300~500석 미만", "좌석 미상"], rows).astype(object),
+        "opening_count": rng.integers(0, 2, rows).astype(np.float64),
+        "ticket_sales": rng.integers(0, 500, rows).astype(np.float64),
+        "ticket_revenue": rng.integers(0, 500, rows) * 1000.0,
+    })
+    # 결측 차원 값은 None 그룹으로 집계됩니다.
+    frame.loc[rng.random(rows) < 0.05, "genre"] = None
+    frame.loc[rng.random(rows) < 0.05, "year"] = pd.NA
+    return frame
+
+
+def _expected(frame: pd.DataFrame, dimensions: list, filters: dict) -> pd.DataFrame:
+    for dim, allowed in filters.items():
+        frame = frame[frame[dim].astype(str).isin([str(value) for value in allowed])]
+    if not dimensions:
+        return frame[MEASURES].sum().to_frame().T
+    grouped = frame.groupby(dimensions, dropna=False, sort=True)[MEASURES].sum().reset_index()
+    return grouped.astype({dim: object for dim in dimensions})
+
+
+def test_matches_groupby():
+    frame = synthetic_fact()
+    cube = Cube("sales", frame, DIMENSIONS, MEASURES)
+    checked = 0
+    for size in range(len(DIMENSIONS) + 1):
+        for dimensions in combinations(DIMENSIONS, size):
+            for filters in ({}, {"genre": ["뮤지컬", "연극"]}, {"month": ["6", 7], "region": ["서울특별시"]}):
+                result = cube.query(list(dimensions), filters=filters)
+                expected = _expected(frame, list(dimensions), filters)
+                assert result["rows"] == len(expected), (dimensions, filters)
+                for dim in dimensions:
+                    labels = [None if pd.isna(value) else value for value in expected[dim]]
+                    assert result["data"][dim] == labels, (dimensions, filters, dim)
+                for measure in MEASURES:
+                    assert np.array_equal(result["data"][measure], expected[measure].to_numpy()), \
+                        (dimensions, filters, measure)
+                checked += 1
+    # order_by / limit: 내림차순 상위 n개
+    result = cube.query(["genre", "region"], ["ticket_sales"], order_by="ticket_sales", limit=3)
+    expected = _expected(frame, ["genre", "region"], {}).sort_values("ticket_sales", ascending=False, kind="stable")
+    assert result["data"]["ticket_sales"] == expected["ticket_sales"].head(3).astype(int).tolist()
+    # 차원 부분집합 2^5개 x 필터 3종
+    assert checked == 2 ** len(DIMENSIONS) * 3, checked
+
+
+def test_query_errors():
+    cube = Cube("sales", synthetic_fact(500), DIMENSIONS, MEASURES)
+    for kwargs in ({"dimensions": ["city"]}, {"dimensions": ["genre", "genre"]},
+                   {"dimensions": ["genre"], "measures": ["profit"]},
+                   {"dimensions": ["genre"], "measures": ["ticket_sales"], "order_by": "ticket_revenue"}):
+        try:
+            cube.query(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"ValueError가 발생하지 않았습니다: {kwargs}")
+
+
+def test_regional_rollup():
+    """
+    지역별 통계(region_stats_tb 원본): 지역을 모두 합친 값이 테이블의 합계 행과 같아야 합니다. (합계/권역 행 중복 집계 없음)
+    """
+    with open(os.path.join(_PUBLIC_DIR, "지역별_통계.json"), encoding="utf-8") as f:
+        table = pd.DataFrame(json.load(f))
+    original = stats_cube.table_frame
+    stats_cube.table_frame = lambda name, columns, source=None: table[columns]
+    try:
+        fact = stats_cube.stats_fact("regional_stats")
+    finally:
+        stats_cube.table_frame = original
+    spec = CUBE_SOURCES["regional_stats"]
+    cube = Cube("regional_stats", fact, spec["dimensions"], spec["measures"])
+
+    def table_sum(regions: list) -> dict:
+        rows = table[table["지역명"].isin(regions)]
+        return {field: [int(rows[col].sum())] for col, field in STATS_TABLES["regional_stats"]["measures"].items()}
+
+    assert cube.query([])["data"] == table_sum(["합계"])
+    assert "합계" not in cube.levels["region"] and "경기/인천" not in cube.levels["region"]
+    # 구성 지역을 고르면 권역 행과 같은 값
+    assert cube.query([], filters={"region": ["경기", "인천"]})["data"] == table_sum(["경기/인천"])
+    assert cube.query([], filters={"region": ["대전", "세종", "충남", "충북"]})["data"] == table_sum(["충청도"])
+
+
+class _SlowStore(StatsCubeStore):
+    """
+    소스 생성에 delay초가 걸리는 큐브 저장소 (fail이면 모든 소스 실패)
+    """
+    def __init__(self, delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.fail = False
+        self.calls = 0
+
+    def _build_source(self, name: str) -> Cube:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("db down")
+        spec = CUBE_SOURCES[name]
+        frame = synthetic_fact(200) if name == "sales" else \
+            pd.DataFrame({**{dim: ["a"] for dim in spec["dimensions"]}, **{m: [1] for m in spec["measures"]}})
+        return Cube(name, frame, spec["dimensions"], spec["measures"])
+
+
+def _wait_idle(store: StatsCubeStore, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while store._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_not_ready():
+    """
+    큐브가 없으면 요청 스레드에서 만들지 않고 바로 503, 생성은 백그라운드 1건
+    """
+    store = _SlowStore(delay=0.2)
+    stats_cube._store = store
+    try:
+        from routes import MLAnalysisAPI
+        app = FastAPI()
+        app.include_router(MLAnalysisAPI.router, prefix="/api/ml")
+        client = TestClient(app)
+
+        start = time.perf_counter()
+        responses = [client.post("/api/ml/aggregate", json={"dimensions": ["genre"]}) for _ in range(5)]
+        assert time.perf_counter() - start < 0.2
+        assert [response.status_code for response in responses] == [503] * 5
+        assert client.get("/api/ml/aggregate/schema").status_code == 503
+
+        _wait_idle(store)
+        assert store.builds == 1 and store.calls == len(CUBE_SOURCES)
+        response = client.post("/api/ml/aggregate", json={"dimensions": ["genre"]})
+        assert response.status_code == 200 and response.json()["source"] == "sales"
+        assert client.post("/api/ml/aggregate", json={"dimensions": ["city"]}).status_code == 400
+    finally:
+        stats_cube._store = None
+
+
+def test_failure_backoff():
+    """
+    생성 실패 후 CUBE_RETRY_INTERVAL 동안은 다시 만들지 않습니다.
+    """
+    store = _SlowStore(delay=0.0, retry_interval=0.3)
+    store.fail = True
+    for _ in range(5):
+        try:
+            store.query(["genre"])
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("큐브가 없는데 예외가 발생하지 않았습니다.")
+        _wait_idle(store)
+    assert store.builds == 1 and store.calls == len(CUBE_SOURCES)
+
+    store.fail = False
+    time.sleep(0.35)
+    store.cubes()
+    _wait_idle(store)
+    assert store.builds == 2 and store.ready()
+    assert store.query(["genre"])["source"] == "sales"
+
+    # 동시에 들어온 요청이 생성을 여러 번 시작하지 않습니다.
+    store = _SlowStore(delay=0.05)
+    threads = [threading.Thread(target=store.cubes) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    _wait_idle(store)
+    assert store.builds == 1
+
+
+def main():
+    test_matches_groupby()
+    test_query_errors()
+    test_regional_rollup()
+    test_not_ready()
+    test_failure_backoff()
+    print(f"=== 집계 큐브 테스트 통과 (groupby 비교 {2 ** len(DIMENSIONS) * 3}건) ===")
+
+
+if __name__ == "__main__":
+    main()
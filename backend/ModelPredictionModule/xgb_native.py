@@ -0,0 +1,381 @@
+# backend/ModelPredictionModule/xgb_native.py
+#
+# XGBoost 모델을 sklearn 래퍼 없이 네이티브 Booster(UBJSON)로 내보내고,
+# 서빙 시에는 NumPy 행렬에 inplace_predict를 바로 호출합니다.
+#
+# FlatXGBModel은 트리를 연속된 NumPy 노드 배열로 펼친 형식으로, 공유 형식(models/shared/)의
+# 메모리맵 배열로 서빙할 때 사용합니다. (inplace_predict와 비트 단위로 같은 예측)
+#
+# 내보내기 (models/native/ 에 저장 + pkl 예측과 일치 검증):
+#   cd backend
+#   python -m ModelPredictionModule.xgb_native
+#   python -m ModelPredictionModule.xgb_native xgb_reg_roi_bep_selling
+
+import os
+import sys
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from .model_registry import MODEL_DIR, artifact_version, get_registry, register_loader, read_shared, shared_manifest
+from .feature_encoder import FeatureEncoder, get_encoder
+
+logger = logging.getLogger("xgb_native")
+
+NATIVE_DIR = os.path.join(MODEL_DIR, "native")
+
+XGB_MODELS = [
+    "xgb_reg_accumulated_sales_planning",
+    "xgb_reg_accumulated_sales_selling",
+    "xgb_reg_roi_bep_planning",
+    "xgb_reg_roi_bep_selling",
+]
+
+# inplace_predict 스레드 수: 파드 CPU 수를 추론 워커 수로 나눈 값 (ML_XGB_NTHREAD로 지정 가능)
+DEFAULT_NTHREAD = int(os.getenv(
+    "ML_XGB_NTHREAD",
+    str(max(1, (os.cpu_count() or 1) // int(os.getenv("ML_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))))
+))
+
+# FlatXGBModel이 한 번에 순회하는 행 수 (행 수 x 트리 수 크기의 노드 인덱스 배열을 만듭니다)
+FLAT_CHUNK_ROWS = 4096
+
+
+def pipeline_boosters(model):
+    """
+    pkl 파이프라인의 마지막 단계에서 Booster 목록을 꺼냅니다.
+    XGBRegressor -> [booster], MultiOutputRegressor(XGBRegressor) -> 타깃별 booster
+    XGBoost 모델이 아니면 None
+    """
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    if isinstance(estimator, xgb.XGBModel):
+        return [estimator.get_booster()]
+    estimators = getattr(estimator, "estimators_", None)
+    if estimators and all(isinstance(e, xgb.XGBModel) for e in estimators):
+        return [e.get_booster() for e in estimators]
+    return None
+
+
+class NativeXGBModel:
+    """
+    네이티브 Booster + FeatureEncoder
+    predict(X)는 sklearn 파이프라인의 predict와 같은 모양/값을 반환합니다.
+    (타깃 1개: (n,), 타깃 여러 개: (n, 타깃 수))
+    """
+    def __init__(self, boosters: list, encoder: FeatureEncoder, nthread: int = DEFAULT_NTHREAD):
+        self.boosters = boosters
+        self.encoder = encoder
+        self.nthread = nthread
+        for booster in self.boosters:
+            booster.set_param({"nthread": nthread})
+
+    @classmethod
+    def from_pipeline(cls, model, nthread: int = DEFAULT_NTHREAD) -> "NativeXGBModel":
+        # 원본 파이프라인의 booster를 건드리지 않도록 복사본을 사용합니다.
+        boosters = [booster.copy() for booster in pipeline_boosters(model)]
+        return cls(boosters, FeatureEncoder.from_pipeline(model), nthread)
+
+    @classmethod
+    def load(cls, model_name: str, native_dir: str = NATIVE_DIR, nthread: int = DEFAULT_NTHREAD) -> "NativeXGBModel":
+        with open(os.path.join(native_dir, f"{model_name}.schema.json"), encoding="utf-8") as f:
+            schema = json.load(f)
+        boosters = []
+        for filename in schema["boosters"]:
+            booster = xgb.Booster()
+            booster.load_model(os.path.join(native_dir, filename))
+            boosters.append(booster)
+        return cls(boosters, FeatureEncoder.from_dict(schema["encoder"]), nthread)
+
+    def save(self, model_name: str, native_dir: str = NATIVE_DIR, source: str = None) -> str:
+        os.makedirs(native_dir, exist_ok=True)
+        filenames = []
+        for i, booster in enumerate(self.boosters):
+            filename = f"{model_name}.{i}.ubj"
+            booster.save_model(os.path.join(native_dir, filename))
+            filenames.append(filename)
+        schema = {
+            "model_name": model_name,
+            "xgboost_version": xgb.__version__,
+            "source": os.path.basename(source) if source else None,
+            # 원본 pkl 내용 해시 (서빙 시 pkl과 비교해 다시 배포되었는지 확인)
+            "source_version": artifact_version(source) if source else None,
+            "n_targets": len(self.boosters),
+            "boosters": filenames,
+            "encoder": self.encoder.to_dict(),
+        }
+        schema_path = os.path.join(native_dir, f"{model_name}.schema.json")
+        with open(schema_path, "w", encoding="utf-8") as f:
+            json.dump(schema, f, ensure_ascii=False, indent=2)
+        return schema_path
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        preds = [booster.inplace_predict(X, validate_features=False) for booster in self.boosters]
+        if len(preds) == 1:
+            return preds[0]
+        return np.column_stack(preds)
+
+    def predict_rows(self, input_data) -> np.ndarray:
+        return self.predict(self.encoder.encode(input_data))
+
+
+class FlatXGBModel:
+    """
+    펼쳐진 XGBoost 트리 (gbtree, 항등 출력 회귀 목적함수)
+
+    모든 타깃의 모든 트리 노드를 하나의 배열로 이어 붙이고, 자식 인덱스는 전역 인덱스로 바꿔 둡니다.
+    - feature / threshold / default_left: 노드별 분기 정보 (x < threshold 이면 왼쪽, 결측이면 default_left)
+    - children: children[2i] = 왼쪽 자식, children[2i + 1] = 오른쪽 자식
+      리프 노드는 두 자식 모두 자기 자신이고, threshold에 리프 값이 들어 있습니다. (XGBoost JSON의 split_conditions와 동일)
+    - roots: 트리별 루트 노드의 전역 인덱스, target_trees: 타깃별 트리 범위 (타깃 수 + 1)
+    - base_score: 타깃별 기준값
+    XGBoost와 같이 float32 입력/임계값으로 비교하고, 기준값에서 트리 순서대로 float32로 더합니다.
+    """
+    SHARED_ARRAYS = ["feature", "threshold", "children", "default_left", "roots", "target_trees", "base_score"]
+    IDENTITY_OBJECTIVES = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror", "reg:quantileerror")
+
+    def __init__(self, feature, threshold, children, default_left, roots, target_trees, base_score,
+                 encoder: FeatureEncoder = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.default_left = default_left
+        self.roots = roots
+        self.target_trees = target_trees
+        self.base_score = base_score
+        self.encoder = encoder
+
+    @property
+    def n_targets(self) -> int:
+        return len(self.target_trees) - 1
+
+    @classmethod
+    def from_boosters(cls, boosters: list, encoder: FeatureEncoder = None) -> "FlatXGBModel":
+        features, thresholds, children, default_lefts, roots, base_scores = [], [], [], [], [], []
+        target_trees = [0]
+        offset = 0
+        for booster in boosters:
+            learner = json.loads(booster.save_raw("json"))["learner"]
+            if learner["objective"]["name"] not in cls.IDENTITY_OBJECTIVES:
+                raise ValueError(f"지원하지 않는 목적함수입니다: {learner['objective']['name']}")
+            if learner["gradient_booster"]["name"] != "gbtree":
+                raise ValueError(f"지원하지 않는 부스터입니다: {learner['gradient_booster']['name']}")
+            base_scores.append(float(learner["learner_model_param"]["base_score"].strip("[]")))
+            for tree in learner["gradient_booster"]["model"]["trees"]:
+                if any(tree.get("split_type", [])):
+                    raise ValueError("범주형 분기가 있는 트리는 지원하지 않습니다.")
+                left = np.asarray(tree["left_children"], dtype=np.int32)
+                right = np.asarray(tree["right_children"], dtype=np.int32)
+                leaf = left == -1
+                nodes = np.arange(len(left), dtype=np.int32)
+                features.append(np.asarray(tree["split_indices"], dtype=np.int32))
+                thresholds.append(np.asarray(tree["split_conditions"], dtype=np.float32))
+                children.append((np.column_stack([np.where(leaf, nodes, left), np.where(leaf, nodes, right)])
+                                 + offset).astype(np.int32).ravel())
+                default_lefts.append(np.asarray(tree["default_left"], dtype=bool))
+                roots.append(offset)
+                offset += len(left)
+            target_trees.append(len(roots))
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            children=np.concatenate(children),
+            default_left=np.concatenate(default_lefts),
+            roots=np.asarray(roots, dtype=np.int32),
+            target_trees=np.asarray(target_trees, dtype=np.int32),
+            base_score=np.asarray(base_scores, dtype=np.float32),
+            encoder=encoder,
+        )
+
+    @classmethod
+    def from_native(cls, native: NativeXGBModel) -> "FlatXGBModel":
+        return cls.from_boosters(native.boosters, native.encoder)
+
+    def to_shared(self) -> tuple:
+        """
+        공유 형식으로 저장할 (배열 dict, 파라미터 dict)
+        """
+        params = {"encoder": self.encoder.to_dict() if self.encoder is not None else None}
+        return {name: getattr(self, name) for name in self.SHARED_ARRAYS}, params
+
+    @classmethod
+    def from_shared(cls, arrays: dict, params: dict) -> "FlatXGBModel":
+        encoder = FeatureEncoder.from_dict(params["encoder"]) if params.get("encoder") else None
+        return cls(**{name: arrays[name] for name in cls.SHARED_ARRAYS}, encoder=encoder)
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """
+        행별/트리별 도달한 리프의 전역 노드 인덱스 (행 수, 트리 수)
+        리프는 자기 자신을 가리키므로 모든 (행, 트리)를 같은 모양의 배열로 한 단계씩 내려갑니다.
+        """
+        n = X.shape[0]
+        # 열 우선으로 펼친 입력에서 (특성 * 행 수 + 행) 위치를 1차원 take로 읽습니다.
+        columns = np.ascontiguousarray(X.T).ravel()
+        rows = np.arange(n, dtype=np.int64)[:, None]
+        node = np.broadcast_to(self.roots, (n, len(self.roots)))
+        while True:
+            x = np.take(columns, np.take(self.feature, node) * n + rows)
+            go_right = ~(x < np.take(self.threshold, node))
+            missing = np.isnan(x)
+            if missing.any():
+                go_right[missing] = ~self.default_left[node[missing]]
+            child = np.take(self.children, node * 2 + go_right)
+            if np.array_equal(child, node):
+                return node
+            node = child
+
+    def _predict_chunk(self, X: np.ndarray) -> np.ndarray:
+        # 모든 타깃의 트리를 한 번에 순회한 뒤 타깃별로 리프 값을 더합니다.
+        values = np.take(self.threshold, self._leaves(X))
+        preds = []
+        for k in range(self.n_targets):
+            start, end = self.target_trees[k], self.target_trees[k + 1]
+            terms = np.empty((X.shape[0], end - start + 1), dtype=np.float32)
+            terms[:, 0] = self.base_score[k]
+            terms[:, 1:] = values[:, start:end]
+            # 기준값부터 트리 순서대로 float32 누적 (accumulate는 순차 합이라 XGBoost와 같은 값)
+            preds.append(np.add.accumulate(terms, axis=1)[:, -1])
+        if len(preds) == 1:
+            return preds[0]
+        return np.column_stack(preds)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.shape[0] <= FLAT_CHUNK_ROWS:
+            return self._predict_chunk(X)
+        return np.concatenate([self._predict_chunk(X[i:i + FLAT_CHUNK_ROWS])
+                               for i in range(0, X.shape[0], FLAT_CHUNK_ROWS)])
+
+    def predict_rows(self, input_data) -> np.ndarray:
+        return self.predict(self.encoder.encode(input_data))
+
+
+def _load_native(model_name: str, registry):
+    """
+    레지스트리 로더: models/native 에 내보낸 파일이 있으면 그것을, 없으면 pkl의 booster를 사용합니다.
+    XGBoost 모델이 아니면 None을 돌려줍니다.
+    """
+    manifest = shared_manifest(model_name)
+    if manifest is not None and manifest["kind"] != "trees":
+        # 다른 형식(포레스트, 중심점)으로 내보낸 모델은 XGBoost가 아니므로 pkl을 로드하지 않습니다.
+        return None, registry.model_path(model_name), manifest["source_version"]
+    schema_path = os.path.join(NATIVE_DIR, f"{model_name}.schema.json")
+    if os.path.exists(schema_path):
+        with open(schema_path, encoding="utf-8") as f:
+            source_version = json.load(f).get("source_version")
+        # pkl이 다시 학습/배포되어 내용이 바뀌었으면 내보낸 파일은 무시합니다. (복사/체크아웃으로 수정 시각만 바뀐 경우는 그대로 사용)
+        if source_version is not None and source_version == artifact_version(registry.model_path(model_name)):
+            return NativeXGBModel.load(model_name, NATIVE_DIR), schema_path, source_version
+        logger.warning(f"{model_name}: 네이티브 파일이 pkl과 버전이 달라 pkl의 booster를 사용합니다.")
+    model = registry.get(model_name)
+    if pipeline_boosters(model) is None:
+        return None, registry.model_path(model_name)
+    return NativeXGBModel.from_pipeline(model), registry.model_path(model_name)
+
+
+register_loader("native", _load_native)
+
+
+def _load_trees(model_name: str, registry):
+    """
+    레지스트리 로더: 공유 형식이 있으면 메모리맵 배열로 (pkl 로드 없음), 없으면 네이티브 booster를 펼칩니다.
+    XGBoost 모델이 아니면 None을 돌려줍니다.
+    """
+    shared = read_shared(model_name, "trees")
+    if shared is not None:
+        arrays, manifest = shared
+        return FlatXGBModel.from_shared(arrays, manifest["params"]), manifest["path"], manifest["source_version"]
+    native = registry.get(model_name, kind="native")
+    if native is None:
+        return None, registry.model_path(model_name)
+    return FlatXGBModel.from_native(native), registry.model_path(model_name)
+
+
+register_loader("trees", _load_trees)
+
+
+def get_native_model(model_name: str):
+    """
+    서빙용 네이티브 모델 (XGBoost 모델이 아니면 None)
+    """
+    return get_registry().get(model_name, kind="native")
+
+
+def get_shared_trees(model_name: str):
+    """
+    공유 형식(메모리맵)으로 내보낸 XGBoost 모델이면 FlatXGBModel, 아니면 None
+    """
+    registry = get_registry()
+    if registry.serving_kind(model_name) != "trees":
+        return None
+    return registry.get(model_name, kind="trees")
+
+
+def get_matrix_model(model_name: str):
+    """
+    (인코더, 인코딩된 행렬 -> 예측) 쌍. 네이티브 XGBoost가 있으면 그것을, 없으면 pkl의 최종 모델을 사용합니다.
+    시뮬레이션/스윕처럼 입력 행렬을 직접 만드는 경우에 사용합니다.
+    """
+    native = get_native_model(model_name)
+    if native is not None:
+        return native.encoder, native.predict
+    model = get_registry().get(model_name)
+    return get_encoder(model_name, model), model.steps[-1][1].predict
+
+
+def sample_rows(encoder: FeatureEncoder, n: int = 1000, seed: int = 0) -> list:
+    """
+    검증/벤치마크용 무작위 입력 (학습 범주 + 미지 범주, 0 포함 수치값)
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n):
+        row = {}
+        for col, index_map in encoder.categorical:
+            choices = list(index_map.keys()) + ["__unknown__"]
+            row[col] = choices[rng.integers(len(choices))]
+        for col in encoder.numeric:
+            row[col] = float(rng.choice([0.0, rng.random(), rng.integers(1, 400), rng.integers(1, 10 ** 8)]))
+        rows.append(row)
+    return rows
+
+
+def verify(model_name: str, native: NativeXGBModel, pipeline, n: int = 1000) -> int:
+    """
+    네이티브 예측이 pkl 파이프라인 예측과 비트 단위로 같은지 확인합니다. (불일치 행 수 반환)
+    """
+    rows = sample_rows(native.encoder, n)
+    expected = pipeline.predict(pd.DataFrame(rows))
+    actual = native.predict_rows(rows)
+    single_mismatch = sum(
+        not np.array_equal(pipeline.predict(pd.DataFrame([row])), native.predict_rows([row]))
+        for row in rows[:50]
+    )
+    if expected.shape != actual.shape:
+        return n
+    mismatch = int(np.asarray(expected != actual).reshape(n, -1).any(axis=1).sum())
+    return mismatch + single_mismatch
+
+
+def export_model(model_name: str, native_dir: str = NATIVE_DIR) -> dict:
+    """
+    pkl을 네이티브 UBJSON + 스키마로 내보내고, 다시 읽어 pkl과 예측이 일치하는지 검증합니다.
+    """
+    source = os.path.join(MODEL_DIR, f"{model_name}.pkl")
+    pipeline = get_registry().get(model_name)
+    if pipeline_boosters(pipeline) is None:
+        raise ValueError(f"{model_name}: XGBoost 모델이 아닙니다.")
+    schema_path = NativeXGBModel.from_pipeline(pipeline).save(model_name, native_dir, source)
+    reloaded = NativeXGBModel.load(model_name, native_dir)
+    mismatch = verify(model_name, reloaded, pipeline)
+    if mismatch:
+        raise ValueError(f"{model_name}: 네이티브 예측이 pkl과 다릅니다. (불일치 {mismatch}건)")
+    return {"model_name": model_name, "schema": schema_path, "n_targets": len(reloaded.boosters), "verified": True}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for name in sys.argv[1:] or XGB_MODELS:
+        print(export_model(name))
@@ -3,6 +3,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from routes import MLAnalysisAPI
 from routes import ChatbotAPI 
+from ModelPredictionModule.analysis_module import get_executor, start_model_watcher
+from ModelPredictionModule.model_watcher import get_model_watcher
+from ModelPredictionModule.stats_cache import get_stats_cache
+from ModelPredictionModule.stats_snapshot import get_snapshot_store
+from ModelPredictionModule.stats_cube import get_stats_cube
+from AzureServiceModule.AzureSQLClient import dispose as dispose_sql
 
 app = FastAPI(docs_url="/api/docs")
 
@@ -19,5 +25,24 @@ app.add_middleware(
 app.include_router(MLAnalysisAPI.router, prefix="/api/ml")
 app.include_router(ChatbotAPI.router, prefix="/api/chatbot")
 
+# 서버 기동 시 추론 워커를 띄우고, 예측 모델을 미리 로드해 더미 예측으로 워밍업합니다.
+# 이후 모델 파일이 바뀌면 재시작 없이 검증 후 교체합니다.
+# 집계 통계는 기동 시 테이블 스냅샷(있으면)을 메모리맵으로 열고, 한 번 집계한 뒤 주기적으로 다시 집계합니다.
+# 다차원 집계 큐브는 백그라운드에서 만듭니다.
+@app.on_event("startup")
+def preload_models():
+    get_executor().start()
+    start_model_watcher()
+    get_snapshot_store()
+    get_stats_cache().start()
+    get_stats_cube().refresh()
+
+@app.on_event("shutdown")
+def stop_inference_workers():
+    get_model_watcher().stop()
+    get_stats_cache().stop()
+    get_executor().shutdown()
+    dispose_sql()
+
 # 정적 파일 (D3.js 포함 프론트엔드)
 # app.mount("/", StaticFiles(directory="frontend", html=True), name="frontend")
\ No newline at end of file
@@ -1,24 +1,71 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import List
-import numpy as np
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Dict, Optional, Any
 
 # 주의: 챗봇 대화를 통한 분석은 /api/chatbot/response 엔드포인트를 통해 반환됩니다.
 
 # 아래 import 시 경로에 주의 (폴더 구조에 맞게 조정)
 from ModelPredictionModule.analysis_module import (
-    predict_acc_sales_planning,
-    predict_acc_sales_selling,
-    predict_roi_bep_planning,
-    predict_roi_bep_selling,
-    predict_ticket_risk,
-    get_genre_stats,
-    get_regional_stats,
-    get_venue_scale_stats
+    get_batcher,
+    get_executor,
+    predict_async,
+    roi_bep_deviation,
+    ROI_BEP_METHODS
 )
+from ModelPredictionModule.model_registry import get_registry
+from ModelPredictionModule.model_watcher import get_model_watcher
+from ModelPredictionModule.prediction_cache import get_prediction_cache
+from ModelPredictionModule.montecarlo import simulate_roi_bep, MIN_SIMULATIONS, MAX_SIMULATIONS
+from ModelPredictionModule.sweep import sweep, MAX_AXES, MAX_AXIS_STEPS
+from ModelPredictionModule.audience_segmentation import segment_users
+from ModelPredictionModule.roc_pr_evaluation import get_roc_pr_evaluator, DEFAULT_POINTS as DEFAULT_ROC_PR_POINTS
+from ModelPredictionModule.feature_store import get_feature_store, resolve_inputs
+from ModelPredictionModule.roi_bep_formula import portfolio as roi_bep_portfolio
+from ModelPredictionModule.price_optimizer import optimize_prices, OBJECTIVES, COST_DEFAULTS
+from ModelPredictionModule.stats_cache import get_stats_cache
+from ModelPredictionModule.stats_snapshot import get_snapshot_store
+from ModelPredictionModule.stats_cube import get_stats_cube
 
 router = APIRouter()
 
+
+async def _run_prediction(analysis_type: str, input_data: list, uncertainty: bool = False,
+                          explain: bool = False, method: str = "model") -> dict:
+    """
+    예측은 추론 실행기에서 수행하고, 제한 시간 초과 시 504를 반환합니다.
+    uncertainty=True 이면 트리별(반복별) 출력 기반 예측 구간을 함께 반환합니다.
+    explain=True 이면 입력 컬럼별 기여도(기여도 합 + 기준값 = 예측값)를 함께 반환합니다.
+    method: 손익 예측의 계산 방식 (model / formula / compare)
+    """
+    try:
+        return await predict_async(analysis_type, input_data, uncertainty=uncertainty, explain=explain,
+                                   method=method)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"{analysis_type} 예측 시간 초과")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+STORE_KEYS = ("performance_id", "date")
+
+
+async def _selling_inputs(inputs: list, input_model) -> list:
+    """
+    판매 단계 요청 -> 모델 입력
+    performance_id(+ date)가 있으면 특성 저장소에서 나머지 입력을 채웁니다. (요청에 직접 준 값이 우선)
+    """
+    keys = [key for key in input_model.model_fields if key not in STORE_KEYS]
+    pairs = [(inp.dict(), inp.dict(exclude_unset=True)) for inp in inputs]
+    try:
+        if any(values.get("performance_id") is not None for values, _ in pairs):
+            return await asyncio.to_thread(resolve_inputs, pairs, keys)
+        return resolve_inputs(pairs, keys)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]) if e.args else str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 # ------------------------------------------
 # 1) 회귀: 관객 수 예측 - 기획 단계
 # ------------------------------------------
@@ -31,21 +78,24 @@ class AccSalesPlanningInput(BaseModel):
     ticket_price: float = 40439.5
     marketing_budget: float = 8098512.5
     sns_mention_count: float = 38.0
+    duration: float = 1.0
     
     class Config:
         extra = "ignore"  # 정의되지 않은 추가 필드는 무시합니다.
 
 @router.post("/accumulated_sales_planning")
-def api_predict_acc_sales_planning(inputs: List[AccSalesPlanningInput]):
+async def api_predict_acc_sales_planning(inputs: List[AccSalesPlanningInput], uncertainty: bool = False, explain: bool = False):
     input_data = [inp.dict() for inp in inputs]
-    preds = predict_acc_sales_planning(input_data)
-    return {"predictions": np.array(preds).tolist()}
+    preds = await _run_prediction("accumulated_sales_planning", input_data, uncertainty, explain)
+    return {"predictions": preds}
 
 # ------------------------------------------
 # 2) 회귀: 관객 수 예측 - 판매 단계
 # ------------------------------------------
 class AccSalesSellingInput(BaseModel):
-    genre: str
+    performance_id: Optional[int] = None  # 있으면 특성 저장소에서 나머지 입력을 채웁니다.
+    date: Optional[str] = None            # "YYYY-MM-DD" (없으면 마지막 판매 기록)
+    genre: Optional[str] = None
     region: str = "서울특별시"
     start_date_numeric: float = 1.0
     capacity: float = 502000.5
@@ -57,21 +107,26 @@ class AccSalesSellingInput(BaseModel):
     booking_rate: float = 0.7
     ad_exposure: float = 303284.5
     sns_mention_daily: float = 38.0
+    duration: float = 1.0
 
     class Config:
         extra = "ignore"
 
 
 @router.post("/accumulated_sales_selling")
-def api_predict_acc_sales_selling(inputs: List[AccSalesSellingInput]):
-    input_data = [inp.dict() for inp in inputs]
-    preds = predict_acc_sales_selling(input_data)
-    return {"predictions": np.array(preds).tolist()}
+async def api_predict_acc_sales_selling(inputs: List[AccSalesSellingInput], uncertainty: bool = False, explain: bool = False):
+    input_data = await _selling_inputs(inputs, AccSalesSellingInput)
+    preds = await _run_prediction("accumulated_sales_selling", input_data, uncertainty, explain)
+    return {"predictions": preds}
 
 
 # ------------------------------------------
 # 3) 회귀: 손익 예측(ROI, BEP) - 기획 단계
+# method=formula 이면 모델 대신 계산식으로 정확한 값을, compare 이면 모델 예측과 계산식의 편차를 함께 반환합니다.
 # ------------------------------------------
+ROI_BEP_METHOD_PATTERN = "^(" + "|".join(ROI_BEP_METHODS) + ")$"
+
+
 class ROI_BEP_PlanningInput(BaseModel):
     production_cost: float = 570111934.0
     marketing_budget: float = 8098512.5
@@ -79,16 +134,18 @@ class ROI_BEP_PlanningInput(BaseModel):
     capacity: float = 280.0
     variable_cost_rate: float = 0.17755
     accumulated_sales: float = 105.0
+    duration: float = 1.0
 
     class Config:
         extra = "ignore"
 
 
 @router.post("/roi_bep_planning")
-def api_predict_roi_bep_planning(inputs: List[ROI_BEP_PlanningInput]):
+async def api_predict_roi_bep_planning(inputs: List[ROI_BEP_PlanningInput], uncertainty: bool = False, explain: bool = False,
+                                     method: str = Query("model", pattern=ROI_BEP_METHOD_PATTERN)):
     input_data = [inp.dict() for inp in inputs]
-    preds = predict_roi_bep_planning(input_data)
-    return {"predictions": np.array(preds).tolist()}
+    preds = await _run_prediction("roi_bep_planning", input_data, uncertainty, explain, method)
+    return {"predictions": preds}
 
 
 # ------------------------------------------
@@ -101,23 +158,220 @@ class ROI_BEP_SellingInput(BaseModel):
     capacity: float = 280.0
     variable_cost_rate: float = 0.17755
     accumulated_sales: float = 105.0
+    duration: float = 1.0
 
     class Config:
         extra = "ignore"
 
 
 @router.post("/roi_bep_selling")
-def api_predict_roi_bep_selling(inputs: List[ROI_BEP_SellingInput]):
+async def api_predict_roi_bep_selling(inputs: List[ROI_BEP_SellingInput], uncertainty: bool = False, explain: bool = False,
+                                     method: str = Query("model", pattern=ROI_BEP_METHOD_PATTERN)):
     input_data = [inp.dict() for inp in inputs]
-    preds = predict_roi_bep_selling(input_data)
-    return {"predictions": np.array(preds).tolist()}
+    preds = await _run_prediction("roi_bep_selling", input_data, uncertainty, explain, method)
+    return {"predictions": preds}
+
+
+# ------------------------------------------
+# 4-0) 손익(ROI, BEP) 계산식: 포트폴리오 x 시나리오 일괄 계산, 모델 편차 보고서
+# ------------------------------------------
+class ROI_BEP_Scenario(BaseModel):
+    name: Optional[str] = None
+    set: Dict[str, float] = {}    # 모든 공연에 같은 값 지정 (예: {"ticket_price": 50000})
+    scale: Dict[str, float] = {}  # 공연별 현재 값에 곱할 배수 (예: {"marketing_budget": 1.2})
+
+
+class ROI_BEP_PortfolioInput(BaseModel):
+    performances: List[ROI_BEP_SellingInput] = Field(..., min_length=1)
+    scenarios: List[ROI_BEP_Scenario] = []
+    include_rows: bool = False  # True 이면 공연 x 시나리오별 매출/비용/ROI/BEP 전체
+
+
+@router.post("/roi_bep_formula")
+async def api_roi_bep_formula(inputs: ROI_BEP_PortfolioInput):
+    performances = [inp.dict() for inp in inputs.performances]
+    scenarios = [scenario.dict() for scenario in inputs.scenarios]
+    try:
+        return await asyncio.to_thread(roi_bep_portfolio, performances, scenarios, inputs.include_rows)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/roi_bep_deviation")
+async def api_roi_bep_deviation(stage: str = Query("planning", pattern="^(planning|selling)$")):
+    """
+    xgb_reg_roi_bep_* 모델 예측이 계산식과 얼마나 다른지 (공연 카탈로그 + roi_bep_data 기준)
+    """
+    try:
+        return await asyncio.to_thread(roi_bep_deviation, stage)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------------------------------
+# 4-1) 손익(ROI, BEP) 몬테카를로 시뮬레이션
+# ------------------------------------------
+class DistributionSpec(BaseModel):
+    distribution: str = "fixed"  # fixed / normal / lognormal / uniform / triangular
+    value: Optional[float] = None
+    mean: Optional[float] = None
+    std_dev: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mode: Optional[float] = None
+
+
+class ROI_BEP_SimulationInput(BaseModel):
+    stage: str = "planning"  # planning / selling
+    simulation_count: int = Field(10000, ge=MIN_SIMULATIONS, le=MAX_SIMULATIONS)
+    input_variables: Dict[str, DistributionSpec]
+    base: ROI_BEP_SellingInput = ROI_BEP_SellingInput()  # 분포를 지정하지 않은 변수의 고정값
+    bins: int = Field(50, ge=5, le=500)
+    seed: Optional[int] = None
+    parallel: bool = True
+
+
+@router.post("/roi_bep_simulation")
+async def api_simulate_roi_bep(inputs: ROI_BEP_SimulationInput):
+    variables = {name: spec.dict(exclude_none=True) for name, spec in inputs.input_variables.items()}
+    try:
+        # 시뮬레이션은 청크 단위로 CPU를 많이 쓰므로 이벤트 루프 밖(스레드)에서 실행합니다.
+        return await asyncio.to_thread(
+            simulate_roi_bep, variables, inputs.base.dict(), inputs.stage,
+            inputs.simulation_count, inputs.bins, inputs.seed, inputs.parallel
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------------------------------
+# 4-2) What-if 민감도 스윕 (1~3개 변수 격자를 한 번에 예측)
+# ------------------------------------------
+class SweepAxis(BaseModel):
+    name: str                             # 예: ticket_price, marketing_budget, capacity
+    values: Optional[List[float]] = None  # 값 목록을 직접 주거나
+    min: Optional[float] = None           # min ~ max 를 steps 개로 나눕니다.
+    max: Optional[float] = None
+    steps: int = Field(10, ge=1, le=MAX_AXIS_STEPS)
+
+
+class SweepInput(BaseModel):
+    analysis_type: str = "accumulated_sales_planning"
+    base: Dict[str, Any] = {}  # analysis_type의 예측 입력 스키마 (지정하지 않은 값은 기본값)
+    axes: List[SweepAxis] = Field(..., min_length=1, max_length=MAX_AXES)
+
+
+SWEEP_SCHEMAS = {
+    "accumulated_sales_planning": AccSalesPlanningInput,
+    "accumulated_sales_selling": AccSalesSellingInput,
+    "roi_bep_planning": ROI_BEP_PlanningInput,
+    "roi_bep_selling": ROI_BEP_SellingInput,
+}
+
+
+@router.post("/sweep")
+async def api_sweep(inputs: SweepInput):
+    schema = SWEEP_SCHEMAS.get(inputs.analysis_type)
+    if schema is None:
+        raise HTTPException(status_code=400, detail=f"analysis_type은 {list(SWEEP_SCHEMAS)} 중 하나여야 합니다.")
+    try:
+        base = schema(**inputs.base)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    base = (await _selling_inputs([base], schema))[0] if "performance_id" in schema.model_fields else base.dict()
+    axes = [axis.dict() for axis in inputs.axes]
+    try:
+        return await asyncio.to_thread(sweep, inputs.analysis_type, base, axes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ------------------------------------------
+# 4-3) 티켓 가격 최적화 (판매량 모델로 후보 가격을 일괄 예측, 거친 격자 -> 세밀한 격자)
+# ------------------------------------------
+class PriceRange(BaseModel):
+    min: Optional[float] = None        # 절대 범위
+    max: Optional[float] = None
+    scale_min: Optional[float] = None  # 또는 현재 값의 배수 범위 (기본 0.5 ~ 2.0)
+    scale_max: Optional[float] = None
+
+
+class PriceOptimizationInput(BaseModel):
+    stage: str = "planning"  # planning / selling
+    objective: str = "revenue"  # revenue / profit / roi
+    # 판매량 예측 입력 (판매 단계는 performance_id/date만 줘도 됨) + 선택: production_cost, variable_cost_rate
+    performances: List[Dict[str, Any]] = Field(..., min_length=1)
+    price_range: Optional[PriceRange] = None
+    optimize_budget: bool = False
+    budget_range: Optional[PriceRange] = None
+    include_curve: bool = False
+
+
+class OptimizerCosts(BaseModel):
+    # 손익 계산용 비용 (performances 각 행에서 읽음, 없으면 특성 저장소 -> 기본값 순)
+    production_cost: Optional[float] = Field(None, ge=0, allow_inf_nan=False)
+    variable_cost_rate: Optional[float] = Field(None, ge=0, le=1)
+
+
+OPTIMIZER_SCHEMAS = {
+    "planning": AccSalesPlanningInput,
+    "selling": AccSalesSellingInput,
+}
+
+
+def _optimizer_rows(rows: list, models: list, costs: list) -> list:
+    """
+    손익 계산용 비용: 요청 값 -> 특성 저장소(공연 카탈로그) 순으로 채웁니다. (둘 다 없으면 optimize_prices에서 기본값)
+    """
+    for row, model, cost in zip(rows, models, costs):
+        performance_id = getattr(model, "performance_id", None)
+        values = cost.dict()
+        features = get_feature_store().resolve(performance_id, model.date) \
+            if performance_id is not None and None in values.values() else {}
+        for key, value in values.items():
+            row[key] = value if value is not None else features.get(key)
+        if performance_id is not None:
+            row["performance_id"] = performance_id
+    return rows
+
+
+@router.post("/price_optimization")
+async def api_price_optimization(inputs: PriceOptimizationInput):
+    schema = OPTIMIZER_SCHEMAS.get(inputs.stage)
+    if schema is None:
+        raise HTTPException(status_code=400, detail=f"stage는 {list(OPTIMIZER_SCHEMAS)} 중 하나여야 합니다.")
+    if inputs.objective not in OBJECTIVES:
+        raise HTTPException(status_code=400, detail=f"objective는 {OBJECTIVES} 중 하나여야 합니다.")
+    try:
+        models = [schema(**row) for row in inputs.performances]
+        costs = [OptimizerCosts(**{key: row.get(key) for key in COST_DEFAULTS}) for row in inputs.performances]
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    rows = (await _selling_inputs(models, schema)) if "performance_id" in schema.model_fields else \
+        [model.dict() for model in models]
+    try:
+        rows = await asyncio.to_thread(_optimizer_rows, rows, models, costs)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]) if e.args else str(e))
+    try:
+        return await asyncio.to_thread(
+            optimize_prices, inputs.stage, rows, inputs.objective,
+            inputs.price_range.dict() if inputs.price_range else None, inputs.optimize_budget,
+            inputs.budget_range.dict() if inputs.budget_range else None, include_curve=inputs.include_curve
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ------------------------------------------
 # 5) 분류: 티켓 판매 위험 예측 - 판매 단계 (조기 경보)
 # ------------------------------------------
 class TicketRiskInput(BaseModel):
-    genre: str
+    performance_id: Optional[int] = None
+    date: Optional[str] = None
+    genre: Optional[str] = None
     region: str = "서울특별시"
     start_date_numeric: float = 1.0
     capacity: float = 280.0
@@ -127,32 +381,201 @@ class TicketRiskInput(BaseModel):
     ad_exposure: float = 303284.5
     sns_mention_daily: float = 0.0
     promo_event_flag: int = 0
+    duration: float = 1.0
 
     class Config:
         extra = "ignore"
 
 
 @router.post("/ticket_risk_selling")
-def api_predict_ticket_risk(inputs: List[TicketRiskInput]):
-    input_data = [inp.dict() for inp in inputs]
-    preds = predict_ticket_risk(input_data)
-    return {"risk_labels": np.array(preds).tolist()}
+async def api_predict_ticket_risk(inputs: List[TicketRiskInput], uncertainty: bool = False):
+    input_data = await _selling_inputs(inputs, TicketRiskInput)
+    preds = await _run_prediction("ticket_risk_selling", input_data, uncertainty)
+    return {"risk_labels": preds}
+
+
+# ------------------------------------------
+# 6) 군집: 관객 세그먼트 (KMeans 중심점 배정 + 세그먼트별 집계)
+# ------------------------------------------
+class AudienceInput(BaseModel):
+    user_id: Optional[int] = None
+    age: float = 35.0
+    gender: Optional[str] = None
+    region: Optional[str] = None
+    last_booking: Optional[str] = None  # "YYYY-MM-DD" (recency_days가 없으면 기준일과의 차이로 계산)
+    recency_days: Optional[float] = None
+    booking_count: float = 8.0
+    total_amount: float = 129413.0
+    preferred_genre: Optional[str] = None
+
+    class Config:
+        extra = "ignore"
+
+
+class AudienceSegmentInput(BaseModel):
+    users: List[AudienceInput] = Field(..., min_length=1)
+    reference_date: Optional[str] = None  # recency_days 기준일 (없으면 ML_SEGMENT_REFERENCE_DATE, 기본 2025-05-01)
+    include_assignments: bool = True      # False 이면 세그먼트 요약만 반환
+
+
+@router.post("/audience_segments")
+async def api_audience_segments(inputs: AudienceSegmentInput):
+    users = [user.dict() for user in inputs.users]
+    try:
+        result = await asyncio.to_thread(segment_users, users, inputs.reference_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not inputs.include_assignments:
+        result.pop("assignments")
+    return result
+
+
+# ------------------------------------------
+# 7) 평가: 티켓 위험 모델 ROC/PR (클래스별 점수 히스토그램 누적)
+# ------------------------------------------
+class RocPrObservationInput(BaseModel):
+    y_true: List[int] = Field(..., min_length=1)  # 실제 위험 등급 (0: 안정, 1: 중위험, 2: 고위험)
+    y_proba: List[List[float]]                    # 클래스 0, 1, 2 순서의 예측 확률
+
+
+@router.get("/ticket_risk_roc_pr")
+async def api_ticket_risk_roc_pr(points: int = Query(DEFAULT_ROC_PR_POINTS, ge=2, le=1000)):
+    """
+    클래스별 ROC/PR 곡선(points개 이하로 다운샘플), AUC와 오차 상한, AP와 범위
+    """
+    try:
+        return await asyncio.to_thread(get_roc_pr_evaluator().report, points)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post("/ticket_risk_roc_pr/observations")
+async def api_add_roc_pr_observations(inputs: RocPrObservationInput):
+    """
+    라벨이 확정된 예측 결과를 ROC/PR 히스토그램에 누적합니다.
+    """
+    if len(inputs.y_true) != len(inputs.y_proba):
+        raise HTTPException(status_code=400, detail="y_true와 y_proba의 행 수가 다릅니다.")
+    try:
+        added = await asyncio.to_thread(get_roc_pr_evaluator().update, inputs.y_true, inputs.y_proba)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"added": added}
+
+
+# ------------------------------------------
+# 8) 판매 단계 특성 저장소 조회
+# ------------------------------------------
+@router.get("/features/{performance_id}")
+async def api_get_selling_features(performance_id: int, date: Optional[str] = None, history: bool = False):
+    """
+    (performance_id, date) 판매 단계 특성 (date가 없으면 마지막 기록, history=True 이면 일자별 전체 기록)
+    """
+    try:
+        store = await asyncio.to_thread(get_feature_store)
+        if history:
+            return {"performance_id": performance_id, "history": store.history(performance_id)}
+        return store.resolve(performance_id, date)
+    except (KeyError, FileNotFoundError) as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]) if e.args else str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # ---------------------------
 # 집계(산업 추이) 시각화 API 엔드포인트
 # ---------------------------
+# DB 집계 결과를 캐시에서 응답합니다. (오래된 값은 바로 응답하고 백그라운드에서 다시 집계)
+# ETag / Last-Modified가 같으면 304 Not Modified
+async def _cached_stats(request: Request, name: str) -> Response:
+    cache = get_stats_cache()
+    entry = cache.cached(name)
+    if entry is None:
+        try:
+            entry = await asyncio.to_thread(cache.get, name)
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"{name}: 통계를 가져올 수 없습니다. ({e})")
+    headers = entry.headers()
+    if entry.not_modified(request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
 @router.get("/genre_stats")
-def api_get_genre_stats():
-    stats = get_genre_stats()
-    return stats
+async def api_get_genre_stats(request: Request):
+    return await _cached_stats(request, "genre_stats")
 
 @router.get("/regional_stats")
-def api_get_regional_stats():
-    stats = get_regional_stats()
-    return stats
+async def api_get_regional_stats(request: Request):
+    return await _cached_stats(request, "regional_stats")
 
 @router.get("/venue_scale_stats")
-def api_get_venue_scale_stats():
-    stats = get_venue_scale_stats()
-    return stats
\ No newline at end of file
+async def api_get_venue_scale_stats(request: Request):
+    return await _cached_stats(request, "venue_scale_stats")
+
+
+class AggregateInput(BaseModel):
+    dimensions: List[str] = Field(default_factory=list)  # year / month / genre / region / venue_scale
+    measures: Optional[List[str]] = None  # 없으면 소스의 모든 측정값
+    filters: Dict[str, List[Any]] = Field(default_factory=dict)  # 차원 -> 허용 값 목록
+    source: Optional[str] = None  # sales / genre_stats / regional_stats / venue_scale_stats (없으면 자동 선택)
+    order_by: Optional[str] = None  # 측정값 (내림차순)
+    limit: Optional[int] = Field(None, ge=1)
+
+
+# 다차원 집계: 메모리에 미리 집계해 둔 큐브에서 응답 (SQL 조회 없음, 큐브가 아직 없으면 503)
+@router.post("/aggregate")
+async def api_aggregate(inputs: AggregateInput):
+    cube = get_stats_cube()
+    try:
+        return cube.query(**inputs.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"집계 큐브를 사용할 수 없습니다. ({e})")
+
+@router.get("/aggregate/schema")
+async def api_aggregate_schema():
+    cube = get_stats_cube()
+    try:
+        return {"sources": cube.schema(), "cube": cube.stats()}
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"집계 큐브를 사용할 수 없습니다. ({e})")
+
+
+# ---------------------------
+# 모델 레지스트리 / 배칭 / 실행기 / 캐시 / 교체 상태 (로드 시간, 메모리 크기, 배치 크기, 큐 깊이, 적중률, 버전)
+# ---------------------------
+@router.get("/models")
+def api_get_model_stats():
+    return {
+        "models": get_registry().stats(),
+        "batching": get_batcher().stats(),
+        "executor": get_executor().stats(),
+        "cache": get_prediction_cache().stats(),
+        "watcher": get_model_watcher().stats(),
+        "stats_cache": get_stats_cache().stats(),
+        "snapshots": get_snapshot_store().stats(),
+        "cube": get_stats_cube().stats()
+    }
+
+
+@router.post("/models/reload")
+async def api_reload_model(model_name: str):
+    """
+    모델 파일을 바로 다시 로드합니다. (카나리 검증 후 교체, 실패 시 기존 버전 유지)
+    """
+    try:
+        version = await asyncio.to_thread(get_model_watcher().reload, model_name)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"{model_name}: 모델 파일이 없습니다.")
+    except Exception as e:
+        raise HTTPException(status_code=409, detail=f"{model_name}: 교체 실패 - {e}")
+    return {"model": model_name, "model_version": version}
+
+
+@router.delete("/cache")
+def api_clear_prediction_cache(model_name: str = None):
+    removed = get_prediction_cache().invalidate(model_name)
+    return {"removed": removed, "cache": get_prediction_cache().stats()}
@@ -1,6 +1,22 @@
 // scenes/dashboard/components/hooks/useCsvData.js
 import { useEffect, useState } from "react";
 
+const ROC_PR_API = "http://localhost:8000/api/ml/ticket_risk_roc_pr?points=101";
+
+// API의 클래스별 ROC 곡선 -> 차트용 [{ fpr, tpr }] (고위험 클래스 우선, 곡선이 없으면 null)
+async function loadRocCurve() {
+  try {
+    const res = await fetch(ROC_PR_API);
+    if (!res.ok) return null;
+    const { roc_curve: curves = [] } = await res.json();
+    const curve = [...curves].reverse().find(c => c.fpr && c.fpr.length > 0);
+    if (!curve) return null;
+    return curve.fpr.map((fpr, i) => ({ fpr, tpr: curve.tpr[i] }));
+  } catch (err) {
+    return null;
+  }
+}
+
 export default function useCsvData() {
   const [scenarioData, setScenarioData] = useState({});
 
@@ -29,9 +45,10 @@ export default function useCsvData() {
           forecastAudience: "/forecast_audience_time_series.json"
         };
 
-        const results = await Promise.all(
-          Object.values(fileMap).map(path => fetch(path).then(res => res.json()))
-        );
+        const [results, rocCurveApi] = await Promise.all([
+          Promise.all(Object.values(fileMap).map(path => fetch(path).then(res => res.json()))),
+          loadRocCurve()
+        ]);
 
         const [
           audience,
@@ -229,7 +246,7 @@ export default function useCsvData() {
               title: "ROC 및 PR Curve",
               xField: "fpr",
               yField: "tpr",
-              data: rocCurve,
+              data: rocCurveApi || rocCurve,
             },
             {
               chartType: "bar-line-combo",